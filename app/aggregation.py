@@ -0,0 +1,114 @@
+"""
+Report aggregation - every count and grouping the reports need, computed once.
+
+The daily, weekly and button reports all render from the same immutable
+ReportSummary, built once per snapshot and day by TaskIndex.summary().
+Task groupings come from one pass over the tasks; per-person counts and
+the completed-this-week selection use the snapshot's columnar TaskTable.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from types import MappingProxyType
+from typing import Mapping, Optional
+from app.models import Task, TaskStatus, TaskTable
+
+UNKNOWN_PERSON = "Không rõ"  # Same label as group_tasks_by_person
+DUE_SOON_STATUSES = (TaskStatus.DUE_TODAY, TaskStatus.DUE_TOMORROW, TaskStatus.DUE_2_3_DAYS)
+
+
+@dataclass(frozen=True, slots=True)
+class PersonSummary:
+    """Incomplete-task counts of one person."""
+
+    name: str
+    total: int
+    overdue: int
+    due_soon: int  # Due today or in 1-3 days
+
+
+@dataclass(frozen=True, slots=True)
+class ReportSummary:
+    """
+    Read-only aggregates over classified tasks for one day.
+
+    Groups are tuples and mappings are read-only views, so one summary can
+    be shared by every report of a snapshot.
+    """
+
+    today: date
+    week_start: date  # Monday of today's week
+    week_end: date  # Sunday of today's week
+    open_tasks: tuple[Task, ...]
+    # Incomplete tasks by status; overdue ones most overdue first
+    open_by_status: Mapping[TaskStatus, tuple[Task, ...]]
+    # Incomplete overdue tasks by person (UNKNOWN_PERSON for no name), sheet order
+    overdue_by_person: Mapping[str, tuple[Task, ...]]
+    # Tasks with a completion date in [week_start, week_end], sheet order
+    completed_this_week: tuple[Task, ...]
+    # Same tasks keyed by the raw ho_ten
+    completed_by_person: Mapping[str, tuple[Task, ...]]
+    # Every person with incomplete tasks, most overdue first, then most tasks
+    person_stats: tuple[PersonSummary, ...]
+
+    @property
+    def open_count(self) -> int:
+        return len(self.open_tasks)
+
+
+def summarize_tasks(tasks: list[Task], today: date, table: Optional[TaskTable] = None) -> ReportSummary:
+    """
+    Aggregate `tasks` for the reports of `today`.
+
+    Args:
+        tasks: Classified tasks (statuses computed for `today`)
+        today: Report date, fixes the week boundaries
+        table: Columnar view of `tasks` (built here if not given)
+    """
+    if table is None:
+        table = TaskTable(tasks)
+    week_start = today - timedelta(days=today.weekday())
+    week_end = week_start + timedelta(days=6)
+
+    completed_this_week = table.select(table.completed_between_rows(week_start, week_end))
+    completed_by_person: dict[str, list[Task]] = {}
+    for task in completed_this_week:
+        completed_by_person.setdefault(task.ho_ten, []).append(task)
+
+    open_tasks: list[Task] = []
+    by_status: dict[TaskStatus, list[Task]] = {status: [] for status in TaskStatus}
+    overdue_by_person: dict[str, list[Task]] = {}
+    for task in tasks:
+        if task.is_completed:
+            continue
+        open_tasks.append(task)
+        by_status[task.status].append(task)
+        if task.status == TaskStatus.OVERDUE:
+            overdue_by_person.setdefault(task.ho_ten or UNKNOWN_PERSON, []).append(task)
+
+    by_status[TaskStatus.OVERDUE].sort(key=lambda t: t.days_overdue, reverse=True)
+
+    totals = table.count_by_person(table.open_rows())
+    overdue_counts = table.count_by_person(table.rows_with_status(TaskStatus.OVERDUE))
+    due_soon_counts = table.count_by_person(table.rows_with_status(*DUE_SOON_STATUSES))
+    person_stats = [
+        PersonSummary(name, total, overdue_counts.get(name, 0), due_soon_counts.get(name, 0))
+        for name, total in totals.items()
+    ]
+    person_stats.sort(key=lambda p: (p.overdue, p.total), reverse=True)
+
+    return ReportSummary(
+        today=today,
+        week_start=week_start,
+        week_end=week_end,
+        open_tasks=tuple(open_tasks),
+        open_by_status=_freeze(by_status),
+        overdue_by_person=_freeze(overdue_by_person),
+        completed_this_week=tuple(completed_this_week),
+        completed_by_person=_freeze(completed_by_person),
+        person_stats=tuple(person_stats)
+    )
+
+
+def _freeze(groups: dict) -> Mapping:
+    return MappingProxyType({key: tuple(values) for key, values in groups.items()})
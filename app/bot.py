@@ -2,8 +2,11 @@
 Telegram Bot handlers - commands, menu, conversation.
 """
 
+import asyncio
 import logging
+import secrets
 from datetime import datetime
+from typing import Optional
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
 from telegram.ext import (
     ContextTypes, CommandHandler, CallbackQueryHandler,
@@ -12,12 +15,12 @@ from telegram.ext import (
 import pytz
 
 from app.config import config
-from app.sheets import GoogleSheetsClient
-from app.rules import parse_all_tasks, search_tasks
-from app.reporting import (
-    build_today_tasks_report, build_overdue_by_person_report,
-    build_due_soon_report, build_weekly_report, build_search_results
-)
+from app.datasource import TaskDataSource
+from app.task_cache import load_task_snapshot
+from app.report_cache import render_report
+from app.pagination import ReportPageCache
+from app.reporting import build_search_page
+from app.search import SearchResults
 from app.word_generator import WordReportGenerator
 
 logger = logging.getLogger(__name__)
@@ -25,6 +28,9 @@ logger = logging.getLogger(__name__)
 # Conversation states
 WAITING_FOR_KEYWORD = 1
 
+# Ranked search results kept per chat for the page buttons
+MAX_SEARCHES_PER_CHAT = 5
+
 
 def is_authorized_chat(chat_id: int, allow_private: bool = False) -> bool:
     """
@@ -69,6 +75,48 @@ def get_persistent_menu_keyboard() -> ReplyKeyboardMarkup:
     return ReplyKeyboardMarkup(keyboard, resize_keyboard=True, one_time_keyboard=False)
 
 
+def get_search_page_keyboard(token: str, results: SearchResults, cursor: int) -> Optional[InlineKeyboardMarkup]:
+    """Build previous/next page buttons for a search result page (None if single page)."""
+    buttons = []
+    prev_cursor = results.prev_cursor(cursor)
+    next_cursor = results.next_cursor(cursor)
+    if prev_cursor is not None:
+        buttons.append(InlineKeyboardButton("◀️ Trang trước", callback_data=f"search_page:{token}:{prev_cursor}"))
+    if next_cursor is not None:
+        buttons.append(InlineKeyboardButton("Trang sau ▶️", callback_data=f"search_page:{token}:{next_cursor}"))
+    return InlineKeyboardMarkup([buttons]) if buttons else None
+
+
+def remember_search(chat_data: dict, results: SearchResults) -> str:
+    """Keep ranked results for paging; returns the token used in page buttons."""
+    searches: dict[str, SearchResults] = chat_data.setdefault('search_results', {})
+    token = secrets.token_hex(4)
+    searches[token] = results
+    # Drop the oldest searches (dicts keep insertion order)
+    while len(searches) > MAX_SEARCHES_PER_CHAT:
+        del searches[next(iter(searches))]
+    return token
+
+
+def get_report_page_keyboard(token: Optional[str], page: int, page_count: int) -> Optional[InlineKeyboardMarkup]:
+    """Build ◀ ▶ buttons for a page of a long report (None if single page)."""
+    if token is None:
+        return None
+    buttons = []
+    if page > 0:
+        buttons.append(InlineKeyboardButton("◀️ Trang trước", callback_data=f"report_page:{token}:{page - 1}"))
+    if page < page_count - 1:
+        buttons.append(InlineKeyboardButton("Trang sau ▶️", callback_data=f"report_page:{token}:{page + 1}"))
+    return InlineKeyboardMarkup([buttons])
+
+
+def paginate_report(bot_data: dict, text: str) -> tuple[str, Optional[InlineKeyboardMarkup]]:
+    """First page of a report and its page buttons; long reports are split to fit Telegram."""
+    page_cache: ReportPageCache = bot_data.setdefault('report_pages', ReportPageCache())
+    token, pages = page_cache.paginate(text)
+    return pages[0], get_report_page_keyboard(token, 0, len(pages))
+
+
 def get_word_export_menu() -> InlineKeyboardMarkup:
     """Build Word export menu."""
     keyboard = [
@@ -183,43 +231,39 @@ async def menu_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     # Get sheets client
-    sheets_client: GoogleSheetsClient = context.bot_data['sheets_client']
+    sheets_client: TaskDataSource = context.bot_data['sheets_client']
     
     try:
         callback_data = query.data
         
         if callback_data == "menu_today":
             # Today's tasks
-            data = sheets_client.fetch_data()
-            tasks = parse_all_tasks(data)
-            message = build_today_tasks_report(tasks)
-            await query.edit_message_text(message)
+            snapshot = await load_task_snapshot(context.bot_data)
+            message, markup = paginate_report(context.bot_data, await render_report(context.bot_data, snapshot, 'today'))
+            await query.edit_message_text(message, reply_markup=markup)
         
         elif callback_data == "menu_overdue":
             # Overdue by person
-            data = sheets_client.fetch_data()
-            tasks = parse_all_tasks(data)
-            message = build_overdue_by_person_report(tasks)
-            await query.edit_message_text(message)
+            snapshot = await load_task_snapshot(context.bot_data)
+            message, markup = paginate_report(context.bot_data, await render_report(context.bot_data, snapshot, 'overdue'))
+            await query.edit_message_text(message, reply_markup=markup)
         
         elif callback_data == "menu_due_soon":
             # Due soon (1-3 days)
-            data = sheets_client.fetch_data()
-            tasks = parse_all_tasks(data)
-            message = build_due_soon_report(tasks)
-            await query.edit_message_text(message)
+            snapshot = await load_task_snapshot(context.bot_data)
+            message, markup = paginate_report(context.bot_data, await render_report(context.bot_data, snapshot, 'due_soon'))
+            await query.edit_message_text(message, reply_markup=markup)
         
         elif callback_data == "menu_weekly":
             # Weekly report
-            data = sheets_client.fetch_data()
-            tasks = parse_all_tasks(data)
-            message = build_weekly_report(tasks)
-            await query.edit_message_text(message)
+            snapshot = await load_task_snapshot(context.bot_data)
+            message, markup = paginate_report(context.bot_data, await render_report(context.bot_data, snapshot, 'weekly'))
+            await query.edit_message_text(message, reply_markup=markup)
         
         elif callback_data == "menu_refresh":
             # Refresh data
             sheets_client.invalidate_cache()
-            data = sheets_client.fetch_data(force_refresh=True)
+            data = await sheets_client.fetch_data_async(force_refresh=True)
             
             tz = pytz.timezone(config.TZ)
             now = datetime.now(tz)
@@ -284,17 +328,16 @@ async def search_keyword_handler(update: Update, context: ContextTypes.DEFAULT_T
         return WAITING_FOR_KEYWORD
     
     try:
-        # Get sheets client
-        sheets_client: GoogleSheetsClient = context.bot_data['sheets_client']
-        
         # Fetch and search
-        data = sheets_client.fetch_data()
-        tasks = parse_all_tasks(data)
-        results = search_tasks(tasks, keyword)
+        snapshot = await load_task_snapshot(context.bot_data)
+        # The first search after a data change builds the word index (seconds
+        # on a large sheet) - keep it and the ranking off the event loop
+        results = await asyncio.to_thread(snapshot.index.ranked_search, keyword)
+        token = remember_search(context.chat_data, results)
         
-        # Build and send report
-        message = build_search_results(results, keyword)
-        await update.message.reply_text(message)
+        # Build and send first page
+        message = build_search_page(results)
+        await update.message.reply_text(message, reply_markup=get_search_page_keyboard(token, results, 0))
         
     except Exception as e:
         logger.error(f"Error in search: {e}", exc_info=True)
@@ -306,6 +349,49 @@ async def search_keyword_handler(update: Update, context: ContextTypes.DEFAULT_T
     return ConversationHandler.END
 
 
+async def search_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show another page of a previous search from the cached ranked results."""
+    query = update.callback_query
+    await query.answer()
+    
+    if not is_authorized_chat(update.effective_chat.id):
+        return
+    
+    _, token, cursor = query.data.split(':')
+    results = context.chat_data.get('search_results', {}).get(token)
+    if results is None:
+        await query.edit_message_text("⌛ Kết quả tìm kiếm đã hết hạn. Vui lòng tìm kiếm lại.")
+        return
+    
+    cursor = int(cursor)
+    await query.edit_message_text(
+        build_search_page(results, cursor),
+        reply_markup=get_search_page_keyboard(token, results, cursor)
+    )
+
+
+async def report_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show another page of a long report from the page cache."""
+    query = update.callback_query
+    await query.answer()
+    
+    if not is_authorized_chat(update.effective_chat.id):
+        return
+    
+    _, token, page = query.data.split(':')
+    page_cache: Optional[ReportPageCache] = context.bot_data.get('report_pages')
+    pages = page_cache.get(token) if page_cache else None
+    page = int(page)
+    if pages is None or page >= len(pages):
+        await query.edit_message_text("⌛ Báo cáo đã hết hạn. Vui lòng mở lại từ menu.")
+        return
+    
+    await query.edit_message_text(
+        pages[page],
+        reply_markup=get_report_page_keyboard(token, page, len(pages))
+    )
+
+
 async def cancel_search(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Cancel search conversation."""
     await update.message.reply_text(
@@ -329,8 +415,7 @@ async def word_export_callback(update: Update, context: ContextTypes.DEFAULT_TYP
         )
         return
     
-    # Get sheets client and word generator
-    sheets_client: GoogleSheetsClient = context.bot_data['sheets_client']
+    # Get word generator
     word_generator: WordReportGenerator = context.bot_data['word_generator']
     
     try:
@@ -341,10 +426,9 @@ async def word_export_callback(update: Update, context: ContextTypes.DEFAULT_TYP
         
         if callback_data == "word_daily":
             # Generate daily report
-            from app.rules import group_tasks_by_status
-            data = sheets_client.fetch_data()
-            tasks = parse_all_tasks(data)
-            grouped = group_tasks_by_status(tasks)
+            snapshot = await load_task_snapshot(context.bot_data)
+            tasks = snapshot.tasks
+            grouped = snapshot.status_groups
             
             filepath = word_generator.generate_daily_report(tasks, grouped)
             
@@ -363,10 +447,9 @@ async def word_export_callback(update: Update, context: ContextTypes.DEFAULT_TYP
         
         elif callback_data == "word_weekly":
             # Generate weekly report
-            from app.rules import group_tasks_by_status
-            data = sheets_client.fetch_data()
-            tasks = parse_all_tasks(data)
-            grouped = group_tasks_by_status(tasks)
+            snapshot = await load_task_snapshot(context.bot_data)
+            tasks = snapshot.tasks
+            grouped = snapshot.status_groups
             
             filepath = word_generator.generate_weekly_report(tasks, grouped)
             
@@ -385,10 +468,8 @@ async def word_export_callback(update: Update, context: ContextTypes.DEFAULT_TYP
         
         elif callback_data == "word_overdue":
             # Generate overdue report
-            from app.rules import get_overdue_by_person
-            data = sheets_client.fetch_data()
-            tasks = parse_all_tasks(data)
-            overdue_by_person = get_overdue_by_person(tasks)
+            snapshot = await load_task_snapshot(context.bot_data)
+            overdue_by_person = snapshot.index.summary(snapshot.today).overdue_by_person
             
             filepath = word_generator.generate_overdue_report(overdue_by_person)
             
@@ -431,32 +512,28 @@ async def persistent_menu_handler(update: Update, context: ContextTypes.DEFAULT_
         )
         return
     
-    sheets_client: GoogleSheetsClient = context.bot_data['sheets_client']
+    sheets_client: TaskDataSource = context.bot_data['sheets_client']
     
     try:
         if text == "📌 Hôm nay":
-            data = sheets_client.fetch_data()
-            tasks = parse_all_tasks(data)
-            message = build_today_tasks_report(tasks)
-            await update.message.reply_text(message)
+            snapshot = await load_task_snapshot(context.bot_data)
+            message, markup = paginate_report(context.bot_data, await render_report(context.bot_data, snapshot, 'today'))
+            await update.message.reply_text(message, reply_markup=markup)
         
         elif text == "⏰ Quá hạn":
-            data = sheets_client.fetch_data()
-            tasks = parse_all_tasks(data)
-            message = build_overdue_by_person_report(tasks)
-            await update.message.reply_text(message)
+            snapshot = await load_task_snapshot(context.bot_data)
+            message, markup = paginate_report(context.bot_data, await render_report(context.bot_data, snapshot, 'overdue'))
+            await update.message.reply_text(message, reply_markup=markup)
         
         elif text == "⚠️ Sắp hạn":
-            data = sheets_client.fetch_data()
-            tasks = parse_all_tasks(data)
-            message = build_due_soon_report(tasks)
-            await update.message.reply_text(message)
+            snapshot = await load_task_snapshot(context.bot_data)
+            message, markup = paginate_report(context.bot_data, await render_report(context.bot_data, snapshot, 'due_soon'))
+            await update.message.reply_text(message, reply_markup=markup)
         
         elif text == "📊 Báo cáo tuần":
-            data = sheets_client.fetch_data()
-            tasks = parse_all_tasks(data)
-            message = build_weekly_report(tasks)
-            await update.message.reply_text(message)
+            snapshot = await load_task_snapshot(context.bot_data)
+            message, markup = paginate_report(context.bot_data, await render_report(context.bot_data, snapshot, 'weekly'))
+            await update.message.reply_text(message, reply_markup=markup)
         
         elif text == "🔎 Tìm kiếm":
             await update.message.reply_text(
@@ -478,7 +555,7 @@ async def persistent_menu_handler(update: Update, context: ContextTypes.DEFAULT_
         
         elif text == "🔄 Làm mới":
             sheets_client.invalidate_cache()
-            data = sheets_client.fetch_data(force_refresh=True)
+            data = await sheets_client.fetch_data_async(force_refresh=True)
             
             tz = pytz.timezone(config.TZ)
             now = datetime.now(tz)
@@ -526,6 +603,18 @@ def setup_handlers(application):
         pattern="^(word_daily|word_weekly|word_overdue|back_to_main)$"
     ))
     
+    # Search result paging
+    application.add_handler(CallbackQueryHandler(
+        search_page_callback,
+        pattern="^search_page:[0-9a-f]+:[0-9]+$"
+    ))
+    
+    # Long report paging
+    application.add_handler(CallbackQueryHandler(
+        report_page_callback,
+        pattern="^report_page:[0-9a-f]+:[0-9]+$"
+    ))
+    
     # Conversation handler for search (MUST be added BEFORE persistent menu handler)
     search_conv = ConversationHandler(
         entry_points=[
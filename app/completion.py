@@ -0,0 +1,123 @@
+"""
+Completion rules - decides from "Kết quả / Tiến độ" whether a task is done.
+
+Keywords, negations and the percentage threshold come from Config and are
+compiled once into a single regex over diacritic-free text:
+
+    "Hoàn thành", "Đã xong", "done", "100%"   -> completed
+    "Chưa hoàn thành", "không xong", "80%"    -> not completed
+
+A percentage is the most specific progress statement, so when one is
+present it decides ("Hoàn thành 80%" is not done); otherwise any keyword
+without a negation earlier in the same clause marks the task completed
+("Chưa thực sự hoàn thành" is not done, "Chưa gửi báo cáo, đã xong" is).
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
+from app.config import config
+from app.text import normalize_text
+
+
+class CompletionRules:
+    """
+    Compiled completion matcher with per-value memoization.
+
+    A sheet repeats a handful of distinct ket_qua values across thousands
+    of rows, so each value is matched once and then answered from the cache.
+    """
+
+    CACHE_SIZE = 4096
+    CLAUSE_BREAKS = ',;:.!?\n'  # A negation cancels keywords up to the next of these
+
+    def __init__(
+        self,
+        keywords: Iterable[str],
+        negations: Iterable[str] = (),
+        percent_threshold: float = 100,
+        pattern: str = ''
+    ):
+        """
+        Args:
+            keywords: Phrases meaning "completed" (matched as whole words)
+            negations: Words that cancel the following keywords of their clause
+            percent_threshold: Progress percentage counted as completed
+            pattern: Extra regex (on lowercase, diacritic-free text) meaning completed
+        """
+        self.percent_threshold = percent_threshold
+        self.regex = self._compile(keywords, negations, pattern)
+        self.is_completed = lru_cache(maxsize=self.CACHE_SIZE)(self._evaluate)
+
+    @classmethod
+    def from_config(cls) -> 'CompletionRules':
+        """Rules built from the COMPLETION_* settings."""
+        return cls(
+            keywords=_split(config.COMPLETION_KEYWORDS),
+            negations=_split(config.COMPLETION_NEGATIONS),
+            percent_threshold=config.COMPLETION_PERCENT,
+            pattern=config.COMPLETION_PATTERN
+        )
+
+    def progress(self, text: str) -> Optional[float]:
+        """Last percentage mentioned in `text`, or None."""
+        percent = None
+        for match in self.regex.finditer(normalize_text(text)):
+            if match.group('percent'):
+                percent = float(match.group('percent').replace(',', '.'))
+        return percent
+
+    def _evaluate(self, text: str) -> bool:
+        if not text:
+            return False
+
+        keyword_hit = False
+        percent = None
+        for match in self.regex.finditer(normalize_text(text)):
+            if match.group('percent'):
+                percent = float(match.group('percent').replace(',', '.'))
+            elif not match.group('negation'):
+                keyword_hit = True
+
+        if percent is not None:
+            return percent >= self.percent_threshold
+        return keyword_hit
+
+    def _compile(self, keywords: Iterable[str], negations: Iterable[str], pattern: str) -> re.Pattern:
+        # Longest first so "hoan thanh" wins over a shorter overlapping keyword
+        phrases = sorted({normalize_text(k) for k in keywords if k.strip()}, key=len, reverse=True)
+        alternatives = [r'\s+'.join(map(re.escape, phrase.split())) for phrase in phrases]
+        if pattern:
+            alternatives.append(f'(?:{pattern})')
+        keyword = '|'.join(alternatives) or r'(?!)'  # (?!) never matches
+
+        negation_words = sorted({normalize_text(n) for n in negations if n.strip()}, key=len, reverse=True)
+        negation = r'(?P<negation>(?!))?'
+        if negation_words:
+            gap = rf'[^{re.escape(self.CLAUSE_BREAKS)}]*?'
+            negation = rf'(?P<negation>\b(?:{"|".join(map(re.escape, negation_words))})\b{gap})?'
+
+        return re.compile(
+            rf'{negation}\b(?:{keyword})\b'
+            r'|(?P<percent>\b\d{1,3}(?:[.,]\d+)?)\s*%'
+        )
+
+
+def _split(value: str) -> list[str]:
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+_rules: Optional[CompletionRules] = None
+
+
+def get_completion_rules() -> CompletionRules:
+    """Shared rules built from Config on first use."""
+    global _rules
+    if _rules is None:
+        _rules = CompletionRules.from_config()
+    return _rules
+
+
+def is_completed_text(text: str) -> bool:
+    """Whether a "Kết quả / Tiến độ" value means the task is done."""
+    return get_completion_rules().is_completed(text)
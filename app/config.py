@@ -22,19 +22,60 @@ class Config:
     TELEGRAM_BOT_TOKEN: str = os.getenv('TELEGRAM_BOT_TOKEN', '')
     REPORT_CHAT_ID: int = int(os.getenv('REPORT_CHAT_ID', '0'))
     
+    # Task data source: google_sheets, file (CSV/XLSX) or memory (synthetic rows)
+    DATA_SOURCE: str = os.getenv('DATA_SOURCE', 'google_sheets').lower()
+    DATA_SOURCE_PATH: str = os.getenv('DATA_SOURCE_PATH', '')  # File for DATA_SOURCE=file
+    SYNTHETIC_ROWS: int = int(os.getenv('SYNTHETIC_ROWS', '1000'))  # Rows for DATA_SOURCE=memory
+    
     # Google Sheets
     GOOGLE_SHEET_ID: str = os.getenv('GOOGLE_SHEET_ID', '')
     GOOGLE_SHEET_TAB: str = os.getenv('GOOGLE_SHEET_TAB', 'Báo cáo')
+    # Comma-separated tab names or glob patterns, e.g. "Tháng *" (empty = only GOOGLE_SHEET_TAB)
+    GOOGLE_SHEET_TABS: str = os.getenv('GOOGLE_SHEET_TABS', '')
     GOOGLE_CREDENTIALS_PATH: str = os.getenv('GOOGLE_CREDENTIALS_PATH', '')
+    GOOGLE_SHEET_RANGE: str = os.getenv('GOOGLE_SHEET_RANGE', 'A:H')  # Columns to read (empty = whole sheet)
     
     # Timezone
     TZ: str = os.getenv('TZ', 'Asia/Ho_Chi_Minh')
     
     # Cache settings
     CACHE_DURATION: int = int(os.getenv('CACHE_DURATION', '300'))  # 5 minutes default
+    # Serve expired data immediately while refreshing in the background
+    CACHE_STALE_WHILE_REVALIDATE: bool = os.getenv('CACHE_STALE_WHILE_REVALIDATE', 'true').lower() in ('1', 'true', 'yes')
+    CACHE_MAX_STALENESS: int = int(os.getenv('CACHE_MAX_STALENESS', '3600'))  # Never serve data older than 1 hour
+    # Last good sheet download kept on disk for warm restarts (empty = disabled)
+    SNAPSHOT_PATH: str = os.getenv('SNAPSHOT_PATH', 'data/sheets_snapshot.json.gz')
+    
+    # Google Sheets I/O
+    SHEETS_MAX_WORKERS: int = int(os.getenv('SHEETS_MAX_WORKERS', '2'))  # Threads for blocking gspread calls
+    SHEETS_PAGE_SIZE: int = int(os.getenv('SHEETS_PAGE_SIZE', '0'))  # Rows per request (0 = one request)
+    SHEETS_METADATA_TTL: int = int(os.getenv('SHEETS_METADATA_TTL', '600'))  # Reuse spreadsheet/worksheet handles
+    SHEETS_MAX_RETRIES: int = int(os.getenv('SHEETS_MAX_RETRIES', '4'))  # Retries on 429/5xx/network errors
+    SHEETS_RETRY_BASE_DELAY: float = float(os.getenv('SHEETS_RETRY_BASE_DELAY', '1'))  # Seconds, doubled per retry
+    SHEETS_RETRY_MAX_DELAY: float = float(os.getenv('SHEETS_RETRY_MAX_DELAY', '32'))  # Cap on backoff and Retry-After
+    # Check the spreadsheet's modified time before downloading all values
+    SHEETS_CHANGE_PROBE: bool = os.getenv('SHEETS_CHANGE_PROBE', 'true').lower() in ('1', 'true', 'yes')
+    
+    # Task parsing
+    PARSE_PARALLEL_THRESHOLD: int = int(os.getenv('PARSE_PARALLEL_THRESHOLD', '200000'))  # Rows (0 = always serial)
+    PARSE_WORKERS: int = int(os.getenv('PARSE_WORKERS', '0'))  # Processes for large sheets (0 = CPU count)
+    
+    # Completion detection on "Kết quả / Tiến độ" (comma-separated, case/diacritic-insensitive)
+    COMPLETION_KEYWORDS: str = os.getenv('COMPLETION_KEYWORDS', 'hoàn thành,xong,completed,done')
+    COMPLETION_NEGATIONS: str = os.getenv('COMPLETION_NEGATIONS', 'chưa,không,sắp,gần,đang,not')  # Cancel later keywords of the same clause
+    COMPLETION_PERCENT: float = float(os.getenv('COMPLETION_PERCENT', '100'))  # Progress % counted as done
+    COMPLETION_PATTERN: str = os.getenv('COMPLETION_PATTERN', '')  # Extra regex on diacritic-free text
+    
+    # Scheduled reports
+    SCHEDULE_PREWARM_MINUTES: int = int(os.getenv('SCHEDULE_PREWARM_MINUTES', '5'))  # Render ahead of send time (0 = off)
+    # Daily aggregates for weekly trend sections, recorded after each daily job (empty = disabled)
+    HISTORY_PATH: str = os.getenv('HISTORY_PATH', 'data/history.sqlite3')
+    # Also send the Word file with scheduled reports
+    SCHEDULED_REPORT_DOCX: bool = os.getenv('SCHEDULED_REPORT_DOCX', 'false').lower() in ('1', 'true', 'yes')
     
     # Display settings
     MAX_DISPLAY_ITEMS: int = int(os.getenv('MAX_DISPLAY_ITEMS', '10'))
+    REPORT_CACHE_SIZE: int = int(os.getenv('REPORT_CACHE_SIZE', '32'))  # Rendered reports kept (0 = disabled)
     
     @classmethod
     def validate(cls) -> bool:
@@ -47,13 +88,21 @@ class Config:
         if not cls.REPORT_CHAT_ID:
             errors.append("REPORT_CHAT_ID is required")
         
-        if not cls.GOOGLE_SHEET_ID:
-            errors.append("GOOGLE_SHEET_ID is required")
-        
-        if not cls.GOOGLE_CREDENTIALS_PATH:
-            errors.append("GOOGLE_CREDENTIALS_PATH is required")
-        elif not Path(cls.GOOGLE_CREDENTIALS_PATH).exists():
-            errors.append(f"credentials.json not found at: {cls.GOOGLE_CREDENTIALS_PATH}")
+        if cls.DATA_SOURCE == 'google_sheets':
+            if not cls.GOOGLE_SHEET_ID:
+                errors.append("GOOGLE_SHEET_ID is required")
+            
+            if not cls.GOOGLE_CREDENTIALS_PATH:
+                errors.append("GOOGLE_CREDENTIALS_PATH is required")
+            elif not Path(cls.GOOGLE_CREDENTIALS_PATH).exists():
+                errors.append(f"credentials.json not found at: {cls.GOOGLE_CREDENTIALS_PATH}")
+        elif cls.DATA_SOURCE == 'file':
+            if not cls.DATA_SOURCE_PATH:
+                errors.append("DATA_SOURCE_PATH is required when DATA_SOURCE=file")
+            elif not Path(cls.DATA_SOURCE_PATH).exists():
+                errors.append(f"Data file not found at: {cls.DATA_SOURCE_PATH}")
+        elif cls.DATA_SOURCE != 'memory':
+            errors.append(f"Unknown DATA_SOURCE: {cls.DATA_SOURCE}")
         
         if errors:
             for error in errors:
@@ -62,6 +111,7 @@ class Config:
         
         logger.info("Configuration validated successfully")
         logger.info(f"Target chat ID: {cls.REPORT_CHAT_ID}")
+        logger.info(f"Data source: {cls.DATA_SOURCE}")
         logger.info(f"Sheet ID: {cls.GOOGLE_SHEET_ID}")
         logger.info(f"Timezone: {cls.TZ}")
         return True
@@ -0,0 +1,247 @@
+"""
+Task data sources - where the raw task rows come from.
+
+The bot only needs fetch_data / invalidate_cache / get_cache_status, so
+besides Google Sheets the rows can come from a local CSV/XLSX file
+(staging) or be generated in memory (load tests, benchmarks).
+"""
+
+import asyncio
+import csv
+import logging
+import os
+import random
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class TaskDataSource(ABC):
+    """Interface shared by all task data sources."""
+
+    @abstractmethod
+    def fetch_data(self, force_refresh: bool = False) -> list[list[str]]:
+        """
+        Fetch all rows (header row first).
+
+        Args:
+            force_refresh: If True, bypass any cache
+
+        Returns:
+            List of rows (each row is a list of cell values)
+        """
+
+    async def fetch_data_async(self, force_refresh: bool = False) -> list[list[str]]:
+        """Async variant of fetch_data(); runs it in a worker thread by default."""
+        return await asyncio.to_thread(self.fetch_data, force_refresh)
+
+    @abstractmethod
+    def invalidate_cache(self):
+        """Force cache invalidation - use when user requests refresh."""
+
+    @abstractmethod
+    def get_cache_status(self) -> dict:
+        """Get cache status information."""
+
+    def get_content_hash(self, data: list[list[str]]) -> Optional[str]:
+        """Content hash of `data` if the source already computed it, else None."""
+        return None
+
+    def load_snapshot(self) -> bool:
+        """Warm the cache from persisted data; returns True if loaded."""
+        return False
+
+    def set_job_queue(self, job_queue):
+        """Receive the bot's JobQueue for background work (optional)."""
+
+    def schedule_refresh(self):
+        """Refresh data in the background (optional)."""
+
+    def close(self):
+        """Release resources held by the data source."""
+
+
+class LocalFileDataSource(TaskDataSource):
+    """
+    Reads tasks from a local .csv or .xlsx file laid out like the sheet.
+
+    The file is re-read only when its modification time or size changes.
+    Reading .xlsx files requires openpyxl.
+    """
+
+    def __init__(self, path: str, sheet_name: Optional[str] = None):
+        self.path = Path(path)
+        self.sheet_name = sheet_name
+        self.data: Optional[list[list[str]]] = None
+        self.last_fetch: Optional[datetime] = None
+        self._file_signature: Optional[tuple[int, int]] = None
+
+    def fetch_data(self, force_refresh: bool = False) -> list[list[str]]:
+        stat = os.stat(self.path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        if not force_refresh and self.data is not None and signature == self._file_signature:
+            logger.info("Using cached data")
+            return self.data
+
+        logger.info(f"Reading tasks from file {self.path}")
+        if self.path.suffix.lower() == '.xlsx':
+            data = self._read_xlsx()
+        else:
+            data = self._read_csv()
+
+        self.data = data
+        self.last_fetch = datetime.now()
+        self._file_signature = signature
+        logger.info(f"Read {len(data)} rows from {self.path.name}")
+        return data
+
+    def _read_csv(self) -> list[list[str]]:
+        # utf-8-sig strips the BOM Excel adds when saving CSV
+        with open(self.path, newline='', encoding='utf-8-sig') as f:
+            return [row for row in csv.reader(f)]
+
+    def _read_xlsx(self) -> list[list[str]]:
+        try:
+            import openpyxl
+        except ImportError as e:
+            raise ImportError("Reading .xlsx files requires openpyxl: pip install openpyxl") from e
+
+        workbook = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            sheet = workbook[self.sheet_name] if self.sheet_name else workbook.active
+            return [[_cell_to_str(value) for value in row] for row in sheet.iter_rows(values_only=True)]
+        finally:
+            workbook.close()
+
+    def invalidate_cache(self):
+        logger.info("Cache invalidated")
+        self.data = None
+        self._file_signature = None
+
+    def get_cache_status(self) -> dict:
+        return {
+            'is_valid': self.data is not None,
+            'last_fetch': self.last_fetch,
+            'rows_cached': len(self.data) if self.data else 0,
+            'source': str(self.path)
+        }
+
+
+def _cell_to_str(value) -> str:
+    """Render an XLSX cell the way Google Sheets' formatted values look."""
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.strftime('%d/%m/%Y')
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class InMemoryDataSource(TaskDataSource):
+    """Serves rows held in memory - for tests, load tests and benchmarks."""
+
+    def __init__(self, rows: list[list[str]]):
+        self.rows = rows
+        self.fetch_count = 0
+
+    def fetch_data(self, force_refresh: bool = False) -> list[list[str]]:
+        self.fetch_count += 1
+        return self.rows
+
+    async def fetch_data_async(self, force_refresh: bool = False) -> list[list[str]]:
+        # Nothing blocks here - no need for a thread hop
+        return self.fetch_data(force_refresh)
+
+    def invalidate_cache(self):
+        pass
+
+    def get_cache_status(self) -> dict:
+        return {
+            'is_valid': True,
+            'last_fetch': None,
+            'rows_cached': len(self.rows),
+            'source': 'memory'
+        }
+
+
+SHEET_HEADER = [
+    'STT', 'Họ tên', 'Nội dung công việc đã thực hiện', 'Mức độ',
+    'Deadline', 'Kết quả / Tiến độ', 'Ngày hoàn thành', 'Ghi chú'
+]
+
+_SYNTHETIC_PEOPLE = [
+    'Nguyễn Văn An', 'Trần Thị Bình', 'Lê Hoàng Cường', 'Phạm Thu Dung',
+    'Hoàng Minh Đức', 'Vũ Thị Hà', 'Đặng Quốc Huy', 'Bùi Ngọc Lan',
+    'Đỗ Thanh Long', 'Ngô Thị Mai', 'Dương Văn Nam', 'Lý Thị Oanh',
+]
+_SYNTHETIC_TASKS = [
+    'Soạn thảo công văn gửi các đơn vị', 'Tổng hợp báo cáo tháng',
+    'Chuẩn bị tài liệu cuộc họp giao ban', 'Cập nhật hồ sơ dự án chuyển đổi số',
+    'Rà soát kế hoạch đào tạo', 'Lập dự toán kinh phí hội thảo',
+    'Hoàn thiện biên bản nghiệm thu', 'Gửi giấy mời đại biểu',
+]
+_SYNTHETIC_LEVELS = ['Cao', 'Trung bình', 'Thấp', '']
+_SYNTHETIC_RESULTS = ['Hoàn thành', 'Đang thực hiện', 'Chưa bắt đầu', '', 'hoàn thành']
+
+
+def generate_synthetic_rows(count: int, seed: int = 0, today: Optional[date] = None) -> list[list[str]]:
+    """
+    Generate a sheet-shaped table of `count` random tasks (plus header).
+
+    Deadlines spread over +/- 60 days around `today` in the same formats
+    the real sheet uses, so every status bucket is populated.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    rows = [list(SHEET_HEADER)]
+
+    for i in range(1, count + 1):
+        deadline = today + timedelta(days=rng.randint(-60, 60))
+        result = rng.choice(_SYNTHETIC_RESULTS)
+        completed = 'hoàn thành' in result.lower()
+        done_on = deadline + timedelta(days=rng.randint(-5, 5)) if completed else None
+
+        deadline_raw = rng.choice([
+            deadline.strftime('%d/%m/%Y'),
+            f"{deadline.day}/{deadline.month}/{deadline.year}",
+            '',
+        ])
+        rows.append([
+            str(i),
+            rng.choice(_SYNTHETIC_PEOPLE),
+            f"{rng.choice(_SYNTHETIC_TASKS)} #{i}",
+            rng.choice(_SYNTHETIC_LEVELS),
+            deadline_raw,
+            result,
+            done_on.strftime('%d/%m/%Y') if done_on else '',
+            '',
+        ])
+
+    return rows
+
+
+def create_data_source() -> TaskDataSource:
+    """Build the data source selected by Config.DATA_SOURCE."""
+    source = config.DATA_SOURCE
+
+    if source == 'google_sheets':
+        # Imported here so file/memory sources work without Google credentials
+        from app.sheets import GoogleSheetsClient
+        from app.snapshot import SnapshotStore
+
+        snapshot_store = SnapshotStore(config.SNAPSHOT_PATH) if config.SNAPSHOT_PATH else None
+        return GoogleSheetsClient(snapshot_store=snapshot_store)
+
+    if source == 'file':
+        return LocalFileDataSource(config.DATA_SOURCE_PATH)
+
+    if source == 'memory':
+        return InMemoryDataSource(generate_synthetic_rows(config.SYNTHETIC_ROWS))
+
+    raise ValueError(f"Unknown DATA_SOURCE '{source}' (expected google_sheets, file or memory)")
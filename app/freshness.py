@@ -0,0 +1,55 @@
+"""
+Freshness probes - cheap checks telling whether a spreadsheet changed
+since the last full download.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional
+import gspread
+
+logger = logging.getLogger(__name__)
+
+
+class FreshnessProbe(ABC):
+    """Returns a version token that changes whenever the sheet content changes."""
+
+    @abstractmethod
+    def get_version(self) -> Optional[str]:
+        """
+        Get the current version token.
+
+        Returns:
+            Opaque version string, or None if the version is unknown
+            (callers must then assume the data changed)
+        """
+
+
+class DriveModifiedTimeProbe(FreshnessProbe):
+    """
+    Uses the Drive API 'modifiedTime' of the spreadsheet file.
+
+    One small metadata request instead of downloading the whole worksheet.
+    Note: values recomputed by volatile formulas (TODAY(), NOW()) do not
+    bump modifiedTime.
+    """
+
+    def __init__(self, client: gspread.Client, sheet_id: str):
+        self.client = client
+        self.sheet_id = sheet_id
+
+    def get_version(self) -> Optional[str]:
+        metadata = self.client.get_file_drive_metadata(self.sheet_id)
+        return metadata.get('modifiedTime')
+
+
+class FakeFreshnessProbe(FreshnessProbe):
+    """In-memory probe for offline tests - set `version` to simulate edits."""
+
+    def __init__(self, version: Optional[str] = None):
+        self.version = version
+        self.calls = 0
+
+    def get_version(self) -> Optional[str]:
+        self.calls += 1
+        return self.version
@@ -0,0 +1,247 @@
+"""
+Daily history - one compact aggregate per day for trend reports.
+
+After each daily job the day's totals, per-person counts and an
+overdue-age histogram are stored in a local SQLite file. The weekly report
+compares today with the stored days a week, two weeks and up to a month
+ago - a few indexed lookups instead of keeping old sheet snapshots.
+"""
+
+import json
+import logging
+import sqlite3
+from bisect import bisect_right
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Optional
+from app.aggregation import UNKNOWN_PERSON
+from app.config import config
+from app.models import Task, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+# Overdue age buckets by lower bound in days: 1-3, 4-7, 8-14, 15-30, 31+
+OVERDUE_AGE_BOUNDS = (1, 4, 8, 15, 31)
+
+
+def overdue_age_labels() -> list[str]:
+    """Display labels of the overdue age buckets."""
+    labels = []
+    for low, high in zip(OVERDUE_AGE_BOUNDS, OVERDUE_AGE_BOUNDS[1:]):
+        labels.append(f"{low}-{high - 1} ngày")
+    labels.append(f"{OVERDUE_AGE_BOUNDS[-1]}+ ngày")
+    return labels
+
+
+@dataclass(frozen=True, slots=True)
+class PersonCounts:
+    """Task counts of one person on one day."""
+
+    open: int = 0
+    overdue: int = 0
+    completed: int = 0
+
+
+@dataclass(frozen=True)
+class DailyAggregate:
+    """Totals of one day, as stored in the history."""
+
+    day: date
+    open: int
+    overdue: int
+    completed: int  # All tasks marked completed on that day
+    overdue_ages: tuple[int, ...]  # Counts per OVERDUE_AGE_BOUNDS bucket
+    persons: Mapping[str, PersonCounts]
+
+
+def aggregate_day(tasks: list[Task], day: date) -> DailyAggregate:
+    """
+    Aggregate classified tasks into the day's history entry (one pass).
+
+    Args:
+        tasks: Tasks classified for `day`
+        day: Date the entry is recorded for
+    """
+    counts: dict[str, list[int]] = {}  # name -> [open, overdue, completed]
+    ages = [0] * len(OVERDUE_AGE_BOUNDS)
+
+    for task in tasks:
+        name = task.ho_ten or UNKNOWN_PERSON
+        person = counts.get(name)
+        if person is None:
+            person = counts[name] = [0, 0, 0]
+        if task.is_completed:
+            person[2] += 1
+            continue
+        person[0] += 1
+        if task.status == TaskStatus.OVERDUE:
+            person[1] += 1
+            ages[max(bisect_right(OVERDUE_AGE_BOUNDS, task.days_overdue) - 1, 0)] += 1
+
+    persons = {name: PersonCounts(*values) for name, values in counts.items()}
+    return DailyAggregate(
+        day=day,
+        open=sum(p.open for p in persons.values()),
+        overdue=sum(p.overdue for p in persons.values()),
+        completed=sum(p.completed for p in persons.values()),
+        overdue_ages=tuple(ages),
+        persons=MappingProxyType(persons)
+    )
+
+
+@dataclass(frozen=True)
+class HistoryTrends:
+    """Today compared with stored days (None where no history exists yet)."""
+
+    current: DailyAggregate
+    week_ago: Optional[DailyAggregate]
+    two_weeks_ago: Optional[DailyAggregate]
+    month_start: Optional[DailyAggregate]  # Oldest entry of the last 30 days
+
+    def completed_last_week(self) -> Optional[int]:
+        """Tasks completed over the last 7 days (growth of the completed total)."""
+        if self.week_ago is None:
+            return None
+        return self.current.completed - self.week_ago.completed
+
+    def completed_week_before(self) -> Optional[int]:
+        """Tasks completed in the 7 days before that."""
+        if self.week_ago is None or self.two_weeks_ago is None:
+            return None
+        return self.week_ago.completed - self.two_weeks_ago.completed
+
+    def completed_per_day(self) -> Optional[float]:
+        """Average completions per day since month_start."""
+        if self.month_start is None:
+            return None
+        days = (self.current.day - self.month_start.day).days
+        if days <= 0:
+            return None
+        return (self.current.completed - self.month_start.completed) / days
+
+    def overdue_changes(self, limit: int = 3) -> list[tuple[str, int]]:
+        """People whose overdue count grew most since a week ago."""
+        if self.week_ago is None:
+            return []
+        before = self.week_ago.persons
+        changes = [
+            (name, counts.overdue - before.get(name, PersonCounts()).overdue)
+            for name, counts in self.current.persons.items()
+        ]
+        changes = [change for change in changes if change[1] > 0]
+        changes.sort(key=lambda change: change[1], reverse=True)
+        return changes[:limit]
+
+
+class HistoryStore:
+    """
+    Daily aggregates in a SQLite file, one row per day plus one per person.
+
+    Nothing is written until the first record(); reading a missing file
+    simply finds no history. Recording a day again replaces it.
+    """
+
+    # An entry counts as "a week ago" if it is 7-13 days old
+    WEEK_WINDOW_DAYS = 7
+    MONTH_DAYS = 30
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.last_day: Optional[date] = None  # Newest recorded day (part of report cache keys)
+        if self.path.exists():
+            try:
+                with closing(self._connect()) as conn:
+                    row = conn.execute("SELECT MAX(day) FROM daily").fetchone()
+                    self.last_day = date.fromisoformat(row[0]) if row and row[0] else None
+            except sqlite3.Error as e:
+                # Reports still work without trends; record() reports the error again
+                logger.warning(f"Could not read history file {self.path}: {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS daily ("
+            " day TEXT PRIMARY KEY, open INTEGER, overdue INTEGER, completed INTEGER, overdue_ages TEXT);"
+            "CREATE TABLE IF NOT EXISTS person_daily ("
+            " day TEXT, person TEXT, open INTEGER, overdue INTEGER, completed INTEGER,"
+            " PRIMARY KEY (day, person));"
+        )
+        return conn
+
+    def record(self, aggregate: DailyAggregate):
+        """Store (or replace) the entry of aggregate.day."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        day = aggregate.day.isoformat()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO daily VALUES (?, ?, ?, ?, ?)",
+                (day, aggregate.open, aggregate.overdue, aggregate.completed, json.dumps(aggregate.overdue_ages))
+            )
+            conn.execute("DELETE FROM person_daily WHERE day = ?", (day,))
+            conn.executemany(
+                "INSERT INTO person_daily VALUES (?, ?, ?, ?, ?)",
+                [(day, name, c.open, c.overdue, c.completed) for name, c in aggregate.persons.items()]
+            )
+        if self.last_day is None or aggregate.day > self.last_day:
+            self.last_day = aggregate.day
+        logger.info(f"Recorded history for {day} ({len(aggregate.persons)} people)")
+
+    def get(self, day: date) -> Optional[DailyAggregate]:
+        """Entry of exactly `day`."""
+        return self._find("day = ?", (day.isoformat(),), "day")
+
+    def latest_between(self, start: date, end: date) -> Optional[DailyAggregate]:
+        """Newest entry with start <= day <= end."""
+        return self._find("day BETWEEN ? AND ?", (start.isoformat(), end.isoformat()), "day DESC")
+
+    def earliest_between(self, start: date, end: date) -> Optional[DailyAggregate]:
+        """Oldest entry with start <= day <= end."""
+        return self._find("day BETWEEN ? AND ?", (start.isoformat(), end.isoformat()), "day")
+
+    def trends(self, current: DailyAggregate) -> HistoryTrends:
+        """Compare `current` with the entries one and two weeks and up to a month back."""
+        today = current.day
+        week = timedelta(days=self.WEEK_WINDOW_DAYS)
+        window = timedelta(days=self.WEEK_WINDOW_DAYS - 1)
+
+        week_ago = self.latest_between(today - week - window, today - week)
+        two_weeks_ago = None
+        if week_ago is not None:
+            two_weeks_ago = self.latest_between(week_ago.day - week - window, week_ago.day - week)
+        month_start = self.earliest_between(today - timedelta(days=self.MONTH_DAYS), today - timedelta(days=1))
+        return HistoryTrends(current, week_ago, two_weeks_ago, month_start)
+
+    def _find(self, where: str, params: tuple, order: str) -> Optional[DailyAggregate]:
+        if not self.path.exists():
+            return None
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                f"SELECT day, open, overdue, completed, overdue_ages FROM daily WHERE {where} ORDER BY {order} LIMIT 1",
+                params
+            ).fetchone()
+            if row is None:
+                return None
+            persons = {
+                name: PersonCounts(open_, overdue, completed)
+                for name, open_, overdue, completed in conn.execute(
+                    "SELECT person, open, overdue, completed FROM person_daily WHERE day = ?", (row[0],)
+                )
+            }
+        return DailyAggregate(
+            day=date.fromisoformat(row[0]),
+            open=row[1],
+            overdue=row[2],
+            completed=row[3],
+            overdue_ages=tuple(json.loads(row[4])),
+            persons=MappingProxyType(persons)
+        )
+
+
+def get_history_store(bot_data: dict) -> Optional[HistoryStore]:
+    """The bot's history store (None when HISTORY_PATH is empty)."""
+    if 'history' not in bot_data:
+        bot_data['history'] = HistoryStore(config.HISTORY_PATH) if config.HISTORY_PATH else None
+    return bot_data['history']
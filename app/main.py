@@ -8,7 +8,9 @@ import sys
 from telegram.ext import Application
 
 from app.config import config
-from app.sheets import GoogleSheetsClient
+from app.datasource import create_data_source
+from app.rules import shutdown_parse_pool
+from app.task_cache import ParsedTasksCache
 from app.bot import setup_handlers
 from app.scheduler import setup_jobs
 from app.word_generator import WordReportGenerator
@@ -30,6 +32,11 @@ logging.getLogger('telegram').setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
+async def refresh_after_warm_start(application: Application):
+    """post_init hook: refresh snapshot data once the bot is starting up."""
+    application.bot_data['sheets_client'].schedule_refresh()
+
+
 def main():
     """Main function to run the bot."""
     
@@ -42,27 +49,42 @@ def main():
     logger.info("Starting Telegram Bot - Work Progress Reporter")
     logger.info("=" * 60)
     
+    sheets_client = None
+    
     try:
-        # Initialize Google Sheets client
-        logger.info("Initializing Google Sheets client...")
-        sheets_client = GoogleSheetsClient()
+        # Initialize task data source (Google Sheets unless configured otherwise)
+        logger.info(f"Initializing data source ({config.DATA_SOURCE})...")
+        sheets_client = create_data_source()
         
         # Initialize Word report generator
         logger.info("Initializing Word report generator...")
         word_generator = WordReportGenerator()
         
-        # Test connection by fetching data once
-        logger.info("Testing Google Sheets connection...")
-        data = sheets_client.fetch_data()
-        logger.info(f"Successfully connected to Google Sheets ({len(data)} rows)")
+        # Start warm from the last snapshot; otherwise test connection by fetching data once
+        warm_start = sheets_client.load_snapshot()
+        if warm_start:
+            logger.info("Warm start from snapshot, data will be refreshed in background")
+        else:
+            logger.info("Testing data source connection...")
+            data = sheets_client.fetch_data()
+            logger.info(f"Successfully loaded task data ({len(data)} rows)")
         
         # Create Telegram bot application
         logger.info("Creating Telegram bot application...")
-        application = Application.builder().token(config.TELEGRAM_BOT_TOKEN).build()
+        builder = Application.builder().token(config.TELEGRAM_BOT_TOKEN)
+        if warm_start:
+            # Queued from post_init, inside the running event loop; the job runs
+            # as soon as run_polling starts the JobQueue
+            builder = builder.post_init(refresh_after_warm_start)
+        application = builder.build()
         
         # Store sheets client and word generator in bot_data for access in handlers
         application.bot_data['sheets_client'] = sheets_client
         application.bot_data['word_generator'] = word_generator
+        application.bot_data['task_cache'] = ParsedTasksCache()
+        
+        # Let the sheets client refresh expired data in the background
+        sheets_client.set_job_queue(application.job_queue)
         
         # Setup handlers
         logger.info("Setting up bot handlers...")
@@ -88,6 +110,9 @@ def main():
         logger.error(f"Fatal error: {e}", exc_info=True)
         sys.exit(1)
     finally:
+        if sheets_client is not None:
+            sheets_client.close()
+        shutdown_parse_pool()
         logger.info("Bot stopped.")
 
 
@@ -2,10 +2,25 @@
 Data models for tasks and classifications.
 """
 
+import sys
+from array import array
 from dataclasses import dataclass, field
 from datetime import date
-from typing import Optional
+from typing import Iterable, Optional
 from enum import Enum
+from app.completion import is_completed_text
+
+try:
+    import numpy as np
+except ImportError:  # Optional - TaskTable falls back to plain loops
+    np = None
+
+
+# Sheet row layout: columns A-H hold the task fields. When several tabs are
+# merged, the source tab name is appended after them, flagged in the header.
+SHEET_COLUMNS = 8
+SOURCE_TAB_COLUMN = SHEET_COLUMNS
+SOURCE_TAB_HEADER = "Tab nguồn"
 
 
 class TaskStatus(Enum):
@@ -18,9 +33,14 @@ class TaskStatus(Enum):
     NO_DEADLINE = "no_deadline"
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
-    """Represents a single task from Google Sheets."""
+    """
+    Represents a single task from Google Sheets.
+    
+    Slotted (no per-instance __dict__); names and levels repeat across
+    thousands of rows, so they are interned to share one string each.
+    """
     
     stt: str  # STT (số thứ tự)
     ho_ten: str  # Họ tên
@@ -38,37 +58,33 @@ class Task:
     days_overdue: int = field(default=0)
     is_completed: bool = field(default=False)
     
+    # Tab the row came from (multi-tab mode only)
+    source_tab: str = field(default='')
+    
     def __post_init__(self):
         """Normalize text fields after initialization."""
-        self.ho_ten = self.ho_ten.strip()
+        self.ho_ten = sys.intern(self.ho_ten.strip())
         self.noi_dung = self.noi_dung.strip()
-        self.muc_do = self.muc_do.strip()
+        self.muc_do = sys.intern(self.muc_do.strip())
         self.ket_qua = self.ket_qua.strip()
         self.ghi_chu = self.ghi_chu.strip()
         self.deadline_raw = self.deadline_raw.strip()
         self.ngay_hoan_thanh_raw = self.ngay_hoan_thanh_raw.strip()
+        self.source_tab = sys.intern(self.source_tab)
         
         # Check if completed
         self._check_completion()
     
     def _check_completion(self):
         """Check if task is completed based on 'Kết quả / Tiến độ' column."""
-        if not self.ket_qua:
-            self.is_completed = False
-            return
-        
-        # Case-insensitive check for "hoàn thành"
-        ket_qua_lower = self.ket_qua.lower()
-        completion_keywords = ['hoàn thành', 'hoan thanh', 'completed', 'done']
-        
-        self.is_completed = any(keyword in ket_qua_lower for keyword in completion_keywords)
+        self.is_completed = is_completed_text(self.ket_qua)
     
     def __str__(self) -> str:
         """String representation for debugging."""
         return f"Task({self.ho_ten}: {self.noi_dung[:30]}... | Deadline: {self.deadline} | Status: {self.status.value})"
 
 
-@dataclass
+@dataclass(slots=True)
 class TasksByPerson:
     """Groups tasks by person for reporting."""
     
@@ -79,3 +95,120 @@ class TasksByPerson:
     overdue_tasks: list[Task] = field(default_factory=list)
     due_soon_tasks: list[Task] = field(default_factory=list)
     all_tasks: list[Task] = field(default_factory=list)
+
+
+class TaskTable:
+    """
+    Columnar copy of a task list for bulk counting.
+    
+    Dates are stored as day ordinals (0 = no date), status as small-int
+    codes and people as interned ids, each in a typed array. Filters return
+    row positions into `tasks`; they are vectorized when NumPy is installed.
+    """
+    
+    NO_DATE = 0
+    STATUSES = tuple(TaskStatus)
+    UNKNOWN_PERSON = "Không rõ"  # Same label as group_tasks_by_person
+    
+    def __init__(self, tasks: list[Task]):
+        self.tasks = tasks
+        self.persons: list[str] = []
+        self.person_ids: dict[str, int] = {}
+        self.person = array('i')
+        self.deadline = array('i')
+        self.completed_on = array('i')
+        self.status = array('b')
+        self.completed = array('b')
+        
+        status_codes = {status: code for code, status in enumerate(self.STATUSES)}
+        for task in tasks:
+            name = task.ho_ten or self.UNKNOWN_PERSON
+            person_id = self.person_ids.get(name)
+            if person_id is None:
+                person_id = self.person_ids[name] = len(self.persons)
+                self.persons.append(name)
+            
+            self.person.append(person_id)
+            self.deadline.append(task.deadline.toordinal() if task.deadline else self.NO_DATE)
+            self.completed_on.append(task.ngay_hoan_thanh.toordinal() if task.ngay_hoan_thanh else self.NO_DATE)
+            self.status.append(status_codes[task.status])
+            self.completed.append(task.is_completed)
+    
+    def __len__(self) -> int:
+        return len(self.tasks)
+    
+    @staticmethod
+    def _view(column: array):
+        """Zero-copy NumPy view of an array column."""
+        return np.frombuffer(column, dtype=np.dtype(column.typecode))
+    
+    def select(self, rows: Iterable[int]) -> list[Task]:
+        """Tasks at the given row positions."""
+        return [self.tasks[i] for i in rows]
+    
+    def open_rows(self) -> list[int]:
+        """Rows of incomplete tasks."""
+        if np is not None:
+            return np.flatnonzero(self._view(self.completed) == 0).tolist()
+        return [i for i, done in enumerate(self.completed) if not done]
+    
+    def rows_with_status(self, *statuses: TaskStatus) -> list[int]:
+        """Rows of incomplete tasks having any of the given statuses."""
+        codes = [self.STATUSES.index(status) for status in statuses]
+        if np is not None:
+            mask = np.isin(self._view(self.status), codes) & (self._view(self.completed) == 0)
+            return np.flatnonzero(mask).tolist()
+        return [
+            i for i, (code, done) in enumerate(zip(self.status, self.completed))
+            if code in codes and not done
+        ]
+    
+    def overdue_rows(self, today: date) -> list[int]:
+        """Rows of incomplete tasks whose deadline is before `today`."""
+        return self._open_deadline_rows(self.NO_DATE + 1, today.toordinal() - 1)
+    
+    def due_within_rows(self, days: int, today: date) -> list[int]:
+        """Rows of incomplete tasks due between `today` and `days` days later."""
+        start = today.toordinal()
+        return self._open_deadline_rows(start, start + days)
+    
+    def _open_deadline_rows(self, first: int, last: int) -> list[int]:
+        if np is not None:
+            deadline = self._view(self.deadline)
+            mask = (deadline >= first) & (deadline <= last) & (self._view(self.completed) == 0)
+            return np.flatnonzero(mask).tolist()
+        return [
+            i for i, (day, done) in enumerate(zip(self.deadline, self.completed))
+            if first <= day <= last and not done
+        ]
+    
+    def completed_between_rows(self, start: date, end: date) -> list[int]:
+        """Rows with a completion date in [start, end]."""
+        first, last = start.toordinal(), end.toordinal()
+        if np is not None:
+            completed_on = self._view(self.completed_on)
+            return np.flatnonzero((completed_on >= first) & (completed_on <= last)).tolist()
+        return [i for i, day in enumerate(self.completed_on) if first <= day <= last]
+    
+    def count_by_person(self, rows: Optional[Iterable[int]] = None) -> dict[str, int]:
+        """
+        Count rows per person (all rows if `rows` is None).
+        
+        People are listed in order of first appearance, like group_tasks_by_person.
+        """
+        if rows is None:
+            rows = range(len(self.tasks))
+        
+        if np is not None:
+            person = self._view(self.person)[np.fromiter(rows, dtype=np.intp)]
+            if not len(person):
+                return {}
+            counts = np.bincount(person, minlength=len(self.persons))
+            ids, first_seen = np.unique(person, return_index=True)
+            return {self.persons[pid]: int(counts[pid]) for pid in ids[np.argsort(first_seen)]}
+        
+        counts: dict[str, int] = {}
+        for i in rows:
+            name = self.persons[self.person[i]]
+            counts[name] = counts.get(name, 0) + 1
+        return counts
@@ -0,0 +1,142 @@
+"""
+Report pagination - split long reports into Telegram-sized messages.
+
+Telegram rejects messages over 4096 characters, counted in UTF-16 code
+units (most emoji count twice). Reports are split at blank lines between
+sections, falling back to line breaks for a single oversized section.
+Pages are cached under a short token so the ◀ ▶ buttons can serve them
+without re-fetching or re-rendering.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+PAGE_FOOTER_RESERVE = 32  # Room for "📄 Trang x/y"
+SECTION_SEPARATOR = "\n\n"
+
+
+def message_length(text: str) -> int:
+    """Length of `text` as Telegram counts it (UTF-16 code units)."""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def split_report(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> list[str]:
+    """
+    Split `text` into pages of at most `limit` characters.
+
+    Short texts are returned unchanged as a single page; otherwise every
+    page ends with a "📄 Trang x/y" footer.
+    """
+    if message_length(text) <= limit:
+        return [text]
+
+    budget = limit - PAGE_FOOTER_RESERVE
+    pages: list[str] = []
+    current: list[str] = []
+    size = 0
+    for block in _blocks(text, budget):
+        block_size = message_length(block)
+        added = block_size + (len(SECTION_SEPARATOR) if current else 0)
+        if current and size + added > budget:
+            pages.append(SECTION_SEPARATOR.join(current))
+            current, size = [], 0
+            added = block_size
+        current.append(block)
+        size += added
+    if current:
+        pages.append(SECTION_SEPARATOR.join(current))
+
+    total = len(pages)
+    return [f"{page}{SECTION_SEPARATOR}📄 Trang {number}/{total}" for number, page in enumerate(pages, 1)]
+
+
+def _blocks(text: str, budget: int) -> list[str]:
+    """Sections of `text`, with sections over `budget` cut at line breaks."""
+    blocks = []
+    for section in text.split(SECTION_SEPARATOR):
+        if message_length(section) <= budget:
+            blocks.append(section)
+            continue
+
+        piece: list[str] = []
+        size = 0
+        for line in section.split("\n"):
+            for part in _hard_split(line, budget):
+                part_size = message_length(part)
+                added = part_size + (1 if piece else 0)
+                if piece and size + added > budget:
+                    blocks.append("\n".join(piece))
+                    piece, size = [], 0
+                    added = part_size
+                piece.append(part)
+                size += added
+        if piece:
+            blocks.append("\n".join(piece))
+    return blocks
+
+
+def _hard_split(line: str, budget: int) -> list[str]:
+    """Cut a single line longer than `budget` (rare: very long task content)."""
+    if message_length(line) <= budget:
+        return [line]
+    parts = []
+    start = size = 0
+    for i, char in enumerate(line):
+        char_size = 2 if ord(char) > 0xFFFF else 1
+        if size + char_size > budget:
+            parts.append(line[start:i])
+            start, size = i, 0
+        size += char_size
+    parts.append(line[start:])
+    return parts
+
+
+class ReportPageCache:
+    """
+    Pages of recently sent long reports, keyed by a short token.
+
+    The token is a hash of the report text, so the same report sent to
+    several people is split and stored once. The oldest reports are dropped
+    beyond MAX_REPORTS.
+    """
+
+    MAX_REPORTS = 64
+
+    def __init__(self):
+        self._pages: OrderedDict[str, list[str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def paginate(self, text: str) -> tuple[Optional[str], list[str]]:
+        """
+        Split `text` into pages and remember them.
+
+        Returns:
+            (token, pages) - token is None for a single page (nothing to page)
+        """
+        if message_length(text) <= TELEGRAM_MESSAGE_LIMIT:
+            return None, [text]
+
+        token = hashlib.blake2b(text.encode('utf-8'), digest_size=4).hexdigest()
+        pages = self._pages.get(token)
+        if pages is not None:
+            self._pages.move_to_end(token)
+            self.hits += 1
+            return token, pages
+
+        self.misses += 1
+        pages = split_report(text)
+        self._pages[token] = pages
+        if len(self._pages) > self.MAX_REPORTS:
+            self._pages.popitem(last=False)
+        return token, pages
+
+    def get(self, token: str) -> Optional[list[str]]:
+        """Pages stored under `token`, or None if expired."""
+        return self._pages.get(token)
+
+    def get_stats(self) -> dict:
+        """Get cache hit/miss counters."""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._pages)}
@@ -0,0 +1,148 @@
+"""
+Rendered report cache - build each report text once per snapshot and day.
+
+Several people pressing the same menu button within minutes get the same
+string; it is rebuilt only when the data, the local date or the display
+settings change.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Optional
+from app.config import config
+from app.history import HistoryStore, get_history_store
+from app.reporting import (
+    build_daily_report, build_weekly_report, build_today_tasks_report,
+    build_overdue_by_person_report, build_due_soon_report
+)
+from app.rules import get_current_date
+from app.task_cache import TaskSnapshot
+
+logger = logging.getLogger(__name__)
+
+REPORT_BUILDERS: dict[str, Callable] = {
+    'daily': build_daily_report,
+    'weekly': build_weekly_report,
+    'today': build_today_tasks_report,
+    'overdue': build_overdue_by_person_report,
+    'due_soon': build_due_soon_report,
+}
+REPORTS_WITH_HISTORY = {'weekly'}
+
+
+def display_settings() -> tuple:
+    """Config values that change report text without changing the data."""
+    return (config.MAX_DISPLAY_ITEMS,)
+
+
+class RenderedReportCache:
+    """
+    LRU of report text keyed by (report type, snapshot hash, date, settings).
+
+    Entries of an older snapshot or day are dropped as soon as a report for
+    newer data is requested, so a refresh or midnight invalidates the cache
+    without any explicit call. Recording a new history day does the same
+    for reports with trend sections.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, history: Optional[HistoryStore] = None):
+        self.max_entries = config.REPORT_CACHE_SIZE if max_entries is None else max_entries
+        self.history = history
+        self._reports: OrderedDict[tuple, str] = OrderedDict()
+        self._version: Optional[tuple] = None
+        # Reports with history are rendered in worker threads (see render_report)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, report_type: str, snapshot: TaskSnapshot, today: Optional[date] = None) -> str:
+        """
+        Get the text of a report for `snapshot`, rendering it on a miss.
+
+        Args:
+            report_type: Key of REPORT_BUILDERS
+            snapshot: Parsed tasks the report is built from
+            today: Current date (if None, will be computed)
+        """
+        builder = REPORT_BUILDERS[report_type]
+        if today is None:
+            today = get_current_date()
+
+        key = (report_type, snapshot.content_hash, today, display_settings())
+        with self._lock:
+            version = (snapshot.content_hash, today, self.history.last_day if self.history else None)
+            if version != self._version:
+                if self._reports:
+                    self.invalidations += 1
+                    logger.debug(f"Dropping {len(self._reports)} rendered reports of an older snapshot")
+                self._reports.clear()
+                self._version = version
+
+            text = self._reports.get(key)
+            if text is not None:
+                self._reports.move_to_end(key)
+                self.hits += 1
+                return text
+            self.misses += 1
+
+        text = self._render(builder, report_type, snapshot)
+        if text is None:
+            # History unreadable - send the report without trends, don't cache it
+            return builder(snapshot.tasks, snapshot.index)
+
+        with self._lock:
+            if self.max_entries > 0 and version == self._version:
+                self._reports[key] = text
+                if len(self._reports) > self.max_entries:
+                    self._reports.popitem(last=False)
+        return text
+
+    def _render(self, builder: Callable, report_type: str, snapshot: TaskSnapshot) -> Optional[str]:
+        """Build the report text; None if its history could not be read."""
+        if report_type not in REPORTS_WITH_HISTORY or self.history is None:
+            return builder(snapshot.tasks, snapshot.index)
+        try:
+            return builder(snapshot.tasks, snapshot.index, history=self.history)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read report history, sending {report_type} report without trends: {e}")
+            return None
+
+    def clear(self):
+        """Drop all rendered reports."""
+        self._reports.clear()
+        self._version = None
+
+    def get_stats(self) -> dict:
+        """Get cache hit/miss counters."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'size': len(self._reports)
+        }
+
+
+async def render_report(bot_data: dict, snapshot: TaskSnapshot, report_type: str) -> str:
+    """
+    Report text for `snapshot` from the bot's shared cache.
+
+    Reports with trend sections query the SQLite history, so they are
+    rendered in a worker thread.
+
+    Args:
+        bot_data: Application.bot_data (holds 'report_cache' and 'history')
+        snapshot: Parsed tasks from load_task_snapshot
+        report_type: Key of REPORT_BUILDERS
+    """
+    report_cache: Optional[RenderedReportCache] = bot_data.get('report_cache')
+    if report_cache is None:
+        history = await asyncio.to_thread(get_history_store, bot_data)
+        report_cache = bot_data.setdefault('report_cache', RenderedReportCache(history=history))
+    if report_type in REPORTS_WITH_HISTORY and report_cache.history is not None:
+        return await asyncio.to_thread(report_cache.get, report_type, snapshot)
+    return report_cache.get(report_type, snapshot)
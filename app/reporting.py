@@ -3,11 +3,15 @@ Reporting module - builds formatted messages for Telegram.
 """
 
 import logging
-from datetime import date, timedelta
+from datetime import date
 from typing import Optional
 from app.config import config
+from app.aggregation import ReportSummary
+from app.history import HistoryStore, HistoryTrends, aggregate_day, overdue_age_labels
 from app.models import Task, TaskStatus, TasksByPerson
-from app.rules import get_current_date, group_tasks_by_status, group_tasks_by_person
+from app.rules import get_current_date
+from app.search import SearchResults
+from app.task_index import TaskIndex
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +36,11 @@ def escape_markdown(text: str) -> str:
     return text
 
 
+def _summary(tasks: list[Task], index: Optional[TaskIndex], today: date) -> ReportSummary:
+    """Shared aggregates of `tasks` (index built here if not given)."""
+    return (index or TaskIndex(tasks)).summary(today)
+
+
 def build_task_line(task: Task, show_person: bool = True, show_days_overdue: bool = False) -> str:
     """
     Build a single line for a task.
@@ -81,7 +90,7 @@ def build_task_line(task: Task, show_person: bool = True, show_days_overdue: boo
     return " | ".join(parts)
 
 
-def build_daily_report(tasks: list[Task]) -> str:
+def build_daily_report(tasks: list[Task], index: Optional[TaskIndex] = None) -> str:
     """
     Build daily morning report (6:00 AM).
     
@@ -93,10 +102,14 @@ def build_daily_report(tasks: list[Task]) -> str:
     - DUE_2_3_DAYS
     - NO_DEADLINE
     - ON_TRACK (summary only)
+    
+    Args:
+        tasks: All parsed tasks
+        index: Index over `tasks` (built here if not given)
     """
     today = get_current_date()
-    incomplete_tasks = [t for t in tasks if not t.is_completed]
-    groups = group_tasks_by_status(incomplete_tasks)
+    summary = _summary(tasks, index, today)
+    groups = summary.open_by_status
     
     max_items = config.MAX_DISPLAY_ITEMS
     
@@ -108,7 +121,7 @@ def build_daily_report(tasks: list[Task]) -> str:
     lines.append("")
     
     # Summary
-    lines.append(f"📌 Tổng số việc chưa hoàn thành: {len(incomplete_tasks)}")
+    lines.append(f"📌 Tổng số việc chưa hoàn thành: {summary.open_count}")
     lines.append("")
     
     # OVERDUE
@@ -183,7 +196,11 @@ def build_daily_report(tasks: list[Task]) -> str:
     return "\n".join(lines)
 
 
-def build_weekly_report(tasks: list[Task]) -> str:
+def build_weekly_report(
+    tasks: list[Task],
+    index: Optional[TaskIndex] = None,
+    history: Optional[HistoryStore] = None
+) -> str:
     """
     Build weekly report (Friday 5:00 PM).
     
@@ -192,30 +209,18 @@ def build_weekly_report(tasks: list[Task]) -> str:
     - Summary
     - Top 10 most overdue tasks
     - Statistics by person
-    """
-    today = get_current_date()
-    
-    # Get week start (Monday) and week end (Sunday)
-    week_start = today - timedelta(days=today.weekday())  # Monday
-    week_end = week_start + timedelta(days=6)  # Sunday
-    
-    # Filter tasks completed this week
-    completed_this_week = [
-        t for t in tasks 
-        if t.ngay_hoan_thanh and week_start <= t.ngay_hoan_thanh <= week_end
-    ]
+    - Week-over-week and 30-day trends (only with `history`)
     
-    # Group completed tasks by person
-    completed_by_person = {}
-    for task in completed_this_week:
-        name = task.ho_ten
-        if name not in completed_by_person:
-            completed_by_person[name] = []
-        completed_by_person[name].append(task)
-    
-    # Get incomplete tasks for current status
-    incomplete_tasks = [t for t in tasks if not t.is_completed]
-    groups = group_tasks_by_status(incomplete_tasks)
+    Args:
+        tasks: All parsed tasks
+        index: Index over `tasks` (built here if not given)
+        history: Stored daily aggregates to compare with
+    """
+    summary = _summary(tasks, index, get_current_date())
+    week_start, week_end = summary.week_start, summary.week_end
+    completed_this_week = summary.completed_this_week
+    completed_by_person = summary.completed_by_person
+    groups = summary.open_by_status
     
     lines = []
     lines.append("=" * 50)
@@ -242,7 +247,7 @@ def build_weekly_report(tasks: list[Task]) -> str:
     
     # Current status summary
     lines.append(f"📌 TÌNH TRẠNG HIỆN TẠI")
-    lines.append(f"   • Chưa hoàn thành: {len(incomplete_tasks)} việc")
+    lines.append(f"   • Chưa hoàn thành: {summary.open_count} việc")
     lines.append("")
     
     # Overdue summary
@@ -260,43 +265,76 @@ def build_weekly_report(tasks: list[Task]) -> str:
     lines.append("👥 THỐNG KÊ CHƯA HOÀN THÀNH THEO NGƯỜI")
     lines.append("")
     
-    by_person = group_tasks_by_person(incomplete_tasks)
-    
-    # Create sorted list of people by total incomplete tasks
-    person_stats = []
-    for name, person_tasks in by_person.items():
-        overdue_count = sum(1 for t in person_tasks if t.status == TaskStatus.OVERDUE)
-        due_soon_count = sum(1 for t in person_tasks if t.status in [
-            TaskStatus.DUE_TODAY, TaskStatus.DUE_TOMORROW, TaskStatus.DUE_2_3_DAYS
-        ])
-        person_stats.append({
-            'name': name,
-            'total': len(person_tasks),
-            'overdue': overdue_count,
-            'due_soon': due_soon_count
-        })
-    
-    # Sort by overdue count (descending), then by total
-    person_stats.sort(key=lambda x: (x['overdue'], x['total']), reverse=True)
-    
-    for stat in person_stats:
-        lines.append(f"👤 {stat['name']}")
-        lines.append(f"   • Tổng chưa hoàn thành: {stat['total']}")
-        lines.append(f"   • Trễ hạn: {stat['overdue']}")
-        lines.append(f"   • Sắp tới hạn (1-3 ngày): {stat['due_soon']}")
+    for stat in summary.person_stats:
+        lines.append(f"👤 {stat.name}")
+        lines.append(f"   • Tổng chưa hoàn thành: {stat.total}")
+        lines.append(f"   • Trễ hạn: {stat.overdue}")
+        lines.append(f"   • Sắp tới hạn (1-3 ngày): {stat.due_soon}")
         lines.append("")
     
+    if history is not None:
+        _add_trend_lines(lines, history.trends(aggregate_day(tasks, summary.today)))
+    
     lines.append("=" * 50)
     lines.append("🤖 Báo cáo tự động từ Telegram Bot")
     
     return "\n".join(lines)
 
 
-def build_today_tasks_report(tasks: list[Task]) -> str:
+def format_change(change: int) -> str:
+    """Signed change for trend lines: "▲ 3", "▼ 2" or "không đổi"."""
+    if change > 0:
+        return f"▲ {change}"
+    if change < 0:
+        return f"▼ {-change}"
+    return "không đổi"
+
+
+def _add_trend_lines(lines: list[str], trends: HistoryTrends):
+    """Append the week-over-week and 30-day trend sections to `lines`."""
+    current = trends.current
+    
+    lines.append("📈 SO VỚI TUẦN TRƯỚC")
+    week_ago = trends.week_ago
+    if week_ago is None:
+        lines.append("   Chưa đủ dữ liệu lịch sử (cần số liệu của tuần trước).")
+    else:
+        lines.append(f"   (so với ngày {format_date(week_ago.day)})")
+        lines.append(f"   • Chưa hoàn thành: {current.open} ({format_change(current.open - week_ago.open)})")
+        lines.append(f"   • Trễ hạn: {current.overdue} ({format_change(current.overdue - week_ago.overdue)})")
+        completed = f"   • Hoàn thành trong 7 ngày: {trends.completed_last_week()}"
+        if trends.completed_week_before() is not None:
+            completed += f" (tuần trước: {trends.completed_week_before()})"
+        lines.append(completed)
+        overdue_changes = trends.overdue_changes()
+        if overdue_changes:
+            lines.append("   • Trễ hạn tăng nhiều nhất:")
+            for name, change in overdue_changes:
+                lines.append(f"      👤 {name}: {format_change(change)}")
+    lines.append("")
+    
+    month_start = trends.month_start
+    if month_start is not None:
+        lines.append("📆 XU HƯỚNG 30 NGÀY")
+        lines.append(f"   (từ ngày {format_date(month_start.day)})")
+        lines.append(f"   • Chưa hoàn thành: {month_start.open} → {current.open}")
+        lines.append(f"   • Trễ hạn: {month_start.overdue} → {current.overdue}")
+        per_day = trends.completed_per_day()
+        if per_day is not None:
+            lines.append(f"   • Tốc độ hoàn thành: {per_day:.1f} việc/ngày")
+        lines.append("")
+    
+    if current.overdue:
+        lines.append("⏳ TUỔI CÁC VIỆC TRỄ HẠN")
+        for label, count in zip(overdue_age_labels(), current.overdue_ages):
+            lines.append(f"   • {label}: {count} việc")
+        lines.append("")
+
+
+def build_today_tasks_report(tasks: list[Task], index: Optional[TaskIndex] = None) -> str:
     """Build report for 'Công việc hôm nay' button."""
     today = get_current_date()
-    incomplete_tasks = [t for t in tasks if not t.is_completed]
-    groups = group_tasks_by_status(incomplete_tasks)
+    groups = _summary(tasks, index, today).open_by_status
     
     lines = []
     lines.append("📌 CÔNG VIỆC HÔM NAY")
@@ -339,20 +377,17 @@ def build_today_tasks_report(tasks: list[Task]) -> str:
     return "\n".join(lines)
 
 
-def build_overdue_by_person_report(tasks: list[Task]) -> str:
+def build_overdue_by_person_report(tasks: list[Task], index: Optional[TaskIndex] = None) -> str:
     """Build report for 'Ai đang trễ deadline' button."""
-    incomplete_tasks = [t for t in tasks if not t.is_completed]
-    overdue_tasks = [t for t in incomplete_tasks if t.status == TaskStatus.OVERDUE]
+    by_person = _summary(tasks, index, get_current_date()).overdue_by_person
     
-    if not overdue_tasks:
+    if not by_person:
         return "✅ Không có công việc nào trễ hạn!"
     
     lines = []
     lines.append("⏰ AI ĐANG TRỄ DEADLINE")
     lines.append("")
     
-    by_person = group_tasks_by_person(overdue_tasks)
-    
     # Sort by number of overdue tasks
     sorted_people = sorted(by_person.items(), key=lambda x: len(x[1]), reverse=True)
     
@@ -367,10 +402,9 @@ def build_overdue_by_person_report(tasks: list[Task]) -> str:
     return "\n".join(lines)
 
 
-def build_due_soon_report(tasks: list[Task]) -> str:
+def build_due_soon_report(tasks: list[Task], index: Optional[TaskIndex] = None) -> str:
     """Build report for 'Sắp tới hạn' button."""
-    incomplete_tasks = [t for t in tasks if not t.is_completed]
-    groups = group_tasks_by_status(incomplete_tasks)
+    groups = _summary(tasks, index, get_current_date()).open_by_status
     
     lines = []
     lines.append("⚠️ SẮP TỚI HẠN (1-3 NGÀY)")
@@ -402,32 +436,50 @@ def build_due_soon_report(tasks: list[Task]) -> str:
     return "\n".join(lines)
 
 
-def build_search_results(tasks: list[Task], keyword: str) -> str:
-    """Build report for search results."""
-    if not tasks:
-        return f"🔍 Không tìm thấy kết quả cho: '{keyword}'"
-    
-    lines = []
-    lines.append(f"🔍 KẾT QUẢ TÌM KIẾM: '{keyword}'")
-    lines.append(f"   Tìm thấy: {len(tasks)} việc")
-    lines.append("")
-    
-    for i, task in enumerate(tasks[:15], 1):
+SEARCH_STATUS_TEXT = {
+    TaskStatus.OVERDUE: "🚨 Trễ hạn",
+    TaskStatus.DUE_TODAY: "⏰ Hôm nay",
+    TaskStatus.DUE_TOMORROW: "📌 Ngày mai",
+    TaskStatus.DUE_2_3_DAYS: "⚠️ Sắp tới",
+    TaskStatus.ON_TRACK: "✅ Đúng tiến độ"
+}
+
+
+def _add_search_result_lines(lines: list[str], tasks: list[Task], start: int = 1):
+    """Append numbered search result entries to `lines`."""
+    for i, task in enumerate(tasks, start):
         lines.append(f"{i}. {build_task_line(task, show_person=True, show_days_overdue=(task.status == TaskStatus.OVERDUE))}")
         # Only show status for incomplete tasks
         if not task.is_completed and task.status != TaskStatus.NO_DEADLINE:
-            status_text = {
-                TaskStatus.OVERDUE: "🚨 Trễ hạn",
-                TaskStatus.DUE_TODAY: "⏰ Hôm nay",
-                TaskStatus.DUE_TOMORROW: "📌 Ngày mai",
-                TaskStatus.DUE_2_3_DAYS: "⚠️ Sắp tới",
-                TaskStatus.ON_TRACK: "✅ Đúng tiến độ"
-            }.get(task.status, "")
+            status_text = SEARCH_STATUS_TEXT.get(task.status, "")
             if status_text:
                 lines.append(f"   {status_text}")
         lines.append("")
+
+
+def build_search_page(results: SearchResults, cursor: int = 0) -> str:
+    """
+    Build one page of ranked search results.
+    
+    Args:
+        results: Ranked results of the query
+        cursor: Start offset of the page
+    """
+    if not results.total:
+        return f"🔍 Không tìm thấy kết quả cho: '{results.query}'"
+    
+    page_count = max(1, -(-len(results.tasks) // results.page_size))
+    page_number = cursor // results.page_size + 1
+    
+    lines = []
+    lines.append(f"🔍 KẾT QUẢ TÌM KIẾM: '{results.query}'")
+    lines.append(f"   Tìm thấy: {results.total} việc (xếp theo mức độ liên quan)")
+    lines.append(f"   Trang {page_number}/{page_count}")
+    lines.append("")
+    
+    _add_search_result_lines(lines, results.page(cursor), start=cursor + 1)
     
-    if len(tasks) > 15:
-        lines.append(f"... và {len(tasks) - 15} kết quả khác")
+    if results.next_cursor(cursor) is None and results.total > len(results.tasks):
+        lines.append(f"... và {results.total - len(results.tasks)} kết quả khác, hãy thu hẹp từ khóa")
     
     return "\n".join(lines)
@@ -3,20 +3,85 @@ Business rules: parsing deadlines, classifying tasks, normalizing text.
 """
 
 import logging
+import multiprocessing
+import os
 import re
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from datetime import date, datetime, timedelta
 from typing import Optional
 import pytz
 from app.config import config
-from app.models import Task, TaskStatus
+from app.models import Task, TaskStatus, SOURCE_TAB_COLUMN, SOURCE_TAB_HEADER
+from app.text import COMBINING_MARKS, normalize_text  # Re-exported for existing importers
 
 logger = logging.getLogger(__name__)
 
 
+class LocalDayClock:
+    """
+    Today's date in Config.TZ, cached until the next local midnight.
+    
+    Between midnights a lookup is one float comparison; the timezone object
+    is created once per Config.TZ value.
+    """
+    
+    def __init__(self):
+        self._tz_name: Optional[str] = None
+        self._tz = None
+        self._today: Optional[date] = None
+        self._expires_at = 0.0  # Unix time of the next local midnight
+    
+    @property
+    def tz(self):
+        """Configured timezone."""
+        if self._tz_name != config.TZ:
+            self._tz = pytz.timezone(config.TZ)
+            self._tz_name = config.TZ
+            self._expires_at = 0.0
+        return self._tz
+    
+    def today(self, now: Optional[float] = None) -> date:
+        """
+        Get the local date.
+        
+        Args:
+            now: Unix time to use instead of the current time
+        """
+        tz = self.tz
+        if now is None:
+            now = time.time()
+        if now < self._expires_at:
+            return self._today
+        
+        today = datetime.fromtimestamp(now, tz).date()
+        next_midnight = tz.localize(datetime.combine(today + timedelta(days=1), datetime.min.time()))
+        self._today = today
+        self._expires_at = next_midnight.timestamp()
+        return today
+    
+    def invalidate(self):
+        """Forget the cached date."""
+        self._expires_at = 0.0
+
+
+_clock = LocalDayClock()
+
+
 def get_current_date() -> date:
     """Get current date in configured timezone."""
-    tz = pytz.timezone(config.TZ)
-    return datetime.now(tz).date()
+    return _clock.today()
+
+
+DMY_PATTERN = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')  # dd/mm/yyyy
+YMD_PATTERN = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')  # yyyy-mm-dd
+SERIAL_BASE_DATE = date(1899, 12, 30)  # Google Sheets day 0
+
+# Many rows share the same date strings - remember recent results
+DEADLINE_CACHE_SIZE = 4096
 
 
 def parse_deadline(deadline_str: str) -> Optional[date]:
@@ -30,46 +95,56 @@ def parse_deadline(deadline_str: str) -> Optional[date]:
     
     Returns None if parsing fails.
     """
-    if not deadline_str or not deadline_str.strip():
+    if not deadline_str:
         return None
     
     deadline_str = deadline_str.strip()
+    if not deadline_str:
+        return None
     
-    # Try dd/mm/yyyy or d/m/yyyy
-    patterns = [
-        r'^(\d{1,2})/(\d{1,2})/(\d{4})$',  # dd/mm/yyyy
-        r'^(\d{4})-(\d{1,2})-(\d{1,2})$',  # yyyy-mm-dd
-    ]
-    
-    for pattern in patterns:
-        match = re.match(pattern, deadline_str)
-        if match:
-            try:
-                if pattern.startswith(r'^\d{4}'):  # yyyy-mm-dd
-                    year, month, day = match.groups()
-                else:  # dd/mm/yyyy
-                    day, month, year = match.groups()
-                
-                return date(int(year), int(month), int(day))
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Invalid date values in '{deadline_str}': {e}")
-                continue
+    return _parse_deadline_cached(deadline_str)
+
+
+@lru_cache(maxsize=DEADLINE_CACHE_SIZE)
+def _parse_deadline_cached(deadline_str: str) -> Optional[date]:
+    """Parse a stripped, non-empty date string (memoized)."""
+    # Dispatch on the separator instead of trying every pattern
+    if deadline_str[0].isdigit():
+        if '/' in deadline_str:
+            match = DMY_PATTERN.fullmatch(deadline_str)
+            if match:
+                day, month, year = match.groups()
+                return _make_date(deadline_str, int(year), int(month), int(day))
+        elif '-' in deadline_str:
+            match = YMD_PATTERN.fullmatch(deadline_str)
+            if match:
+                year, month, day = match.groups()
+                return _make_date(deadline_str, int(year), int(month), int(day))
     
     # Try Google Sheets serial number (days since 1899-12-30)
     try:
         serial = float(deadline_str)
         if 1 <= serial <= 100000:  # Reasonable range for dates
-            base_date = date(1899, 12, 30)
-            result_date = base_date + timedelta(days=int(serial))
+            result_date = SERIAL_BASE_DATE + timedelta(days=int(serial))
             logger.debug(f"Parsed serial number {serial} as {result_date}")
             return result_date
     except (ValueError, TypeError):
         pass
     
-    logger.warning(f"Could not parse deadline: '{deadline_str}'")
+    # Reported once per batch by parse_all_tasks instead of once per cell
+    logger.debug(f"Could not parse deadline: '{deadline_str}'")
     return None
 
 
+def _make_date(deadline_str: str, year: int, month: int, day: int) -> Optional[date]:
+    """Build a date, returning None for impossible values like 32/13/2024."""
+    try:
+        return date(year, month, day)
+    except ValueError as e:
+        logger.debug(f"Invalid date values in '{deadline_str}': {e}")
+        return None
+
+
 def classify_task(task: Task, today: Optional[date] = None) -> Task:
     """
     Classify task based on deadline and current date.
@@ -85,43 +160,83 @@ def classify_task(task: Task, today: Optional[date] = None) -> Task:
     if today is None:
         today = get_current_date()
     
+    _classify(task, today.toordinal())
+    return task
+
+
+def classify_tasks(tasks: list[Task], today: Optional[date] = None) -> list[Task]:
+    """
+    Classify all tasks in place for `today` (if None, will be computed).
+    
+    Parsing does not depend on the date, so when the day rolls over a
+    snapshot is re-classified with this O(n) pass instead of re-parsed.
+    """
+    if today is None:
+        today = get_current_date()
+    
+    today_ordinal = today.toordinal()
+    for task in tasks:
+        _classify(task, today_ordinal)
+    return tasks
+
+
+def _classify(task: Task, today_ordinal: int):
+    """Set status and days_overdue from day ordinals (integers only)."""
     # If task is completed, don't classify for alerts
     if task.is_completed:
         task.status = TaskStatus.ON_TRACK  # Just mark as on track
         task.days_overdue = 0
-        return task
+        return
     
     # If no valid deadline
     if task.deadline is None:
         task.status = TaskStatus.NO_DEADLINE
         task.days_overdue = 0
-        return task
+        return
     
     # Calculate difference
-    delta_days = (task.deadline - today).days
+    delta_days = task.deadline.toordinal() - today_ordinal
     
     if delta_days < 0:  # Overdue
         task.status = TaskStatus.OVERDUE
-        task.days_overdue = abs(delta_days)
-    elif delta_days == 0:  # Due today
+        task.days_overdue = -delta_days
+        return
+    
+    task.days_overdue = 0
+    if delta_days == 0:  # Due today
         task.status = TaskStatus.DUE_TODAY
-        task.days_overdue = 0
     elif delta_days == 1:  # Due tomorrow
         task.status = TaskStatus.DUE_TOMORROW
-        task.days_overdue = 0
-    elif delta_days in [2, 3]:  # Due in 2-3 days
+    elif delta_days <= 3:  # Due in 2-3 days
         task.status = TaskStatus.DUE_2_3_DAYS
-        task.days_overdue = 0
     else:  # delta_days >= 4
         task.status = TaskStatus.ON_TRACK
-        task.days_overdue = 0
+
+
+def parse_sheet_row(
+    row: list[str],
+    row_index: int,
+    source_tab: str = '',
+    today: Optional[date] = None
+) -> Optional[Task]:
+    """
+    Parse a single row from Google Sheets into a classified Task object.
+    
+    Args:
+        source_tab: Name of the tab the row was read from (multi-tab mode)
+        today: Date used to classify the task (if None, will be computed)
     
+    Returns None if row is invalid or empty.
+    """
+    task = _build_task(row, source_tab)
+    if task:
+        classify_task(task, today)
     return task
 
 
-def parse_sheet_row(row: list[str], row_index: int) -> Optional[Task]:
+def _build_task(row: list[str], source_tab: str = '') -> Optional[Task]:
     """
-    Parse a single row from Google Sheets into a Task object.
+    Build an unclassified Task from a row (does not depend on the date).
     
     Expected columns:
     0: STT
@@ -138,9 +253,9 @@ def parse_sheet_row(row: list[str], row_index: int) -> Optional[Task]:
     if len(row) < 5:  # At minimum need: STT, Họ tên, Nội dung, Mức độ, Deadline
         return None
     
-    # Pad row with empty strings if needed
-    while len(row) < 8:
-        row.append('')
+    # Pad row with empty strings if needed (on a copy - cached rows stay untouched)
+    if len(row) < 8:
+        row = row + [''] * (8 - len(row))
     
     # Skip if essential fields are empty
     ho_ten = row[1].strip()
@@ -168,41 +283,211 @@ def parse_sheet_row(row: list[str], row_index: int) -> Optional[Task]:
         ket_qua=row[5].strip() if len(row) > 5 else '',
         ngay_hoan_thanh=ngay_hoan_thanh,
         ngay_hoan_thanh_raw=ngay_hoan_thanh_raw,
-        ghi_chu=row[7].strip() if len(row) > 7 else ''
+        ghi_chu=row[7].strip() if len(row) > 7 else '',
+        source_tab=source_tab
     )
     
-    # Classify task
-    classify_task(task)
-    
     return task
 
 
-def parse_all_tasks(data: list[list[str]]) -> list[Task]:
+def parse_all_tasks(data: list[list[str]], workers: Optional[int] = None) -> list[Task]:
     """
     Parse all rows from Google Sheets data.
     
     Args:
-        data: Raw data from Google Sheets (including header row)
+        data: Raw data from Google Sheets (including header row). Data merged
+            from several tabs carries the source tab in an extra column.
+        workers: Parser processes; None picks automatically (a process pool
+            above Config.PARSE_PARALLEL_THRESHOLD rows), 1 forces serial.
         
     Returns:
         List of parsed Task objects
     """
-    tasks = []
+    tagged = _is_tagged(data)
+    
+    # Skip header row (index 0); data starts at sheet row 2
+    tasks = [task for task in _build_tasks(data[1:], tagged, workers) if task]
+    
+    classify_tasks(tasks)
+    _log_parse_summary(tasks, len(data) - 1)
     
-    # Skip header row (index 0)
-    for i, row in enumerate(data[1:], start=2):  # Start from row 2
-        task = parse_sheet_row(row, i)
+    return tasks
+
+
+def _build_tasks(rows: list[list[str]], tagged: bool, workers: Optional[int] = None) -> list[Optional[Task]]:
+    """Build unclassified tasks for `rows` (None for skipped rows), in order."""
+    if workers is None:
+        workers = _auto_parse_workers(len(rows))
+    
+    if workers > 1:
+        try:
+            return _build_tasks_parallel(rows, tagged, workers)
+        except (OSError, RuntimeError) as e:  # BrokenProcessPool is a RuntimeError
+            logger.warning(f"Parallel parsing failed, parsing serially: {e}")
+    
+    return _build_tasks_chunk(rows, tagged)
+
+
+def _auto_parse_workers(row_count: int) -> int:
+    threshold = config.PARSE_PARALLEL_THRESHOLD
+    if threshold <= 0 or row_count < threshold:
+        return 1
+    return config.PARSE_WORKERS or os.cpu_count() or 1
+
+
+def _build_tasks_chunk(rows: list[list[str]], tagged: bool) -> list[Optional[Task]]:
+    """Serial parse of one chunk (also the worker function of the pool)."""
+    return [_build_task(row, _source_tab(row, tagged)) for row in rows]
+
+
+# Long-lived parse pool: starting spawn workers costs far more than a parse chunk
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_workers = 0
+_parse_pool_lock = threading.Lock()
+
+
+def _get_parse_pool(workers: int) -> ProcessPoolExecutor:
+    """The shared process pool, (re)created on first use or when `workers` changes."""
+    global _parse_pool, _parse_pool_workers
+    if _parse_pool is None or _parse_pool_workers != workers:
+        shutdown_parse_pool()
+        # spawn: forking a process that runs the event loop and I/O threads is unsafe
+        context = multiprocessing.get_context('spawn')
+        _parse_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        _parse_pool_workers = workers
+    return _parse_pool
+
+
+def shutdown_parse_pool():
+    """Stop the parse worker processes (they are started again when needed)."""
+    global _parse_pool, _parse_pool_workers
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+        _parse_pool_workers = 0
+
+
+def _build_tasks_parallel(rows: list[list[str]], tagged: bool, workers: int) -> list[Optional[Task]]:
+    """Split rows into chunks, parse them in a process pool and merge in order."""
+    # A few chunks per worker evens out uneven rows without much pickling overhead
+    chunk_size = max(1, -(-len(rows) // (workers * 4)))
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+    logger.info(f"Parsing {len(rows)} rows in {len(chunks)} chunks with {workers} processes")
+    
+    results: list[Optional[Task]] = []
+    with _parse_pool_lock:
+        try:
+            executor = _get_parse_pool(workers)
+            for chunk_tasks in executor.map(_build_tasks_chunk, chunks, [tagged] * len(chunks)):
+                results.extend(chunk_tasks)
+        except (OSError, RuntimeError):
+            # A broken pool cannot be reused - start a fresh one next time
+            shutdown_parse_pool()
+            raise
+    
+    # Unpickled strings are copies per chunk - share them again
+    for task in results:
         if task:
-            tasks.append(task)
+            task.ho_ten = sys.intern(task.ho_ten)
+            task.muc_do = sys.intern(task.muc_do)
+            task.source_tab = sys.intern(task.source_tab)
+    return results
+
+
+class IncrementalTaskParser:
+    """
+    Re-parses only the rows that changed since the previous call.
+    
+    Parsed tasks are remembered by row content, so a refresh after a few
+    edits parses just the new or edited rows and drops removed ones. The
+    result equals what parse_all_tasks would return. Everything is parsed
+    again when the header changes; a new date only re-classifies.
+    """
+    
+    def __init__(self):
+        # Row content -> tasks parsed from identical rows (duplicates allowed)
+        self._by_row: dict[tuple[str, ...], list[Optional[Task]]] = {}
+        self._header: Optional[tuple[str, ...]] = None
+        self.rows_parsed = 0
+        self.rows_reused = 0
+    
+    def parse(self, data: list[list[str]], today: Optional[date] = None) -> list[Task]:
+        """
+        Parse `data` like parse_all_tasks, reusing tasks of unchanged rows.
+        
+        Args:
+            data: Raw rows including the header row
+            today: Date used to classify tasks (if None, will be computed)
+        """
+        header = tuple(data[0]) if data else ()
+        previous = self._by_row if header == self._header else {}
+        current: dict[tuple[str, ...], list[Optional[Task]]] = {}
+        rows = data[1:]
+        keys = [tuple(row) for row in rows]
+        
+        # Reuse what we can; collect the rest for one (possibly parallel) parse
+        built: list[Optional[Task]] = [None] * len(rows)
+        missing: list[int] = []
+        for i, key in enumerate(keys):
+            reusable = previous.get(key)
+            if reusable:
+                built[i] = reusable.pop()
+            else:
+                missing.append(i)
+        
+        fresh = _build_tasks([rows[i] for i in missing], _is_tagged(data))
+        for i, task in zip(missing, fresh):
+            built[i] = task
+        parsed = len(missing)
+        
+        for key, task in zip(keys, built):
+            current.setdefault(key, []).append(task)
+        tasks = [task for task in built if task]
+        
+        classify_tasks(tasks, today)
+        self._by_row = current
+        self._header = header
+        row_count = max(len(data) - 1, 0)
+        self.rows_parsed += parsed
+        self.rows_reused += row_count - parsed
+        
+        logger.info(f"Re-parsed {parsed} of {row_count} rows")
+        _log_parse_summary(tasks, row_count)
+        
+        return tasks
     
-    logger.info(f"Parsed {len(tasks)} tasks from {len(data)-1} data rows")
+    def reset(self):
+        """Forget all remembered rows."""
+        self._by_row = {}
+        self._header = None
+
+
+def _is_tagged(data: list[list[str]]) -> bool:
+    """Whether rows carry their source tab (merged multi-tab data)."""
+    return bool(data) and len(data[0]) > SOURCE_TAB_COLUMN and data[0][SOURCE_TAB_COLUMN] == SOURCE_TAB_HEADER
+
+
+def _source_tab(row: list[str], tagged: bool) -> str:
+    return row[SOURCE_TAB_COLUMN] if tagged and len(row) > SOURCE_TAB_COLUMN else ''
+
+
+def _log_parse_summary(tasks: list[Task], row_count: int):
+    """Log task counts and one line for all unparseable date cells."""
+    logger.info(f"Parsed {len(tasks)} tasks from {row_count} data rows")
+    
+    unparsed = [
+        raw for t in tasks
+        for raw, parsed in ((t.deadline_raw, t.deadline), (t.ngay_hoan_thanh_raw, t.ngay_hoan_thanh))
+        if raw and parsed is None
+    ]
+    if unparsed:
+        examples = ', '.join(f"'{raw}'" for raw in list(dict.fromkeys(unparsed))[:5])
+        logger.warning(f"Could not parse {len(unparsed)} date cells, e.g. {examples}")
     
     # Log statistics
     completed = sum(1 for t in tasks if t.is_completed)
     incomplete = len(tasks) - completed
     logger.info(f"Tasks: {completed} completed, {incomplete} incomplete")
-    
-    return tasks
 
 
 def filter_incomplete_tasks(tasks: list[Task]) -> list[Task]:
@@ -246,11 +531,12 @@ def group_tasks_by_person(tasks: list[Task]) -> dict[str, list[Task]]:
 def search_tasks(tasks: list[Task], keyword: str) -> list[Task]:
     """
     Search tasks by keyword in name or content.
-    Case-insensitive search.
+    Case- and diacritic-insensitive substring search (linear scan; bot
+    handlers use the per-snapshot TaskSearchIndex instead).
     """
-    keyword_lower = keyword.lower()
+    keyword_norm = normalize_text(keyword)
     
     return [
         task for task in tasks
-        if keyword_lower in task.ho_ten.lower() or keyword_lower in task.noi_dung.lower()
+        if keyword_norm in normalize_text(task.ho_ten) or keyword_norm in normalize_text(task.noi_dung)
     ]
@@ -1,41 +1,130 @@
 """
 Scheduler module - handles automated daily and weekly reports.
 Uses python-telegram-bot's JobQueue for scheduling.
+
+A few minutes before each report (Config.SCHEDULE_PREWARM_MINUTES) a
+pre-warm job fetches, parses and renders it, so at send time the job only
+sends. If the pre-warm failed or is from another day, the report is built
+live as before. The daily job also records the day's aggregates in the
+history store used by the weekly trend sections.
 """
 
+import asyncio
 import logging
-from datetime import time
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Optional
 import pytz
 from telegram.ext import Application
 from app.config import config
-from app.sheets import GoogleSheetsClient
-from app.rules import parse_all_tasks
-from app.reporting import build_daily_report, build_weekly_report
+from app.task_cache import load_task_snapshot
+from app.report_cache import render_report
+from app.pagination import split_report
+from app.rules import get_current_date
+from app.history import DailyAggregate, aggregate_day, get_history_store
 
 logger = logging.getLogger(__name__)
 
+# Send times (Vietnam time); Friday is day 4 (Monday=0, Sunday=6)
+DAILY_REPORT_TIME = time(hour=6, minute=0)
+WEEKLY_REPORT_TIME = time(hour=17, minute=0)
+WEEKLY_REPORT_DAYS = (4,)
 
-async def send_daily_report(context):
-    """Send daily morning report at 6:00 AM."""
+REPORT_CAPTIONS = {
+    'daily': "📄 Báo cáo tiến độ công việc hàng ngày",
+    'weekly': "📄 Báo cáo tiến độ công việc tuần",
+}
+
+
+@dataclass
+class PreparedReport:
+    """A scheduled report rendered and ready to send."""
+    
+    report_type: str  # 'daily' or 'weekly'
+    report_date: date
+    pages: list[str]  # Telegram-sized messages
+    docx_path: Optional[Path] = None  # Word file (SCHEDULED_REPORT_DOCX only)
+    history_entry: Optional[DailyAggregate] = None  # Recorded after the daily report is sent
+
+
+async def prepare_report(bot_data: dict, report_type: str) -> PreparedReport:
+    """
+    Fetch fresh data and render a scheduled report (text and optional DOCX).
+    
+    Args:
+        bot_data: Application.bot_data
+        report_type: 'daily' or 'weekly'
+    """
+    snapshot = await load_task_snapshot(bot_data, force_refresh=True)
+    pages = split_report(await render_report(bot_data, snapshot, report_type))
+    
+    docx_path = None
+    word_generator = bot_data.get('word_generator')
+    if config.SCHEDULED_REPORT_DOCX and word_generator is not None:
+        generate = (
+            word_generator.generate_daily_report if report_type == 'daily'
+            else word_generator.generate_weekly_report
+        )
+        # python-docx is blocking; keep the event loop free
+        docx_path = await asyncio.to_thread(generate, snapshot.tasks, snapshot.status_groups)
+    
+    history_entry = None
+    if report_type == 'daily' and get_history_store(bot_data) is not None:
+        history_entry = aggregate_day(snapshot.tasks, snapshot.today)
+    
+    return PreparedReport(report_type, snapshot.today, pages, docx_path, history_entry)
+
+
+async def prewarm_report(context):
+    """Render the upcoming scheduled report ahead of its send time."""
+    report_type = context.job.data
     try:
-        logger.info("Starting daily report job")
-        
-        # Get bot and sheets client from context
-        sheets_client: GoogleSheetsClient = context.bot_data['sheets_client']
-        
-        # Fetch data
-        data = sheets_client.fetch_data(force_refresh=True)
-        tasks = parse_all_tasks(data)
-        
-        # Build report
-        message = build_daily_report(tasks)
-        
-        # Send to group
+        prepared = await prepare_report(context.bot_data, report_type)
+        context.bot_data.setdefault('prepared_reports', {})[report_type] = prepared
+        logger.info(f"Pre-warmed {report_type} report ({len(prepared.pages)} message(s))")
+    except Exception as e:
+        # The send job builds the report live instead
+        logger.warning(f"Pre-warming {report_type} report failed: {e}")
+
+
+async def send_prepared_report(context, report_type: str):
+    """Send the pre-warmed report, or build it now if none is ready for today."""
+    prepared: Optional[PreparedReport] = context.bot_data.get('prepared_reports', {}).pop(report_type, None)
+    if prepared is None or prepared.report_date != get_current_date():
+        logger.info(f"No pre-warmed {report_type} report, building it now")
+        prepared = await prepare_report(context.bot_data, report_type)
+    
+    # Send to group (long reports as consecutive messages)
+    for page in prepared.pages:
         await context.bot.send_message(
             chat_id=config.REPORT_CHAT_ID,
-            text=message
+            text=page
         )
-        
+    
+    if prepared.docx_path is not None:
+        with open(prepared.docx_path, 'rb') as doc_file:
+            await context.bot.send_document(
+                chat_id=config.REPORT_CHAT_ID,
+                document=doc_file,
+                filename=prepared.docx_path.name,
+                caption=REPORT_CAPTIONS[report_type]
+            )
+    
+    if prepared.history_entry is not None:
+        try:
+            get_history_store(context.bot_data).record(prepared.history_entry)
+        except (OSError, sqlite3.Error) as e:
+            # Trends skip the missing day; the report itself was delivered
+            logger.warning(f"Could not record report history: {e}")
+
+
+async def send_daily_report(context):
+    """Send daily morning report at 6:00 AM."""
+    try:
+        logger.info("Starting daily report job")
+        await send_prepared_report(context, 'daily')
         logger.info(f"Daily report sent successfully to {config.REPORT_CHAT_ID}")
         
     except Exception as e:
@@ -46,29 +135,25 @@ async def send_weekly_report(context):
     """Send weekly report every Friday at 5:00 PM."""
     try:
         logger.info("Starting weekly report job")
-        
-        # Get sheets client from context
-        sheets_client: GoogleSheetsClient = context.bot_data['sheets_client']
-        
-        # Fetch data
-        data = sheets_client.fetch_data(force_refresh=True)
-        tasks = parse_all_tasks(data)
-        
-        # Build report
-        message = build_weekly_report(tasks)
-        
-        # Send to group
-        await context.bot.send_message(
-            chat_id=config.REPORT_CHAT_ID,
-            text=message
-        )
-        
+        await send_prepared_report(context, 'weekly')
         logger.info(f"Weekly report sent successfully to {config.REPORT_CHAT_ID}")
         
     except Exception as e:
         logger.error(f"Error sending weekly report: {e}", exc_info=True)
 
 
+def prewarm_schedule(at: time, days: tuple[int, ...], minutes: int) -> tuple[time, tuple[int, ...]]:
+    """
+    Time and weekdays `minutes` before a job running at `at` on `days`.
+    
+    Weekdays move back by one when the pre-warm falls on the previous day.
+    """
+    monday = date(2024, 1, 1)
+    moment = datetime.combine(monday, at) - timedelta(minutes=minutes)
+    shift = (moment.date() - monday).days
+    return moment.timetz(), tuple(sorted((day + shift) % 7 for day in days))
+
+
 def setup_jobs(application: Application):
     """
     Setup scheduled jobs using JobQueue.
@@ -82,7 +167,7 @@ def setup_jobs(application: Application):
     # Daily report at 6:00 AM (Vietnam time)
     job_queue.run_daily(
         send_daily_report,
-        time=time(hour=6, minute=0, tzinfo=tz),
+        time=DAILY_REPORT_TIME.replace(tzinfo=tz),
         name='daily_report'
     )
     logger.info("Scheduled daily report at 06:00 (Asia/Ho_Chi_Minh)")
@@ -90,8 +175,27 @@ def setup_jobs(application: Application):
     # Weekly report every Friday at 5:00 PM (Vietnam time)
     job_queue.run_daily(
         send_weekly_report,
-        time=time(hour=17, minute=0, tzinfo=tz),
-        days=(4,),  # Friday is day 4 (Monday=0, Sunday=6)
+        time=WEEKLY_REPORT_TIME.replace(tzinfo=tz),
+        days=WEEKLY_REPORT_DAYS,
         name='weekly_report'
     )
     logger.info("Scheduled weekly report on Fridays at 17:00 (Asia/Ho_Chi_Minh)")
+    
+    # Pre-warm both reports a few minutes earlier
+    minutes = config.SCHEDULE_PREWARM_MINUTES
+    if minutes <= 0:
+        return
+    
+    for report_type, at, days in (
+        ('daily', DAILY_REPORT_TIME, tuple(range(7))),
+        ('weekly', WEEKLY_REPORT_TIME, WEEKLY_REPORT_DAYS),
+    ):
+        prewarm_at, prewarm_days = prewarm_schedule(at, days, minutes)
+        job_queue.run_daily(
+            prewarm_report,
+            time=prewarm_at.replace(tzinfo=tz),
+            days=prewarm_days,
+            data=report_type,
+            name=f'{report_type}_report_prewarm'
+        )
+        logger.info(f"Scheduled {report_type} report pre-warm at {prewarm_at.strftime('%H:%M')}")
@@ -0,0 +1,233 @@
+"""
+Task search - inverted index over diacritic-free tokens.
+
+Built once per snapshot. A query is split into terms; every term must be
+the prefix of some word in the task's name or content (AND semantics), so
+"hoan th" finds "Hoàn thành" and "nguyen an" finds "Nguyễn Văn An".
+Ranked search scores matches with BM25 over the content, plus boosts for
+a name match and for overdue tasks.
+"""
+
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from app.models import Task, TaskStatus
+from app.rules import normalize_text
+
+try:
+    import numpy as np
+except ImportError:  # Optional - set operations are used instead
+    np = None
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> list[str]:
+    """Normalized words of `text`."""
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+
+class TaskSearchIndex:
+    """
+    Maps each normalized word to the positions of tasks containing it.
+
+    Postings are compact sorted int arrays; the sorted vocabulary turns a
+    prefix into a contiguous range of words found with bisect. Results come
+    back in sheet order. Unions and intersections run in NumPy when it is
+    installed, with Python sets otherwise.
+    """
+
+    QUERY_CACHE_SIZE = 128
+
+    # Ranking (see rank())
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    PREFIX_WEIGHT = 0.5  # A word that only starts with the term counts half
+    NAME_BOOST = 2.0  # Added when every query term matches the person's name
+    OVERDUE_BOOST = 1.0
+    RANKED_LIMIT = 150  # Matches kept per ranked query (10 pages of 15)
+
+    def __init__(self, tasks: list[Task]):
+        self.tasks = tasks
+        postings: dict[str, array] = {}
+        content_tf: dict[str, array] = {}  # Parallel to postings: count in noi_dung
+        doc_lengths = array('H')
+        self.name_tokens: dict[str, list[str]] = {}  # Few distinct names, many rows
+
+        for position, task in enumerate(tasks):
+            names = self.name_tokens.get(task.ho_ten)
+            if names is None:
+                names = self.name_tokens[task.ho_ten] = tokenize(task.ho_ten)
+            content = Counter(tokenize(task.noi_dung))
+            doc_lengths.append(min(sum(content.values()), 0xFFFF))
+
+            for token in content.keys() | set(names):
+                posting = postings.get(token)
+                if posting is None:
+                    posting = postings[token] = array('i')
+                    content_tf[token] = array('H')
+                posting.append(position)
+                content_tf[token].append(min(content.get(token, 0), 0xFFFF))
+
+        self.postings = postings
+        self.content_tf = content_tf
+        self.doc_lengths = doc_lengths
+        self.avg_doc_length = (sum(doc_lengths) / len(doc_lengths)) if doc_lengths else 0.0
+        self.vocabulary = sorted(postings)
+        self._query_cache: OrderedDict[tuple[str, ...], list[int]] = OrderedDict()
+        self._ranked_cache: OrderedDict[tuple[str, ...], SearchResults] = OrderedDict()
+
+    def search(self, query: str) -> list[Task]:
+        """Tasks matching every term of `query` (empty query matches nothing)."""
+        return [self.tasks[i] for i in self.search_positions(query)]
+
+    def search_positions(self, query: str) -> list[int]:
+        """Positions (into `tasks`) of tasks matching every term of `query`."""
+        terms = tuple(sorted(set(tokenize(query))))
+        if not terms:
+            return []
+
+        cached = self._query_cache.get(terms)
+        if cached is not None:
+            self._query_cache.move_to_end(terms)
+            return cached
+
+        result = self._match_all(terms)
+        self._query_cache[terms] = result
+        if len(self._query_cache) > self.QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        return result
+
+    def rank(self, query: str) -> 'SearchResults':
+        """
+        Matching tasks, most relevant first.
+
+        Score = BM25 of the query terms in noi_dung (words matched only by
+        prefix weighted by PREFIX_WEIGHT), + NAME_BOOST if ho_ten
+        matches every term, + OVERDUE_BOOST for open overdue tasks. The best
+        RANKED_LIMIT are picked with a heap; ties keep sheet order. Results
+        are cached per query so further pages do not re-run it.
+        """
+        terms = tuple(sorted(set(tokenize(query))))
+        cached = self._ranked_cache.get(terms)
+        if cached is not None:
+            self._ranked_cache.move_to_end(terms)
+            return cached
+
+        positions = self.search_positions(query)
+        scores = self._bm25_scores(terms, positions)
+        best = heapq.nlargest(self.RANKED_LIMIT, positions, key=scores.__getitem__)
+        results = SearchResults(query=query, tasks=[self.tasks[i] for i in best], total=len(positions))
+
+        if terms:
+            self._ranked_cache[terms] = results
+            if len(self._ranked_cache) > self.QUERY_CACHE_SIZE:
+                self._ranked_cache.popitem(last=False)
+        return results
+
+    def _bm25_scores(self, terms: tuple[str, ...], positions: list[int]) -> dict[int, float]:
+        scores = dict.fromkeys(positions, 0.0)
+        if not scores:
+            return scores
+
+        k1, b = self.BM25_K1, self.BM25_B
+        avg_length = self.avg_doc_length or 1.0
+        doc_count = len(self.tasks)
+
+        for term in terms:
+            for word in self._prefix_words(term):
+                posting = self.postings[word]
+                tfs = self.content_tf[word]
+                idf = math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+                if word != term:
+                    idf *= self.PREFIX_WEIGHT
+                for position, tf in zip(posting, tfs):
+                    if tf and position in scores:
+                        length_norm = k1 * (1 - b + b * self.doc_lengths[position] / avg_length)
+                        scores[position] += idf * tf * (k1 + 1) / (tf + length_norm)
+
+        name_matches: dict[str, bool] = {}
+        for position in scores:
+            task = self.tasks[position]
+            matched = name_matches.get(task.ho_ten)
+            if matched is None:
+                names = self.name_tokens[task.ho_ten]
+                matched = name_matches[task.ho_ten] = all(
+                    any(name.startswith(term) for name in names) for term in terms
+                )
+            if matched:
+                scores[position] += self.NAME_BOOST
+            if task.status == TaskStatus.OVERDUE and not task.is_completed:
+                scores[position] += self.OVERDUE_BOOST
+        return scores
+
+    def _match_all(self, terms: tuple[str, ...]) -> list[int]:
+        if np is not None:
+            # One boolean row mask per term; AND them together
+            matched = None
+            for term in terms:
+                mask = np.zeros(len(self.tasks), dtype=bool)
+                for word in self._prefix_words(term):
+                    mask[np.frombuffer(self.postings[word], dtype=np.intc)] = True
+                matched = mask if matched is None else matched & mask
+            return np.flatnonzero(matched).tolist()
+
+        # Narrowest term first keeps the candidate set small
+        postings = sorted((self._prefix_postings(term) for term in terms), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+        return sorted(candidates)
+
+    def _prefix_words(self, prefix: str) -> list[str]:
+        """Indexed words starting with `prefix`."""
+        vocabulary = self.vocabulary
+        start = end = bisect_left(vocabulary, prefix)
+        while end < len(vocabulary) and vocabulary[end].startswith(prefix):
+            end += 1
+        return vocabulary[start:end]
+
+    def _prefix_postings(self, prefix: str):
+        """Positions of tasks having a word that starts with `prefix`."""
+        words = self._prefix_words(prefix)
+        if len(words) == 1:
+            return self.postings[words[0]]
+        positions: set[int] = set()
+        for word in words:
+            positions.update(self.postings[word])
+        return positions
+
+
+@dataclass(frozen=True)
+class SearchResults:
+    """
+    Ranked matches of one query, paged with integer cursors (start offsets).
+
+    `tasks` holds at most TaskSearchIndex.RANKED_LIMIT tasks, best first;
+    `total` counts every match.
+    """
+
+    query: str
+    tasks: list[Task]
+    total: int
+    page_size: int = 15
+
+    def page(self, cursor: int = 0) -> list[Task]:
+        """Tasks of the page starting at `cursor`."""
+        return self.tasks[cursor:cursor + self.page_size]
+
+    def next_cursor(self, cursor: int) -> Optional[int]:
+        """Cursor of the following page, or None on the last page."""
+        following = cursor + self.page_size
+        return following if following < len(self.tasks) else None
+
+    def prev_cursor(self, cursor: int) -> Optional[int]:
+        """Cursor of the previous page, or None on the first page."""
+        return max(cursor - self.page_size, 0) if cursor > 0 else None
@@ -2,33 +2,125 @@
 Google Sheets client with caching.
 """
 
+import asyncio
+import fnmatch
 import logging
+import random
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Optional
 import gspread
+import requests
 from google.oauth2.service_account import Credentials
 from app.config import config
+from app.datasource import TaskDataSource
+from app.models import SHEET_COLUMNS, SOURCE_TAB_HEADER
+from app.freshness import FreshnessProbe, DriveModifiedTimeProbe
+from app.snapshot import Snapshot, SnapshotStore, compute_content_hash
 
 logger = logging.getLogger(__name__)
 
+COLUMN_RANGE_PATTERN = re.compile(r'^([A-Z]+):([A-Z]+)$')
+
+# Quota exhaustion and transient server errors are worth retrying
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def parse_column_range(range_str: str) -> tuple[str, str, int]:
+    """
+    Parse a column range like 'A:H'.
+    
+    Returns:
+        (first column letter, last column letter, number of columns)
+    """
+    match = COLUMN_RANGE_PATTERN.match(range_str.strip().upper())
+    if not match:
+        raise ValueError(f"Invalid column range '{range_str}', expected e.g. 'A:H'")
+    
+    first, last = match.groups()
+    width = gspread.utils.column_letter_to_index(last) - gspread.utils.column_letter_to_index(first) + 1
+    if width < 1:
+        raise ValueError(f"Invalid column range '{range_str}': last column before first")
+    return first, last, width
+
+
+def normalize_values(values: list[list[str]], width: int) -> list[list[str]]:
+    """
+    Shape API values like get_all_values(): every row padded to `width`
+    and trailing empty rows dropped. Works in place to avoid a second copy.
+    """
+    for row in values:
+        if len(row) < width:
+            row.extend([''] * (width - len(row)))
+    while values and not any(values[-1]):
+        values.pop()
+    return values
+
+
+def parse_tab_patterns(tabs_str: str) -> list[str]:
+    """Split a comma-separated list of tab names / glob patterns."""
+    return [tab.strip() for tab in tabs_str.split(',') if tab.strip()]
+
+
+def merge_tabs(tab_data: dict[str, list[list[str]]]) -> list[list[str]]:
+    """
+    Merge several tabs into one table tagged with the source tab.
+    
+    The header comes from the first tab; every data row is cut to the task
+    columns and the tab name appended after them.
+    """
+    def task_columns(row: list[str]) -> list[str]:
+        return list(row[:SHEET_COLUMNS]) + [''] * (SHEET_COLUMNS - len(row))
+    
+    merged: list[list[str]] = []
+    for tab, rows in tab_data.items():
+        if not rows:
+            continue
+        if not merged:
+            merged.append(task_columns(rows[0]) + [SOURCE_TAB_HEADER])
+        merged.extend(task_columns(row) + [tab] for row in rows[1:])
+    return merged
+
 
 class SheetsCache:
     """Simple in-memory cache for Google Sheets data."""
     
-    def __init__(self, duration_seconds: int = 300):
+    def __init__(self, duration_seconds: int = 300, max_staleness_seconds: int = 0):
         self.duration = timedelta(seconds=duration_seconds)
+        self.max_staleness = timedelta(seconds=max_staleness_seconds)
         self.data: Optional[list[list[str]]] = None
         self.last_fetch: Optional[datetime] = None
+        self.version: Optional[str] = None  # Freshness token of the cached data
+        self.content_hash: Optional[str] = None
+        self.expired = False  # Set by expire(), cleared by the next set()
     
     def is_valid(self) -> bool:
         """Check if cache is still valid."""
-        if self.data is None or self.last_fetch is None:
+        if self.data is None or self.last_fetch is None or self.expired:
             return False
         return datetime.now() - self.last_fetch < self.duration
     
-    def set(self, data: list[list[str]]):
+    def set(
+        self,
+        data: list[list[str]],
+        version: Optional[str] = None,
+        fetched_at: Optional[datetime] = None
+    ):
         """Update cache with new data."""
+        content_hash = compute_content_hash(data)
+        # Readers in other threads pair content_hash with data (see
+        # GoogleSheetsClient.get_content_hash) - never expose a mismatched pair
+        self.content_hash = None
         self.data = data
+        self.version = version
+        self.content_hash = content_hash
+        self.last_fetch = fetched_at or datetime.now()
+        self.expired = False
+    
+    def touch(self):
+        """Restart the TTL of the current data (source confirmed unchanged)."""
         self.last_fetch = datetime.now()
     
     def get(self) -> Optional[list[list[str]]]:
@@ -37,19 +129,93 @@ class SheetsCache:
             return self.data
         return None
     
+    def get_stale(self) -> Optional[list[list[str]]]:
+        """Get cached data even if expired, as long as it is within max staleness."""
+        if self.data is None or self.last_fetch is None:
+            return None
+        if datetime.now() - self.last_fetch < self.max_staleness:
+            return self.data
+        return None
+    
+    def expire(self):
+        """
+        Force the next get() to miss while keeping the data as a fallback.
+        
+        The version is dropped so the freshness probe cannot skip the download.
+        """
+        self.expired = True
+        self.version = None
+    
     def invalidate(self):
         """Force cache invalidation."""
         self.data = None
         self.last_fetch = None
+        self.version = None
+        self.content_hash = None
+        self.expired = False
 
 
-class GoogleSheetsClient:
+class GoogleSheetsClient(TaskDataSource):
     """Client for reading data from Google Sheets."""
     
-    def __init__(self):
-        self.cache = SheetsCache(duration_seconds=config.CACHE_DURATION)
-        self.client: Optional[gspread.Client] = None
-        self._initialize_client()
+    # Seconds a scheduled background refresh may take to start before it is scheduled again
+    REFRESH_START_TIMEOUT = 60
+    
+    def __init__(
+        self,
+        client: Optional[gspread.Client] = None,
+        probe: Optional[FreshnessProbe] = None,
+        snapshot_store: Optional[SnapshotStore] = None
+    ):
+        self.cache = SheetsCache(
+            duration_seconds=config.CACHE_DURATION,
+            max_staleness_seconds=config.CACHE_MAX_STALENESS
+        )
+        # Multi-tab mode: raw rows of each tab, cached separately
+        self.tab_patterns = parse_tab_patterns(config.GOOGLE_SHEET_TABS)
+        self.tab_caches: dict[str, SheetsCache] = {}
+        self.client: Optional[gspread.Client] = client
+        # Last good download persisted to disk (None = memory only)
+        self.snapshot_store = snapshot_store
+        # Job queue used for background refreshes (set by main once the bot is built)
+        self.job_queue = None
+        self._refresh_scheduled_at: Optional[float] = None  # monotonic time of the pending refresh
+        self._refresh_task: Optional[asyncio.Task] = None
+        # gspread is synchronous - run its requests on a small dedicated pool
+        # so a slow fetch never blocks the bot's event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, config.SHEETS_MAX_WORKERS),
+            thread_name_prefix='sheets'
+        )
+        # Single-flight: one in-flight download per sheet/tab, shared by all waiters
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.stats = {
+            'fetches': 0,  # Real downloads from Google Sheets
+            'coalesced': 0,  # Calls that awaited an already running download
+            'stale_served': 0,  # Expired snapshots served while refreshing
+            'probe_skips': 0,  # Downloads skipped because the sheet was unchanged
+            'fallbacks': 0,  # Failed downloads answered with the last good snapshot
+            'requests': 0,  # Google API requests completed
+            'retries': 0,  # Requests retried after 429/5xx/network errors
+            'request_ms_total': 0,  # Summed latency of completed requests
+            'request_ms_max': 0,  # Slowest completed request
+        }
+        # Resolved Spreadsheet/Worksheet handles, reused between fetches
+        self._spreadsheet: Optional[gspread.Spreadsheet] = None
+        self._worksheet_handles: dict[str, gspread.Worksheet] = {}
+        self._worksheet_list: Optional[list[gspread.Worksheet]] = None
+        self._handles_loaded_at = 0.0
+        # Validate the configured range early rather than on first fetch
+        self.column_range = (
+            parse_column_range(config.GOOGLE_SHEET_RANGE) if config.GOOGLE_SHEET_RANGE else None
+        )
+        if self.client is None:
+            self._initialize_client()
+        
+        # Cheap change detection before a full download
+        self.probe = probe
+        if self.probe is None and config.SHEETS_CHANGE_PROBE:
+            self.probe = DriveModifiedTimeProbe(self.client, config.GOOGLE_SHEET_ID)
     
     def _initialize_client(self):
         """Initialize gspread client with service account credentials."""
@@ -68,6 +234,13 @@ class GoogleSheetsClient:
             
             # Create client
             self.client = gspread.authorize(creds)
+            
+            # One keep-alive connection pool sized for the worker threads
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=2,
+                pool_maxsize=max(2, config.SHEETS_MAX_WORKERS)
+            )
+            self.client.http_client.session.mount('https://', adapter)
             logger.info("Google Sheets client initialized successfully")
             
         except Exception as e:
@@ -78,6 +251,10 @@ class GoogleSheetsClient:
         """
         Fetch data from Google Sheets with caching.
         
+        When the cache holds data, the freshness probe is checked first; if
+        the sheet is unchanged the download is skipped and the TTL extended.
+        If the download fails, the last good snapshot is returned instead.
+        
         Args:
             force_refresh: If True, bypass cache and fetch fresh data
             
@@ -91,45 +268,487 @@ class GoogleSheetsClient:
                 logger.info("Using cached data")
                 return cached_data
         
+        # Probe before downloading so an edit made during the download
+        # is picked up by the next refresh
+        version = self._probe_version()
+        if version is not None and self.cache.data is not None and version == self.cache.version:
+            logger.info("Sheet unchanged since last fetch, extending cache")
+            self.stats['probe_skips'] += 1
+            self.cache.touch()
+            return self.cache.data
+        
         # Fetch fresh data
+        self.stats['fetches'] += 1
+        try:
+            data = self._fetch_from_sheets(force_refresh, version)
+        except Exception:
+            if self.cache.data is None:
+                raise
+            logger.warning(
+                f"Google Sheets unavailable, using last good snapshot "
+                f"from {self.cache.last_fetch}"
+            )
+            self.stats['fallbacks'] += 1
+            return self.cache.data
+        
+        # Update cache
+        self.cache.set(data, version=version)
+        self._save_snapshot()
+        
+        return data
+    
+    async def fetch_data_async(self, force_refresh: bool = False) -> list[list[str]]:
+        """
+        Async variant of fetch_data() for use inside bot handlers and jobs.
+        
+        Cache hits are served directly; on a miss the blocking gspread calls
+        run in the client's thread pool so other updates keep being processed.
+        Concurrent misses for the same sheet/tab are coalesced into a single
+        download whose result every caller receives. With stale-while-revalidate
+        enabled, an expired snapshot (younger than CACHE_MAX_STALENESS) is
+        returned at once and refreshed in the background.
+        
+        Args:
+            force_refresh: If True, bypass cache and fetch fresh data
+            
+        Returns:
+            List of rows (each row is a list of cell values)
+        """
+        if not force_refresh:
+            cached_data = self.cache.get()
+            if cached_data is not None:
+                logger.info("Using cached data")
+                return cached_data
+            
+            if config.CACHE_STALE_WHILE_REVALIDATE:
+                stale_data = self.cache.get_stale()
+                if stale_data is not None:
+                    logger.info("Using stale cached data, refreshing in background")
+                    self.stats['stale_served'] += 1
+                    self.schedule_refresh()
+                    return stale_data
+        
+        return await self._fetch_single_flight(force_refresh)
+    
+    async def _fetch_single_flight(self, force_refresh: bool) -> list[list[str]]:
+        """Run fetch_data in the thread pool, sharing one download per sheet/tab."""
+        key = self._fetch_key()
+        inflight = self._inflight.get(key)
+        # A forced refresh must not reuse a download that started before it
+        if inflight is not None and not force_refresh:
+            self.stats['coalesced'] += 1
+            logger.info(f"Joining in-flight fetch for '{key}'")
+            return await asyncio.shield(inflight)
+        
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self.fetch_data, force_refresh)
+        self._inflight[key] = future
+        try:
+            # Shield so a cancelled caller doesn't cancel the fetch for the others
+            return await asyncio.shield(future)
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+    
+    def set_job_queue(self, job_queue):
+        """Use the bot's JobQueue for background cache refreshes."""
+        self.job_queue = job_queue
+    
+    def schedule_refresh(self):
+        """
+        Schedule a background refresh unless one is already pending.
+        
+        A refresh that has not started within REFRESH_START_TIMEOUT seconds
+        (e.g. a job dropped by the scheduler) is considered lost and
+        scheduled again.
+        """
+        if self._fetch_key() in self._inflight:
+            return
+        if self._refresh_scheduled_at is not None:
+            if time.monotonic() - self._refresh_scheduled_at < self.REFRESH_START_TIMEOUT:
+                return
+            logger.warning("Background cache refresh never started, scheduling it again")
+        self._refresh_scheduled_at = time.monotonic()
+        
+        try:
+            if self.job_queue is not None:
+                # No misfire limit: a job added before the JobQueue starts must still run
+                self.job_queue.run_once(
+                    self._refresh_job, when=0, name='sheets_refresh',
+                    job_kwargs={'misfire_grace_time': None}
+                )
+            else:
+                self._refresh_task = asyncio.get_running_loop().create_task(self._background_refresh())
+        except Exception as e:
+            self._refresh_scheduled_at = None
+            logger.warning(f"Could not schedule background cache refresh: {e}")
+    
+    async def _refresh_job(self, context):
+        """JobQueue callback for background refreshes."""
+        await self._background_refresh()
+    
+    async def _background_refresh(self):
+        """Download fresh data; failures keep the stale snapshot in place."""
+        try:
+            await self._fetch_single_flight(force_refresh=False)
+            logger.info("Background cache refresh completed")
+        except Exception as e:
+            logger.warning(f"Background cache refresh failed: {e}")
+        finally:
+            self._refresh_scheduled_at = None
+            self._refresh_task = None
+    
+    def load_snapshot(self) -> bool:
+        """
+        Warm the cache from the on-disk snapshot.
+        
+        The snapshot keeps its original fetch time, so an old one is
+        served as stale data and refreshed as usual.
+        
+        Returns:
+            True if a snapshot was loaded
+        """
+        if self.snapshot_store is None:
+            return False
+        
+        snapshot = self.snapshot_store.load()
+        if snapshot is None:
+            return False
+        
+        self.cache.set(snapshot.rows, version=snapshot.version, fetched_at=snapshot.fetched_at)
+        logger.info(f"Loaded snapshot with {len(snapshot.rows)} rows fetched at {snapshot.fetched_at}")
+        return True
+    
+    def _save_snapshot(self):
+        """Persist the cached data; failures only cost the warm restart."""
+        if self.snapshot_store is None:
+            return
+        try:
+            self.snapshot_store.save(Snapshot(
+                rows=self.cache.data,
+                fetched_at=self.cache.last_fetch,
+                content_hash=self.cache.content_hash,
+                version=self.cache.version
+            ))
+        except Exception as e:
+            logger.warning(f"Could not save snapshot: {e}")
+    
+    def _fetch_key(self) -> str:
+        """Key identifying the sheet/tab a fetch downloads."""
+        tabs = config.GOOGLE_SHEET_TABS if self.tab_patterns else config.GOOGLE_SHEET_TAB
+        return f"{config.GOOGLE_SHEET_ID}/{tabs}"
+    
+    def _probe_version(self) -> Optional[str]:
+        """Get the sheet's current version token; None if unavailable."""
+        if self.probe is None:
+            return None
+        try:
+            # One attempt only: a failed probe just means a full download
+            return self._call(self.probe.get_version, retries=0)
+        except Exception as e:
+            logger.warning(f"Freshness probe failed, doing full download: {e}")
+            return None
+    
+    def _fetch_from_sheets(self, force_refresh: bool = False, version: Optional[str] = None) -> list[list[str]]:
+        """
+        Download all values of the configured worksheet(s) (blocking).
+        
+        In multi-tab mode, tabs whose own cache is still valid for `version`
+        are reused and only the others are downloaded.
+        """
         try:
             logger.info(f"Fetching data from Google Sheets (Sheet ID: {config.GOOGLE_SHEET_ID})")
             
-            # Open the spreadsheet
-            spreadsheet = self.client.open_by_key(config.GOOGLE_SHEET_ID)
+            if self.tab_patterns:
+                tab_data = self.fetch_tabs(self.tab_patterns, force_refresh=force_refresh, version=version)
+                data = merge_tabs(tab_data)
+                logger.info(f"Fetched {len(data)} rows from {len(tab_data)} tabs")
+                return data
+            
+            self._reload_grid_metadata_if_paged()
             
             # Get the specific worksheet
-            worksheet = spreadsheet.worksheet(config.GOOGLE_SHEET_TAB)
+            worksheet = self._get_worksheet(config.GOOGLE_SHEET_TAB)
             
-            # Get all values
-            data = worksheet.get_all_values()
+            # Get the values (bounded to the configured columns)
+            data = self._read_worksheet(worksheet)
             
             logger.info(f"Fetched {len(data)} rows from sheet '{config.GOOGLE_SHEET_TAB}'")
             
-            # Update cache
-            self.cache.set(data)
-            
             return data
             
-        except gspread.exceptions.WorksheetNotFound:
-            logger.error(f"Worksheet '{config.GOOGLE_SHEET_TAB}' not found")
+        except gspread.exceptions.WorksheetNotFound as e:
+            logger.error(f"Worksheet '{e}' not found")
+            self._reset_handles()
             raise
         except gspread.exceptions.SpreadsheetNotFound:
             logger.error(f"Spreadsheet with ID '{config.GOOGLE_SHEET_ID}' not found")
+            self._reset_handles()
             raise
         except Exception as e:
             logger.error(f"Error fetching data from Google Sheets: {e}")
+            self._reset_handles()
             raise
     
+    def _call(self, func: Callable, *args, retries: Optional[int] = None, **kwargs) -> Any:
+        """
+        Run one Google API request with retry on quota/transient errors.
+        
+        Retries 429/5xx responses and network errors with exponential
+        backoff and full jitter, honouring a Retry-After header if sent
+        (capped at SHEETS_RETRY_MAX_DELAY).
+        
+        Args:
+            retries: Retries allowed (default: SHEETS_MAX_RETRIES)
+        """
+        max_retries = config.SHEETS_MAX_RETRIES if retries is None else retries
+        
+        for attempt in range(max_retries + 1):
+            started = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+            except gspread.exceptions.APIError as e:
+                status = getattr(e.response, 'status_code', None)
+                if status not in RETRYABLE_STATUS_CODES or attempt == max_retries:
+                    raise
+                retry_after = e.response.headers.get('Retry-After')
+                reason = f"HTTP {status}"
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == max_retries:
+                    raise
+                retry_after = None
+                reason = type(e).__name__
+            else:
+                elapsed_ms = int((time.monotonic() - started) * 1000)
+                self.stats['requests'] += 1
+                self.stats['request_ms_total'] += elapsed_ms
+                self.stats['request_ms_max'] = max(self.stats['request_ms_max'], elapsed_ms)
+                return result
+            
+            backoff = min(config.SHEETS_RETRY_MAX_DELAY, config.SHEETS_RETRY_BASE_DELAY * 2 ** attempt)
+            delay = random.uniform(0, backoff)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), config.SHEETS_RETRY_MAX_DELAY))
+            
+            self.stats['retries'] += 1
+            logger.warning(
+                f"Google API request failed ({reason}), "
+                f"retry {attempt + 1}/{max_retries} in {delay:.1f}s"
+            )
+            time.sleep(delay)
+    
+    def _get_spreadsheet(self) -> gspread.Spreadsheet:
+        """Get the cached Spreadsheet handle, reopening it after SHEETS_METADATA_TTL."""
+        expired = time.monotonic() - self._handles_loaded_at > config.SHEETS_METADATA_TTL
+        if self._spreadsheet is None or expired:
+            self._reset_handles()
+            self._spreadsheet = self._call(self.client.open_by_key, config.GOOGLE_SHEET_ID)
+            self._handles_loaded_at = time.monotonic()
+        return self._spreadsheet
+    
+    def _get_worksheet(self, title: str) -> gspread.Worksheet:
+        """Get a cached Worksheet handle by title."""
+        spreadsheet = self._get_spreadsheet()
+        if title not in self._worksheet_handles:
+            self._worksheet_handles[title] = self._call(spreadsheet.worksheet, title)
+        return self._worksheet_handles[title]
+    
+    def _list_worksheets(self) -> list[gspread.Worksheet]:
+        """Get the cached list of all worksheets (titles and grid sizes)."""
+        spreadsheet = self._get_spreadsheet()
+        if self._worksheet_list is None:
+            self._worksheet_list = self._call(spreadsheet.worksheets)
+        return self._worksheet_list
+    
+    def _reload_grid_metadata_if_paged(self):
+        """
+        Paging relies on row_count - reload worksheet metadata so a grown
+        sheet is read completely (the spreadsheet handle is kept).
+        """
+        if self.column_range is not None and config.SHEETS_PAGE_SIZE > 0:
+            self._worksheet_list = None
+            self._worksheet_handles.clear()
+    
+    def _reset_handles(self):
+        """Forget resolved handles so the next fetch looks them up again."""
+        self._spreadsheet = None
+        self._worksheet_handles.clear()
+        self._worksheet_list = None
+    
+    def _read_worksheet(self, worksheet: gspread.Worksheet) -> list[list[str]]:
+        """
+        Read the worksheet's task columns, in pages if SHEETS_PAGE_SIZE is set.
+        
+        Returns the same shape as get_all_values() restricted to the range.
+        """
+        if self.column_range is None:
+            return self._call(worksheet.get_all_values)
+        
+        first, last, width = self.column_range
+        page_size = config.SHEETS_PAGE_SIZE
+        
+        if page_size <= 0:
+            return normalize_values(list(self._call(worksheet.get, f"{first}:{last}")), width)
+        
+        # row_count comes from worksheet metadata - no extra request
+        values: list[list[str]] = []
+        for start in range(1, worksheet.row_count + 1, page_size):
+            end = min(start + page_size - 1, worksheet.row_count)
+            page = self._call(worksheet.get, f"{first}{start}:{last}{end}")
+            values.extend(page)
+            # The API drops trailing empty rows - keep positions for later pages
+            values.extend([] for _ in range(end - start + 1 - len(page)))
+        
+        logger.info(f"Read {worksheet.row_count} rows in pages of {page_size}")
+        return normalize_values(values, width)
+    
+    def fetch_tabs(
+        self,
+        tabs: Optional[list[str]] = None,
+        force_refresh: bool = False,
+        version: Optional[str] = None
+    ) -> dict[str, list[list[str]]]:
+        """
+        Fetch raw rows of several tabs, using each tab's own cache.
+        
+        Only tabs missing from the cache (or all, if force_refresh) are
+        downloaded, together in a single batch request.
+        
+        Args:
+            tabs: Tab names or glob patterns (default: GOOGLE_SHEET_TABS,
+                or GOOGLE_SHEET_TAB when that is not set)
+            force_refresh: If True, bypass the tab caches
+            version: Current spreadsheet version, if known - cached tabs
+                downloaded at another version are downloaded again
+            
+        Returns:
+            Dict of tab name -> rows, in sheet order
+        """
+        patterns = tabs or self.tab_patterns or [config.GOOGLE_SHEET_TAB]
+        self._reload_grid_metadata_if_paged()
+        worksheets = self._resolve_tabs(patterns)
+        
+        missing = [ws for ws in worksheets if force_refresh or not self._tab_cache_valid(ws.title, version)]
+        if missing:
+            self._read_tabs(missing, version)
+        if len(missing) < len(worksheets):
+            logger.info(f"Reusing {len(worksheets) - len(missing)} cached tabs")
+        
+        return {ws.title: self.tab_caches[ws.title].data for ws in worksheets}
+    
+    def _tab_cache_valid(self, title: str, version: Optional[str]) -> bool:
+        tab_cache = self.tab_caches.get(title)
+        if tab_cache is None or not tab_cache.is_valid():
+            return False
+        return version is None or tab_cache.version == version
+    
+    def _resolve_tabs(self, patterns: list[str]) -> list[gspread.Worksheet]:
+        """Match tab names / glob patterns against the spreadsheet's worksheets."""
+        worksheets = self._list_worksheets()
+        selected: list[gspread.Worksheet] = []
+        
+        for pattern in patterns:
+            if any(ch in pattern for ch in '*?['):
+                matches = [ws for ws in worksheets if fnmatch.fnmatchcase(ws.title, pattern)]
+            else:
+                matches = [ws for ws in worksheets if ws.title == pattern]
+                if not matches:
+                    raise gspread.exceptions.WorksheetNotFound(pattern)
+            
+            for ws in matches:
+                if all(ws.title != s.title for s in selected):
+                    selected.append(ws)
+        
+        if not selected:
+            raise gspread.exceptions.WorksheetNotFound(', '.join(patterns))
+        
+        # Keep the order of the tabs in the spreadsheet
+        order = {ws.title: i for i, ws in enumerate(worksheets)}
+        selected.sort(key=lambda ws: order[ws.title])
+        return selected
+    
+    def _read_tabs(
+        self,
+        worksheets: list[gspread.Worksheet],
+        version: Optional[str] = None
+    ) -> dict[str, list[list[str]]]:
+        """
+        Read several tabs with batched values requests and cache each tab.
+        
+        Without paging all tabs come back in one request; with paging, page N
+        of every tab is fetched together.
+        """
+        spreadsheet = self._get_spreadsheet()
+        values: dict[str, list[list[str]]] = {ws.title: [] for ws in worksheets}
+        page_size = config.SHEETS_PAGE_SIZE if self.column_range else 0
+        
+        if page_size <= 0:
+            columns = f"{self.column_range[0]}:{self.column_range[1]}" if self.column_range else None
+            ranges = [gspread.utils.absolute_range_name(ws.title, columns) for ws in worksheets]
+            response = self._call(spreadsheet.values_batch_get, ranges)
+            for ws, value_range in zip(worksheets, response.get('valueRanges', [])):
+                values[ws.title] = value_range.get('values', [])
+        else:
+            first, last, _ = self.column_range
+            max_rows = max(ws.row_count for ws in worksheets)
+            for start in range(1, max_rows + 1, page_size):
+                active = [ws for ws in worksheets if ws.row_count >= start]
+                ends = [min(start + page_size - 1, ws.row_count) for ws in active]
+                ranges = [
+                    gspread.utils.absolute_range_name(ws.title, f"{first}{start}:{last}{end}")
+                    for ws, end in zip(active, ends)
+                ]
+                response = self._call(spreadsheet.values_batch_get, ranges)
+                for ws, end, value_range in zip(active, ends, response.get('valueRanges', [])):
+                    page = value_range.get('values', [])
+                    values[ws.title].extend(page)
+                    # The API drops trailing empty rows - keep positions for later pages
+                    values[ws.title].extend([] for _ in range(end - start + 1 - len(page)))
+        
+        for title, rows in values.items():
+            if self.column_range:
+                rows = normalize_values(rows, self.column_range[2])
+            else:
+                rows = gspread.utils.fill_gaps(rows) if rows else rows
+            values[title] = rows
+            self.tab_caches.setdefault(
+                title,
+                SheetsCache(config.CACHE_DURATION, config.CACHE_MAX_STALENESS)
+            ).set(rows, version=version)
+        
+        return values
+    
     def invalidate_cache(self):
-        """Force cache invalidation - use when user requests refresh."""
+        """
+        Force cache invalidation - use when user requests refresh.
+        
+        The last good data is kept so a refresh during an outage still
+        falls back to it instead of failing.
+        """
         logger.info("Cache invalidated")
-        self.cache.invalidate()
+        self.cache.expire()
+        # A manual refresh should also pick up renamed or new tabs
+        self._reset_handles()
+        for tab_cache in self.tab_caches.values():
+            tab_cache.expire()
+    
+    def get_content_hash(self, data: list[list[str]]) -> Optional[str]:
+        """Hash computed when `data` was cached (None if it is no longer the cached data)."""
+        content_hash = self.cache.content_hash
+        if data is not self.cache.data:
+            return None
+        return content_hash
     
     def get_cache_status(self) -> dict:
         """Get cache status information."""
         return {
             'is_valid': self.cache.is_valid(),
             'last_fetch': self.cache.last_fetch,
-            'rows_cached': len(self.cache.data) if self.cache.data else 0
+            'content_hash': self.cache.content_hash,
+            'rows_cached': len(self.cache.data) if self.cache.data else 0,
+            **self.stats
         }
+    
+    def close(self):
+        """Release the worker threads used for Sheets requests."""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,100 @@
+"""
+On-disk snapshot of the last good Google Sheets download.
+Lets the bot answer right after a restart and survive Google outages.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def compute_content_hash(rows: list[list[str]]) -> str:
+    """Stable SHA-256 of the raw sheet rows."""
+    payload = json.dumps(rows, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Raw sheet rows plus the metadata needed to trust them later."""
+
+    rows: list[list[str]]
+    fetched_at: datetime
+    content_hash: str
+    version: Optional[str] = None  # Freshness token at fetch time
+
+
+class SnapshotStore:
+    """Persists a Snapshot as gzip-compressed JSON with atomic replace."""
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def save(self, snapshot: Snapshot):
+        """Write the snapshot; readers never see a partially written file."""
+        payload = {
+            'format': self.FORMAT_VERSION,
+            'fetched_at': snapshot.fetched_at.isoformat(),
+            'content_hash': snapshot.content_hash,
+            'version': snapshot.version,
+            'rows': snapshot.rows,
+        }
+        data = gzip.compress(
+            json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        )
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        logger.info(f"Saved snapshot ({len(snapshot.rows)} rows, {len(data)} bytes) to {self.path}")
+
+    def load(self) -> Optional[Snapshot]:
+        """Read the snapshot; returns None if missing, unreadable or corrupted."""
+        if not self.path.exists():
+            return None
+
+        try:
+            with open(self.path, 'rb') as f:
+                payload = json.loads(gzip.decompress(f.read()).decode('utf-8'))
+
+            if payload.get('format') != self.FORMAT_VERSION:
+                logger.warning(f"Ignoring snapshot with unknown format: {payload.get('format')}")
+                return None
+
+            rows = payload['rows']
+            content_hash = payload['content_hash']
+            if compute_content_hash(rows) != content_hash:
+                logger.warning(f"Snapshot {self.path} failed hash check, ignoring it")
+                return None
+
+            return Snapshot(
+                rows=rows,
+                fetched_at=datetime.fromisoformat(payload['fetched_at']),
+                content_hash=content_hash,
+                version=payload.get('version')
+            )
+
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Could not load snapshot {self.path}: {e}")
+            return None
@@ -0,0 +1,153 @@
+"""
+Parsed task cache - parse each data snapshot once, not once per click.
+"""
+
+import asyncio
+import logging
+import threading
+from datetime import date
+from typing import Optional
+from app.models import Task, TaskStatus, TaskTable
+from app.rules import get_current_date, classify_tasks, IncrementalTaskParser
+from app.snapshot import compute_content_hash
+from app.task_index import TaskIndex
+
+logger = logging.getLogger(__name__)
+
+
+class TaskSnapshot:
+    """Tasks parsed from one data snapshot on one day, with a lazy index."""
+
+    def __init__(self, tasks: list[Task], content_hash: str, today: date):
+        self.tasks = tasks
+        self.content_hash = content_hash
+        self.today = today
+        self._index: Optional[TaskIndex] = None
+
+    @property
+    def index(self) -> TaskIndex:
+        """Groupings and lookups over the tasks, built once per snapshot."""
+        if self._index is None:
+            self._index = TaskIndex(self.tasks)
+        return self._index
+
+    @property
+    def status_groups(self) -> dict[TaskStatus, list[Task]]:
+        """All tasks grouped by status (shared - do not modify)."""
+        return self.index.status_groups
+
+    @property
+    def person_groups(self) -> dict[str, list[Task]]:
+        """All tasks grouped by person (shared - do not modify)."""
+        return self.index.person_groups
+
+    @property
+    def table(self) -> TaskTable:
+        """Columnar view of all tasks for bulk counting."""
+        return self.index.table
+
+
+class ParsedTasksCache:
+    """
+    Keeps the TaskSnapshot of the latest rows, keyed by content hash and date.
+
+    The same rows object (the usual case while the data source cache is
+    valid) is recognized without hashing; a new object with identical
+    content costs one hash instead of a full parse. The date is part of the
+    key because task status depends on today: after midnight the same tasks
+    are only re-classified. When the content did change, only new or edited
+    rows are parsed again (see IncrementalTaskParser).
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[TaskSnapshot] = None
+        self._rows: Optional[list[list[str]]] = None
+        self._parser = IncrementalTaskParser()
+        # get() runs in worker threads; the parser state must not be shared mid-parse
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reclassified = 0
+
+    def get(
+        self,
+        rows: list[list[str]],
+        content_hash: Optional[str] = None,
+        today: Optional[date] = None
+    ) -> TaskSnapshot:
+        """
+        Get parsed tasks for `rows`, parsing only if the data or day changed.
+
+        Args:
+            rows: Raw rows from the data source
+            content_hash: Hash of rows if already known (skips hashing)
+            today: Current date (if None, will be computed)
+        """
+        if today is None:
+            today = get_current_date()
+
+        with self._lock:
+            return self._get(rows, content_hash, today)
+
+    def _get(self, rows: list[list[str]], content_hash: Optional[str], today: date) -> TaskSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None:
+            if rows is not self._rows:
+                if content_hash is None:
+                    content_hash = compute_content_hash(rows)
+                if content_hash != snapshot.content_hash:
+                    snapshot = None
+
+        if snapshot is not None:
+            self._rows = rows
+            if snapshot.today == today:
+                self.hits += 1
+                return snapshot
+
+            # Day rolled over - same tasks, new statuses
+            self.reclassified += 1
+            snapshot = TaskSnapshot(classify_tasks(snapshot.tasks, today), snapshot.content_hash, today)
+            self._snapshot = snapshot
+            return snapshot
+
+        if content_hash is None:
+            content_hash = compute_content_hash(rows)
+
+        self.misses += 1
+        snapshot = TaskSnapshot(self._parser.parse(rows, today), content_hash, today)
+        self._snapshot = snapshot
+        self._rows = rows
+        return snapshot
+
+    def invalidate(self):
+        """Drop the cached snapshot."""
+        with self._lock:
+            self._snapshot = None
+            self._rows = None
+            self._parser.reset()
+
+    def get_stats(self) -> dict:
+        """Get cache hit/miss counters."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'reclassified': self.reclassified,
+            'rows_parsed': self._parser.rows_parsed,
+            'rows_reused': self._parser.rows_reused
+        }
+
+
+async def load_task_snapshot(bot_data: dict, force_refresh: bool = False) -> TaskSnapshot:
+    """
+    Fetch rows from the bot's data source and return their parsed tasks.
+
+    Args:
+        bot_data: Application.bot_data holding 'sheets_client' (and 'task_cache')
+        force_refresh: If True, bypass the data source cache
+    """
+    data_source = bot_data['sheets_client']
+    task_cache: ParsedTasksCache = bot_data.setdefault('task_cache', ParsedTasksCache())
+
+    data = await data_source.fetch_data_async(force_refresh=force_refresh)
+    # Hashing and parsing a large sheet takes seconds - keep the event loop free
+    return await asyncio.to_thread(task_cache.get, data, data_source.get_content_hash(data))
@@ -0,0 +1,134 @@
+"""
+Task index - groupings and lookups built once per parsed snapshot.
+
+Reports and bot handlers query the index instead of re-grouping the task
+list on every request.
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Optional
+from app.aggregation import ReportSummary, summarize_tasks
+from app.models import Task, TaskStatus, TaskTable
+from app.rules import group_tasks_by_status, group_tasks_by_person
+from app.search import SearchResults, TaskSearchIndex
+
+
+class TaskIndex:
+    """
+    Read-only index over classified tasks.
+
+    Every grouping is built on first use and then shared, so returned lists
+    must not be modified. Build a new index whenever tasks are re-parsed or
+    re-classified.
+    """
+
+    def __init__(self, tasks: list[Task]):
+        self.tasks = tasks
+        self._open_tasks: Optional[list[Task]] = None
+        self._status_groups: Optional[dict[TaskStatus, list[Task]]] = None
+        self._open_status_groups: Optional[dict[TaskStatus, list[Task]]] = None
+        self._person_groups: Optional[dict[str, list[Task]]] = None
+        self._overdue_by_person: Optional[dict[str, list[Task]]] = None
+        self._deadline_ordinals: Optional[list[int]] = None
+        self._by_deadline: Optional[list[Task]] = None
+        self._table: Optional[TaskTable] = None
+        self._search_index: Optional[TaskSearchIndex] = None
+        # Searches run in worker threads; the index and its query caches are shared
+        self._search_lock = threading.Lock()
+        self._summary: Optional[ReportSummary] = None
+
+    @property
+    def open_tasks(self) -> list[Task]:
+        """Incomplete tasks in sheet order."""
+        if self._open_tasks is None:
+            self._open_tasks = [t for t in self.tasks if not t.is_completed]
+        return self._open_tasks
+
+    @property
+    def status_groups(self) -> dict[TaskStatus, list[Task]]:
+        """All tasks grouped by status (completed tasks count as ON_TRACK)."""
+        if self._status_groups is None:
+            self._status_groups = group_tasks_by_status(self.tasks)
+        return self._status_groups
+
+    @property
+    def open_status_groups(self) -> dict[TaskStatus, list[Task]]:
+        """Incomplete tasks grouped by status, overdue ones most overdue first."""
+        if self._open_status_groups is None:
+            self._open_status_groups = group_tasks_by_status(self.open_tasks)
+        return self._open_status_groups
+
+    @property
+    def person_groups(self) -> dict[str, list[Task]]:
+        """All tasks grouped by person."""
+        if self._person_groups is None:
+            self._person_groups = group_tasks_by_person(self.tasks)
+        return self._person_groups
+
+    @property
+    def table(self) -> TaskTable:
+        """Columnar view of all tasks for bulk counting."""
+        if self._table is None:
+            self._table = TaskTable(self.tasks)
+        return self._table
+
+    def with_status(self, *statuses: TaskStatus) -> list[Task]:
+        """Incomplete tasks having any of the given statuses."""
+        groups = self.open_status_groups
+        if len(statuses) == 1:
+            return groups[statuses[0]]
+        return [t for status in statuses for t in groups[status]]
+
+    def for_person(self, name: str) -> list[Task]:
+        """All tasks of one person (empty list if unknown)."""
+        return self.person_groups.get(name, [])
+
+    def overdue_by_person(self) -> dict[str, list[Task]]:
+        """Incomplete overdue tasks grouped by person, in sheet order."""
+        if self._overdue_by_person is None:
+            self._overdue_by_person = group_tasks_by_person(
+                [t for t in self.open_tasks if t.status == TaskStatus.OVERDUE]
+            )
+        return self._overdue_by_person
+
+    def due_between(self, start: date, end: date) -> list[Task]:
+        """Incomplete tasks with a deadline in [start, end], earliest first."""
+        if self._by_deadline is None:
+            self._by_deadline = sorted(
+                (t for t in self.open_tasks if t.deadline is not None),
+                key=lambda t: t.deadline
+            )
+            self._deadline_ordinals = [t.deadline.toordinal() for t in self._by_deadline]
+
+        lo = bisect_left(self._deadline_ordinals, start.toordinal())
+        hi = bisect_right(self._deadline_ordinals, end.toordinal())
+        return self._by_deadline[lo:hi]
+
+    def summary(self, today: date) -> ReportSummary:
+        """Report aggregates for `today`, computed once per day."""
+        if self._summary is None or self._summary.today != today:
+            self._summary = summarize_tasks(self.tasks, today, self.table)
+        return self._summary
+
+    @property
+    def search_index(self) -> TaskSearchIndex:
+        """Inverted word index over names and contents."""
+        if self._search_index is None:
+            self._search_index = TaskSearchIndex(self.tasks)
+        return self._search_index
+
+    def search(self, query: str) -> list[Task]:
+        """Tasks whose name or content has a word starting with every query term."""
+        with self._search_lock:
+            return self.search_index.search(query)
+
+    def ranked_search(self, query: str) -> SearchResults:
+        """
+        Matching tasks, most relevant first, ready for paging.
+
+        The first call builds the search index - run it in a worker thread.
+        """
+        with self._search_lock:
+            return self.search_index.rank(query)
@@ -0,0 +1,17 @@
+"""
+Text helpers shared by parsing, completion detection and search.
+"""
+
+import re
+import unicodedata
+
+COMBINING_MARKS = re.compile('[\u0300-\u036f]')  # Covers all Vietnamese tone/vowel marks
+
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercase and strip Vietnamese diacritics: "Hoàn Thành" -> "hoan thanh".
+    """
+    decomposed = unicodedata.normalize('NFD', text.lower())
+    # đ has no decomposition
+    return COMBINING_MARKS.sub('', decomposed).replace('đ', 'd')
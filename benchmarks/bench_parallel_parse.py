@@ -0,0 +1,53 @@
+"""
+Benchmark: serial vs process-pool parsing, and where parallel starts to win.
+
+Process start-up and pickling the tasks back cost a fixed amount, so the
+pool only pays off above some sheet size. Use the reported crossover to
+set PARSE_PARALLEL_THRESHOLD for the machine the bot runs on.
+
+Run from the repository root:
+    python -m benchmarks.bench_parallel_parse [workers]
+"""
+
+import logging
+import os
+import sys
+import time
+
+from app.datasource import generate_synthetic_rows
+from app.rules import parse_all_tasks
+
+SIZES = [10_000, 25_000, 50_000, 100_000, 200_000, 400_000]
+
+
+def timed(rows, workers: int):
+    start = time.perf_counter()
+    tasks = parse_all_tasks(rows, workers=workers)
+    return time.perf_counter() - start, tasks
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    logging.basicConfig(level=logging.ERROR)
+    print(f"CPUs: {os.cpu_count()}, workers: {workers}")
+    print(f"{'rows':>8}{'serial s':>10}{'parallel s':>12}{'speedup':>9}")
+
+    crossover = None
+    for size in SIZES:
+        rows = generate_synthetic_rows(size, seed=size)
+        serial, expected = timed(rows, 1)
+        parallel, tasks = timed(rows, workers)
+        assert tasks == expected, "parallel parse differs from serial parse"
+
+        print(f"{size:>8}{serial:>10.2f}{parallel:>12.2f}{serial / parallel:>8.2f}x")
+        if crossover is None and parallel < serial:
+            crossover = size
+
+    if crossover is None:
+        print("crossover: none up to the largest size - keep PARSE_PARALLEL_THRESHOLD=0 here")
+    else:
+        print(f"crossover: parallel is faster from about {crossover} rows")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Micro-benchmark: deadline parsing over 100k cells.
+
+Compares the previous parse_deadline (patterns re-matched on every call,
+float() fallback, one warning per bad cell) with the current memoized one.
+
+Run from the repository root:
+    python -m benchmarks.bench_parse_deadline [cells]
+"""
+
+import logging
+import re
+import sys
+import time
+from datetime import date, timedelta
+from typing import Optional
+
+from app.datasource import generate_synthetic_rows
+from app.rules import parse_deadline, _parse_deadline_cached
+
+
+def legacy_parse_deadline(deadline_str: str) -> Optional[date]:
+    """parse_deadline as it was before the fast path (yyyy-mm-dd branch omitted - it never matched)."""
+    if not deadline_str or not deadline_str.strip():
+        return None
+
+    deadline_str = deadline_str.strip()
+
+    match = re.match(r'^(\d{1,2})/(\d{1,2})/(\d{4})$', deadline_str)
+    if match:
+        day, month, year = match.groups()
+        try:
+            return date(int(year), int(month), int(day))
+        except ValueError:
+            pass
+
+    try:
+        serial = float(deadline_str)
+        if 1 <= serial <= 100000:
+            return date(1899, 12, 30) + timedelta(days=int(serial))
+    except (ValueError, TypeError):
+        pass
+
+    logging.getLogger('app.rules').warning(f"Could not parse deadline: '{deadline_str}'")
+    return None
+
+
+def build_cells(count: int) -> list[str]:
+    """Deadline and completion-date cells, two per synthetic row."""
+    rows = generate_synthetic_rows(count // 2, seed=42)[1:]
+    cells = []
+    for i, row in enumerate(rows):
+        cells.append(row[4])
+        # Sprinkle in the other formats the sheet contains
+        cells.append('45292' if i % 50 == 0 else 'chưa rõ' if i % 97 == 0 else row[6])
+    return cells
+
+
+def run(func, cells: list[str]) -> float:
+    start = time.perf_counter()
+    for cell in cells:
+        func(cell)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    cells = build_cells(count)
+    logging.basicConfig(level=logging.ERROR)  # Do not time terminal output
+
+    legacy = run(legacy_parse_deadline, cells)
+    _parse_deadline_cached.cache_clear()
+    current = run(parse_deadline, cells)
+    info = _parse_deadline_cached.cache_info()
+
+    mismatches = sum(1 for c in cells if legacy_parse_deadline(c) != parse_deadline(c))
+    print(f"cells:     {len(cells)} ({info.currsize} distinct cached, {info.hits} hits)")
+    print(f"legacy:    {legacy * 1000:.1f} ms")
+    print(f"fast path: {current * 1000:.1f} ms")
+    print(f"speedup:   {legacy / current:.1f}x")
+    print(f"mismatches: {mismatches}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: task search on a large synthetic sheet.
+
+Compares the linear search_tasks scan with TaskSearchIndex (cold = query
+cache cleared before each run) on a mix of selective and broad queries.
+"rank ms" is the ranked search the bot runs (TaskSearchIndex.rank, cold):
+it scores every match with BM25, so it is much slower than a plain lookup.
+Only selective and repeated (cached) lookups stay under a millisecond;
+broad cold queries on a large sheet take a few milliseconds.
+
+Run from the repository root:
+    python -m benchmarks.bench_search [rows]
+"""
+
+import gc
+import logging
+import sys
+import time
+import timeit
+
+from app.datasource import generate_synthetic_rows
+from app.rules import parse_all_tasks, search_tasks
+from app.search import TaskSearchIndex, np
+
+QUERIES = ["#4242", "ngo thi mai", "bien ban nghiem thu", "bao cao", "hoan", "Đức"]
+
+
+def per_call_ms(func, number: int) -> float:
+    return timeit.timeit(func, number=number) / number * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    logging.basicConfig(level=logging.ERROR)
+    tasks = parse_all_tasks(generate_synthetic_rows(count, seed=42))
+
+    start = time.perf_counter()
+    index = TaskSearchIndex(tasks)
+    build = time.perf_counter() - start
+    gc.freeze()  # Keep collector pauses out of the timings
+
+    print(f"tasks: {len(tasks)}, words: {len(index.vocabulary)}, numpy: {np is not None}")
+    print(f"index build: {build * 1000:.0f} ms")
+    print(f"{'query':<22}{'hits':>8}{'linear ms':>12}{'index ms':>11}{'cached ms':>11}{'rank ms':>10}")
+
+    for query in QUERIES:
+        def cold():
+            index._query_cache.clear()
+            return index.search(query)
+
+        def cold_rank():
+            index._query_cache.clear()
+            index._ranked_cache.clear()
+            return index.rank(query)
+
+        hits = len(cold())
+        linear = per_call_ms(lambda: search_tasks(tasks, query), 3)
+        indexed = per_call_ms(cold, 50)
+        cached = per_call_ms(lambda: index.search_positions(query), 1000)
+        ranked = per_call_ms(cold_rank, 10)
+        print(f"{query:<22}{hits:>8}{linear:>12.1f}{indexed:>11.3f}{cached:>11.4f}{ranked:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Memory benchmark: bytes held per parsed Task.
+
+Rows are round-tripped through JSON first so every cell is a distinct
+string object, as with a real Sheets API response. Only the memory
+allocated by parse_all_tasks (and kept alive) is counted.
+
+Run from the repository root:
+    python -m benchmarks.bench_task_memory [rows]
+"""
+
+import json
+import logging
+import sys
+import tracemalloc
+
+from app.datasource import generate_synthetic_rows
+from app.rules import parse_all_tasks
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = json.loads(json.dumps(generate_synthetic_rows(count, seed=42)))
+    logging.basicConfig(level=logging.ERROR)
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tasks = parse_all_tasks(rows)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    retained = after - before
+    print(f"tasks:          {len(tasks)}")
+    print(f"Task instance:  {sys.getsizeof(tasks[0])} bytes (has __dict__: {hasattr(tasks[0], '__dict__')})")
+    print(f"retained:       {retained / 2**20:.1f} MiB ({retained / len(tasks):.0f} bytes/task)")
+    print(f"peak:           {(peak - before) / 2**20:.1f} MiB")
+    print(f"distinct names: {len({id(t.ho_ten) for t in tasks})}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""
+Unit tests for the single-pass report aggregation.
+"""
+
+import pytest
+from dataclasses import FrozenInstanceError
+from datetime import date, timedelta
+from unittest.mock import patch
+from app.aggregation import DUE_SOON_STATUSES, summarize_tasks
+from app.datasource import generate_synthetic_rows
+from app.models import TaskStatus, TaskTable
+from app.reporting import build_weekly_report
+from app.rules import classify_tasks, parse_all_tasks, filter_incomplete_tasks, group_tasks_by_status, group_tasks_by_person
+from app.task_index import TaskIndex
+
+
+TODAY = date(2024, 12, 25)
+
+ROWS = [
+    ["STT", "Họ tên", "Nội dung", "Mức độ", "Deadline", "Kết quả", "Ngày hoàn thành", "Ghi chú"],
+    ["1", "An", "Báo cáo quý", "Cao", "20/12/2024", "", "", ""],
+    ["2", "Bình", "Kiểm kê kho", "", "25/12/2024", "Đang làm", "", ""],
+    ["3", "", "Việc chưa giao", "", "22/12/2024", "", "", ""],
+    ["4", "An", "Họp giao ban", "", "26/12/2024", "Chưa hoàn thành", "", ""],
+    ["5", "Bình", "Soạn hợp đồng", "", "27/12/2024", "50%", "", ""],
+    ["6", "Cường", "Cập nhật website", "", "", "", "", ""],
+    ["7", "Cường", "Gửi công văn", "", "10/01/2025", "", "", ""],
+    ["8", "An", "Nộp thuế", "", "24/12/2024", "Hoàn thành", "23/12/2024", ""],
+    ["9", "Bình", "Đặt lịch", "", "23/12/2024", "Đã xong", "24/12/2024", ""],
+]
+
+# build_weekly_report output for ROWS before the aggregation engine
+EXPECTED_WEEKLY = """\
+==================================================
+📊 BÁO CÁO TUẦN
+📅 Tuần từ 23/12/2024 đến 29/12/2024
+==================================================
+
+✅ HOÀN THÀNH TRONG TUẦN: 2 việc
+
+👥 Thống kê theo người:
+   👤 An: 1 việc
+      • Nộp thuế... (Hoàn thành: 23/12/2024)
+   👤 Bình: 1 việc
+      • Đặt lịch... (Hoàn thành: 24/12/2024)
+
+📌 TÌNH TRẠNG HIỆN TẠI
+   • Chưa hoàn thành: 7 việc
+
+🚨 CÔNG VIỆC TRỄ HẠN
+   Tổng: 2 việc
+
+   Top 10 việc trễ nhiều nhất:
+   1. 👤 An | 📝 Báo cáo quý | 📅 20/12/2024 | ⚠️ Trễ 5 ngày
+   2. 📝 Việc chưa giao | 📅 22/12/2024 | ⚠️ Trễ 3 ngày
+
+👥 THỐNG KÊ CHƯA HOÀN THÀNH THEO NGƯỜI
+
+👤 An
+   • Tổng chưa hoàn thành: 2
+   • Trễ hạn: 1
+   • Sắp tới hạn (1-3 ngày): 1
+
+👤 Không rõ
+   • Tổng chưa hoàn thành: 1
+   • Trễ hạn: 1
+   • Sắp tới hạn (1-3 ngày): 0
+
+👤 Bình
+   • Tổng chưa hoàn thành: 2
+   • Trễ hạn: 0
+   • Sắp tới hạn (1-3 ngày): 2
+
+👤 Cường
+   • Tổng chưa hoàn thành: 2
+   • Trễ hạn: 0
+   • Sắp tới hạn (1-3 ngày): 0
+
+==================================================
+🤖 Báo cáo tự động từ Telegram Bot"""
+
+
+@pytest.fixture(params=[1, 7, 42])
+def tasks(request):
+    rows = [list(row) for row in generate_synthetic_rows(600, seed=request.param, today=TODAY)]
+    rows[3][1] = rows[8][1] = ""  # Unnamed tasks group under "Không rõ"
+    return classify_tasks(parse_all_tasks(rows), TODAY)
+
+
+class TestSummarizeTasks:
+    """Test the one-pass summary against the separate per-report passes."""
+
+    def test_groups_match_rules_helpers(self, tasks):
+        """Test open tasks and groupings equal the group_tasks_* results."""
+        summary = summarize_tasks(tasks, TODAY)
+        incomplete = filter_incomplete_tasks(tasks)
+
+        assert list(summary.open_tasks) == incomplete
+        assert summary.open_count == len(incomplete)
+        assert {s: list(g) for s, g in summary.open_by_status.items()} == group_tasks_by_status(incomplete)
+        assert {n: list(g) for n, g in summary.overdue_by_person.items()} == group_tasks_by_person(
+            [t for t in incomplete if t.status == TaskStatus.OVERDUE]
+        )
+
+    def test_week_and_person_counts_match_table(self, tasks):
+        """Test weekly figures equal the TaskTable queries they replace."""
+        summary = summarize_tasks(tasks, TODAY)
+        table = TaskTable(tasks)
+        week_start = TODAY - timedelta(days=TODAY.weekday())
+
+        assert (summary.week_start, summary.week_end) == (week_start, week_start + timedelta(days=6))
+        assert list(summary.completed_this_week) == table.select(
+            table.completed_between_rows(summary.week_start, summary.week_end)
+        )
+
+        totals = table.count_by_person(table.open_rows())
+        overdue = table.count_by_person(table.rows_with_status(TaskStatus.OVERDUE))
+        due_soon = table.count_by_person(table.rows_with_status(*DUE_SOON_STATUSES))
+        expected = sorted(
+            ((name, total, overdue.get(name, 0), due_soon.get(name, 0)) for name, total in totals.items()),
+            key=lambda s: (s[2], s[1]), reverse=True
+        )
+        assert [(p.name, p.total, p.overdue, p.due_soon) for p in summary.person_stats] == expected
+
+    def test_week_and_person_counts_match_plain_loops(self, tasks):
+        """Test weekly figures and per-person counts against plain loops."""
+        summary = summarize_tasks(tasks, TODAY)
+        week_start = TODAY - timedelta(days=TODAY.weekday())
+        week_end = week_start + timedelta(days=6)
+
+        assert (summary.week_start, summary.week_end) == (week_start, week_end)
+        assert list(summary.completed_this_week) == [
+            t for t in tasks if t.ngay_hoan_thanh and week_start <= t.ngay_hoan_thanh <= week_end
+        ]
+
+        expected = []
+        for name, person_tasks in group_tasks_by_person(filter_incomplete_tasks(tasks)).items():
+            expected.append((
+                name,
+                len(person_tasks),
+                sum(t.status == TaskStatus.OVERDUE for t in person_tasks),
+                sum(t.status in DUE_SOON_STATUSES for t in person_tasks)
+            ))
+        expected.sort(key=lambda s: (s[2], s[1]), reverse=True)
+        assert [(p.name, p.total, p.overdue, p.due_soon) for p in summary.person_stats] == expected
+
+    def test_summary_is_immutable(self, tasks):
+        """Test a shared summary cannot be modified by a report."""
+        summary = summarize_tasks(tasks, TODAY)
+
+        with pytest.raises(FrozenInstanceError):
+            summary.today = date(2025, 1, 1)
+        with pytest.raises(TypeError):
+            summary.open_by_status[TaskStatus.OVERDUE] = ()
+        with pytest.raises(AttributeError):
+            summary.open_by_status[TaskStatus.OVERDUE].append(tasks[0])
+
+    def test_index_summary_cached_per_day(self, tasks):
+        """Test the index aggregates once per report date."""
+        index = TaskIndex(tasks)
+
+        first = index.summary(TODAY)
+
+        assert index.summary(TODAY) is first
+        assert index.summary(TODAY + timedelta(days=1)).today == TODAY + timedelta(days=1)
+
+
+class TestReportsFromSummary:
+    """Test reports rendered from the summary keep their exact text."""
+
+    def test_weekly_report_text_unchanged(self):
+        """Test the weekly report is byte-identical to the previous output."""
+        tasks = classify_tasks(parse_all_tasks(ROWS), TODAY)
+
+        with patch('app.reporting.get_current_date', return_value=TODAY):
+            assert build_weekly_report(tasks) == EXPECTED_WEEKLY
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
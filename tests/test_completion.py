@@ -0,0 +1,96 @@
+"""
+Unit tests for completion rules (Kết quả / Tiến độ).
+"""
+
+import pytest
+from app.completion import CompletionRules, is_completed_text
+from app.models import Task
+
+
+def make_rules(**overrides):
+    settings = dict(
+        keywords=['hoàn thành', 'xong', 'completed', 'done'],
+        negations=['chưa', 'không', 'sắp', 'gần', 'đang', 'not'],
+        percent_threshold=100
+    )
+    settings.update(overrides)
+    return CompletionRules(**settings)
+
+
+class TestCompletionRules:
+    """Test keyword, negation and percentage detection."""
+
+    @pytest.mark.parametrize("text", [
+        "Hoàn thành", "HOÀN THÀNH", "hoan thanh", "Đã hoàn thành",
+        "Đã xong", "xong", "Done", "completed", "100%", "Hoàn thành 100 %",
+    ])
+    def test_completed(self, text):
+        """Test completion phrases in any case, with or without diacritics."""
+        assert make_rules().is_completed(text)
+
+    @pytest.mark.parametrize("text", [
+        "", "Đang làm", "Chưa hoàn thành", "chưa xong", "Không thể hoàn thành",
+        "not done", "not yet done", "80%", "Hoàn thành 80%", "incomplete",
+        "Chưa thực sự hoàn thành", "Không được hoàn thành đúng hạn",
+        "Vẫn chưa làm xong", "Chưa thể hoàn thành trong tuần này",
+        "Sắp xong", "Gần xong", "Đang hoàn thành", "gan xong roi",
+    ])
+    def test_not_completed(self, text):
+        """Test negations, partial progress and unrelated words."""
+        assert not make_rules().is_completed(text)
+
+    def test_later_keyword_after_negated_clause(self):
+        """Test a negation only cancels keywords in its own clause."""
+        assert make_rules().is_completed("Chưa gửi báo cáo, đã xong phần code")
+        assert make_rules().is_completed("Đã hoàn thành; không phát sinh lỗi")
+
+    def test_percent_threshold(self):
+        """Test the percentage counted as done is configurable."""
+        rules = make_rules(percent_threshold=90)
+
+        assert rules.is_completed("95%")
+        assert not rules.is_completed("89,5%")
+        assert rules.progress("Đang làm 50% rồi 95%") == 95.0
+        assert rules.progress("Đang làm") is None
+
+    def test_extra_pattern(self):
+        """Test a custom regex counts as a completion keyword."""
+        rules = make_rules(pattern=r'da (?:nop|gui)')
+
+        assert rules.is_completed("Đã nộp")
+        assert rules.is_completed("đã gửi")
+        assert not rules.is_completed("chưa nộp")
+
+    def test_results_are_memoized(self):
+        """Test each distinct value is matched once."""
+        rules = make_rules()
+
+        for _ in range(100):
+            rules.is_completed("Hoàn thành")
+            rules.is_completed("Đang làm")
+
+        info = rules.is_completed.cache_info()
+        assert info.misses == 2
+        assert info.hits == 198
+
+    def test_task_uses_configured_rules(self):
+        """Test Task.is_completed follows the shared rules."""
+        def make_task(ket_qua):
+            return Task(
+                stt="1", ho_ten="An", noi_dung="Việc", muc_do="",
+                deadline=None, deadline_raw="", ket_qua=ket_qua,
+                ngay_hoan_thanh=None, ngay_hoan_thanh_raw="", ghi_chu=""
+            )
+
+        assert make_task("  Đã xong ").is_completed
+        assert not make_task("Chưa hoàn thành").is_completed
+        assert is_completed_text("done")
+
+    @pytest.mark.parametrize("text", ["Sắp xong", "Gần xong", "Đang hoàn thành"])
+    def test_almost_done_not_completed_by_default(self, text):
+        """Test the default negations keep "almost done" tasks open."""
+        assert not is_completed_text(text)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
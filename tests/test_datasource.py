@@ -0,0 +1,130 @@
+"""
+Unit tests for the pluggable task data sources.
+"""
+
+import csv
+import os
+import pytest
+from datetime import date
+from app.config import config
+from app.datasource import (
+    InMemoryDataSource, LocalFileDataSource, create_data_source, generate_synthetic_rows
+)
+from app.models import TaskStatus
+from app.rules import parse_all_tasks
+
+
+ROWS = [
+    ["STT", "Họ tên", "Nội dung", "Mức độ", "Deadline", "Kết quả", "Ngày hoàn thành", "Ghi chú"],
+    ["1", "Nguyễn Văn An", "Soạn công văn", "Cao", "25/12/2024", "Hoàn thành", "24/12/2024", ""],
+    ["2", "Trần Thị Bình", "Họp giao ban", "", "26/12/2024", "", "", "Phòng 2"],
+]
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+
+
+class TestLocalFileDataSource:
+    """Test reading tasks from local files."""
+
+    def test_read_csv(self, tmp_path):
+        """Test a CSV file gives the same rows as the sheet."""
+        path = tmp_path / "tasks.csv"
+        write_csv(path, ROWS)
+
+        assert LocalFileDataSource(str(path)).fetch_data() == ROWS
+
+    def test_file_reread_only_when_changed(self, tmp_path):
+        """Test the file is cached until it is modified."""
+        path = tmp_path / "tasks.csv"
+        write_csv(path, ROWS)
+        source = LocalFileDataSource(str(path))
+
+        first = source.fetch_data()
+        assert source.fetch_data() is first
+
+        write_csv(path, ROWS[:2])
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+        assert source.fetch_data() == ROWS[:2]
+
+    @pytest.mark.asyncio
+    async def test_async_fetch(self, tmp_path):
+        """Test the default async wrapper returns the rows."""
+        path = tmp_path / "tasks.csv"
+        write_csv(path, ROWS)
+
+        assert await LocalFileDataSource(str(path)).fetch_data_async() == ROWS
+
+    def test_read_xlsx(self, tmp_path):
+        """Test an XLSX export is read with sheet-like cell formatting."""
+        openpyxl = pytest.importorskip("openpyxl")
+        path = tmp_path / "tasks.xlsx"
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(ROWS[0])
+        sheet.append([1, "Nguyễn Văn An", "Soạn công văn", "Cao", date(2024, 12, 25), "Hoàn thành", None, None])
+        workbook.save(path)
+
+        data = LocalFileDataSource(str(path)).fetch_data()
+
+        assert data[1] == ["1", "Nguyễn Văn An", "Soạn công văn", "Cao", "25/12/2024", "Hoàn thành", "", ""]
+
+
+class TestSyntheticData:
+    """Test the in-memory synthetic data source."""
+
+    def test_generated_rows_parse(self):
+        """Test synthetic rows parse into tasks covering all statuses."""
+        rows = generate_synthetic_rows(2000, seed=1)
+
+        tasks = parse_all_tasks(rows)
+
+        assert len(rows) == 2001
+        assert len(tasks) == 2000
+        assert {t.status for t in tasks} == set(TaskStatus)
+
+    def test_generation_is_deterministic(self):
+        """Test the same seed produces the same table."""
+        today = date(2024, 12, 25)
+        assert generate_synthetic_rows(50, seed=7, today=today) == generate_synthetic_rows(50, seed=7, today=today)
+
+    @pytest.mark.asyncio
+    async def test_in_memory_source(self):
+        """Test the in-memory source serves its rows."""
+        source = InMemoryDataSource(ROWS)
+
+        assert await source.fetch_data_async() is ROWS
+        assert source.get_cache_status()['rows_cached'] == 3
+
+
+class TestCreateDataSource:
+    """Test selecting the data source from config."""
+
+    def test_memory_source(self, monkeypatch):
+        monkeypatch.setattr(config, 'DATA_SOURCE', 'memory')
+        monkeypatch.setattr(config, 'SYNTHETIC_ROWS', 10)
+
+        source = create_data_source()
+
+        assert isinstance(source, InMemoryDataSource)
+        assert len(source.fetch_data()) == 11
+
+    def test_file_source(self, monkeypatch, tmp_path):
+        path = tmp_path / "tasks.csv"
+        write_csv(path, ROWS)
+        monkeypatch.setattr(config, 'DATA_SOURCE', 'file')
+        monkeypatch.setattr(config, 'DATA_SOURCE_PATH', str(path))
+
+        assert create_data_source().fetch_data() == ROWS
+
+    def test_unknown_source(self, monkeypatch):
+        monkeypatch.setattr(config, 'DATA_SOURCE', 'ftp')
+
+        with pytest.raises(ValueError):
+            create_data_source()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,176 @@
+"""
+Unit tests for the daily history store and weekly trend sections.
+"""
+
+import pytest
+from datetime import date, timedelta
+from unittest.mock import patch
+from app.datasource import generate_synthetic_rows
+from app.history import DailyAggregate, HistoryStore, PersonCounts, aggregate_day
+from app.models import TaskStatus
+from app.report_cache import RenderedReportCache, render_report
+from app.reporting import build_weekly_report
+from app.rules import classify_tasks, parse_all_tasks
+from app.task_cache import ParsedTasksCache
+
+
+TODAY = date(2024, 12, 27)
+
+
+@pytest.fixture
+def tasks():
+    rows = [list(row) for row in generate_synthetic_rows(300, seed=5, today=TODAY)]
+    rows[2][1] = ""
+    return classify_tasks(parse_all_tasks(rows), TODAY)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / "history.sqlite3"))
+
+
+def make_entry(day, open_, overdue, completed, persons=None):
+    """Stored aggregate with hand-picked totals."""
+    return DailyAggregate(
+        day=day, open=open_, overdue=overdue, completed=completed,
+        overdue_ages=(overdue, 0, 0, 0, 0), persons=persons or {}
+    )
+
+
+class TestAggregateDay:
+    """Test the compact daily aggregate."""
+
+    def test_counts_match_tasks(self, tasks):
+        """Test totals, per-person counts and the age histogram."""
+        entry = aggregate_day(tasks, TODAY)
+        overdue = [t for t in tasks if not t.is_completed and t.status == TaskStatus.OVERDUE]
+
+        assert entry.open == sum(1 for t in tasks if not t.is_completed)
+        assert entry.completed == sum(1 for t in tasks if t.is_completed)
+        assert entry.overdue == len(overdue) == sum(entry.overdue_ages)
+        assert entry.overdue_ages[0] == sum(1 for t in overdue if t.days_overdue <= 3)
+        assert sum(p.open + p.completed for p in entry.persons.values()) == len(tasks)
+        assert "Không rõ" in entry.persons
+
+
+class TestHistoryStore:
+    """Test persistence and lookups."""
+
+    def test_missing_file_has_no_history(self, tmp_path):
+        """Test reading creates nothing on disk."""
+        store = HistoryStore(str(tmp_path / "none" / "history.sqlite3"))
+
+        assert store.get(TODAY) is None
+        assert store.last_day is None
+        assert not (tmp_path / "none").exists()
+
+    def test_record_round_trip(self, store, tasks):
+        """Test an entry reads back equal, also from a new store instance."""
+        entry = aggregate_day(tasks, TODAY)
+        store.record(entry)
+
+        loaded = HistoryStore(str(store.path)).get(TODAY)
+
+        assert loaded == entry
+        assert HistoryStore(str(store.path)).last_day == TODAY
+
+    def test_record_same_day_replaces(self, store):
+        """Test re-running the daily job keeps one entry per day."""
+        store.record(make_entry(TODAY, 10, 2, 5, {"An": PersonCounts(10, 2, 5)}))
+        store.record(make_entry(TODAY, 8, 1, 7, {"Bình": PersonCounts(8, 1, 7)}))
+
+        entry = store.get(TODAY)
+
+        assert (entry.open, entry.overdue, entry.completed) == (8, 1, 7)
+        assert dict(entry.persons) == {"Bình": PersonCounts(8, 1, 7)}
+
+    def test_trends(self, store):
+        """Test week-over-week and 30-day comparisons pick the right days."""
+        store.record(make_entry(TODAY - timedelta(days=40), 99, 99, 0))
+        store.record(make_entry(TODAY - timedelta(days=25), 30, 4, 10))
+        store.record(make_entry(TODAY - timedelta(days=15), 28, 5, 16, {"An": PersonCounts(5, 1, 3)}))
+        store.record(make_entry(TODAY - timedelta(days=8), 25, 6, 20, {"An": PersonCounts(5, 1, 4)}))
+        current = make_entry(TODAY, 22, 9, 29, {"An": PersonCounts(4, 3, 6), "Bình": PersonCounts(3, 1, 1)})
+
+        trends = store.trends(current)
+
+        assert trends.week_ago.day == TODAY - timedelta(days=8)
+        assert trends.two_weeks_ago.day == TODAY - timedelta(days=15)
+        assert trends.month_start.day == TODAY - timedelta(days=25)
+        assert trends.completed_last_week() == 9
+        assert trends.completed_week_before() == 4
+        assert trends.completed_per_day() == pytest.approx(19 / 25)
+        assert trends.overdue_changes() == [("An", 2), ("Bình", 1)]
+
+    def test_no_week_ago_entry(self, store):
+        """Test entries older than two weeks are not used as 'last week'."""
+        store.record(make_entry(TODAY - timedelta(days=14), 20, 2, 3))
+
+        trends = store.trends(make_entry(TODAY, 22, 9, 29))
+
+        assert trends.week_ago is None
+        assert trends.completed_last_week() is None
+
+
+class TestWeeklyTrendSections:
+    """Test the trend sections of the weekly report."""
+
+    def test_report_without_history_unchanged(self, tasks, store):
+        """Test trend sections only appear when a store is given."""
+        with patch('app.reporting.get_current_date', return_value=TODAY):
+            plain = build_weekly_report(tasks)
+            with_history = build_weekly_report(tasks, history=store)
+
+        assert "📈" not in plain
+        assert with_history.startswith(plain.rsplit("=" * 50, 1)[0])
+        assert "Chưa đủ dữ liệu lịch sử" in with_history
+
+    def test_report_with_history(self, tasks, store):
+        """Test week-over-week and 30-day figures are rendered."""
+        current = aggregate_day(tasks, TODAY)
+        store.record(make_entry(TODAY - timedelta(days=7), current.open - 5, current.overdue + 2, current.completed - 12))
+
+        with patch('app.reporting.get_current_date', return_value=TODAY):
+            text = build_weekly_report(tasks, history=store)
+
+        assert f"   • Chưa hoàn thành: {current.open} (▲ 5)" in text
+        assert f"   • Trễ hạn: {current.overdue} (▼ 2)" in text
+        assert "   • Hoàn thành trong 7 ngày: 12" in text
+        assert "📆 XU HƯỚNG 30 NGÀY" in text
+        assert "   • Tốc độ hoàn thành: 1.7 việc/ngày" in text
+
+    def test_new_history_day_invalidates_cached_report(self, store):
+        """Test recording a day re-renders the cached weekly report."""
+        snapshot = ParsedTasksCache().get(generate_synthetic_rows(50, today=TODAY), today=TODAY)
+        cache = RenderedReportCache(history=store)
+
+        with patch('app.reporting.get_current_date', return_value=TODAY):
+            before = cache.get('weekly', snapshot, today=TODAY)
+            store.record(make_entry(TODAY - timedelta(days=7), 1, 1, 1))
+            after = cache.get('weekly', snapshot, today=TODAY)
+
+        assert after != before
+        assert cache.get_stats()['misses'] == 2
+
+    @pytest.mark.asyncio
+    async def test_corrupt_history_sends_report_without_trends(self, tmp_path):
+        """Test an unreadable history file neither fails the handler nor is cached."""
+        path = tmp_path / "history.sqlite3"
+        path.write_bytes(b"not a database" * 100)
+        store = HistoryStore(str(path))
+        assert store.last_day is None
+
+        snapshot = ParsedTasksCache().get(generate_synthetic_rows(50, today=TODAY), today=TODAY)
+        bot_data = {'history': store}
+        with patch('app.reporting.get_current_date', return_value=TODAY), \
+                patch('app.report_cache.get_current_date', return_value=TODAY):
+            text = await render_report(bot_data, snapshot, 'weekly')
+            await render_report(bot_data, snapshot, 'weekly')
+            expected = build_weekly_report(snapshot.tasks, snapshot.index)
+
+        assert text == expected
+        assert bot_data['report_cache'].get_stats() == {'hits': 0, 'misses': 2, 'invalidations': 0, 'size': 0}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,117 @@
+"""
+Unit tests for models module (columnar TaskTable).
+"""
+
+import pytest
+from datetime import date, timedelta
+import app.models
+from app.datasource import generate_synthetic_rows
+from app.models import Task, TaskStatus, TaskTable, TasksByPerson
+from app.reporting import build_weekly_report
+from app.rules import parse_all_tasks, group_tasks_by_person
+
+
+TODAY = date(2024, 6, 12)
+
+
+@pytest.fixture(params=['numpy', 'plain'])
+def backend(request, monkeypatch):
+    """Run each test with NumPy (if installed) and with the plain fallback."""
+    if request.param == 'numpy':
+        if app.models.np is None:
+            pytest.skip("numpy not installed")
+    else:
+        monkeypatch.setattr(app.models, 'np', None)
+    return request.param
+
+
+@pytest.fixture
+def tasks(monkeypatch):
+    monkeypatch.setattr('app.rules.get_current_date', lambda: TODAY)
+    return parse_all_tasks(generate_synthetic_rows(500, seed=3, today=TODAY))
+
+
+class TestCompactTask:
+    """Test the memory-compact Task representation."""
+    
+    def make_task(self, ho_ten, muc_do="Cao"):
+        return Task(
+            stt="1", ho_ten=ho_ten, noi_dung="Việc", muc_do=muc_do,
+            deadline=None, deadline_raw="", ket_qua="", ngay_hoan_thanh=None,
+            ngay_hoan_thanh_raw="", ghi_chu=""
+        )
+    
+    def test_no_instance_dict(self):
+        """Test Task and TasksByPerson are slotted."""
+        assert not hasattr(self.make_task("An"), '__dict__')
+        assert not hasattr(TasksByPerson(ho_ten="An"), '__dict__')
+    
+    def test_names_and_levels_interned(self):
+        """Test equal names from different cells share one string object."""
+        # Build equal strings at runtime so they start out as distinct objects
+        first = self.make_task("".join(["Nguyễn ", "Văn An "]), "".join(["Trung ", "bình"]))
+        second = self.make_task("".join(["Nguyễn Văn ", "An"]), "".join(["Trung", " bình"]))
+        assert first.ho_ten is second.ho_ten
+        assert first.muc_do is second.muc_do
+
+
+class TestTaskTable:
+    """Test columnar filters against plain list comprehensions."""
+    
+    def test_columns(self, backend, tasks):
+        """Test dates, statuses and people are encoded per row."""
+        table = TaskTable(tasks)
+        assert len(table) == len(tasks)
+        for i, task in enumerate(tasks[:20]):
+            assert table.persons[table.person[i]] == (task.ho_ten or TaskTable.UNKNOWN_PERSON)
+            assert table.STATUSES[table.status[i]] == task.status
+            expected = task.deadline.toordinal() if task.deadline else TaskTable.NO_DATE
+            assert table.deadline[i] == expected
+    
+    def test_open_and_status_rows(self, backend, tasks):
+        """Test open-task and status filters."""
+        table = TaskTable(tasks)
+        assert table.select(table.open_rows()) == [t for t in tasks if not t.is_completed]
+        assert table.select(table.rows_with_status(TaskStatus.OVERDUE)) == [
+            t for t in tasks if not t.is_completed and t.status == TaskStatus.OVERDUE
+        ]
+    
+    def test_overdue_and_due_within(self, backend, tasks):
+        """Test date filters relative to a given day."""
+        table = TaskTable(tasks)
+        overdue = table.select(table.overdue_rows(TODAY))
+        assert overdue == [t for t in tasks if not t.is_completed and t.deadline and t.deadline < TODAY]
+        
+        due = table.select(table.due_within_rows(3, TODAY))
+        assert due == [
+            t for t in tasks
+            if not t.is_completed and t.deadline and TODAY <= t.deadline <= TODAY + timedelta(days=3)
+        ]
+    
+    def test_completed_between(self, backend, tasks):
+        """Test completion date range filter."""
+        table = TaskTable(tasks)
+        start, end = TODAY - timedelta(days=7), TODAY
+        assert table.select(table.completed_between_rows(start, end)) == [
+            t for t in tasks if t.ngay_hoan_thanh and start <= t.ngay_hoan_thanh <= end
+        ]
+    
+    def test_count_by_person_keeps_first_seen_order(self, backend, tasks):
+        """Test per-person counts match group_tasks_by_person, order included."""
+        table = TaskTable(tasks)
+        rows = table.open_rows()
+        expected = {name: len(ts) for name, ts in group_tasks_by_person(table.select(rows)).items()}
+        counts = table.count_by_person(rows)
+        assert list(counts.items()) == list(expected.items())
+        assert table.count_by_person([]) == {}
+    
+    def test_weekly_report_same_on_both_backends(self, tasks, monkeypatch):
+        """Test the weekly report does not depend on the backend."""
+        monkeypatch.setattr('app.reporting.get_current_date', lambda: TODAY)
+        with_default = build_weekly_report(tasks)
+        monkeypatch.setattr(app.models, 'np', None)
+        assert build_weekly_report(tasks) == with_default
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
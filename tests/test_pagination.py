@@ -0,0 +1,109 @@
+"""
+Unit tests for Telegram-sized report pagination.
+"""
+
+import pytest
+from app.pagination import (
+    TELEGRAM_MESSAGE_LIMIT, ReportPageCache, message_length, split_report
+)
+
+
+def make_report(people: int) -> str:
+    """Weekly-style report with one blank-line separated section per person."""
+    sections = ["=" * 50 + "\n📊 BÁO CÁO TUẦN\n" + "=" * 50]
+    for i in range(people):
+        sections.append(
+            f"👤 Người số {i}\n"
+            f"   • Tổng chưa hoàn thành: {i}\n"
+            f"   • Trễ hạn: {i % 3}\n"
+            f"   • Sắp tới hạn (1-3 ngày): {i % 5}"
+        )
+    return "\n\n".join(sections)
+
+
+def strip_footer(page: str) -> str:
+    return page.rsplit("\n\n📄 Trang ", 1)[0]
+
+
+class TestSplitReport:
+    """Test splitting at section boundaries within Telegram's limit."""
+
+    def test_short_report_unchanged(self):
+        """Test a report under the limit is one page without footer."""
+        text = make_report(3)
+
+        assert split_report(text) == [text]
+
+    def test_long_report_split_at_sections(self):
+        """Test every page fits and no section is cut in half."""
+        text = make_report(200)
+
+        pages = split_report(text)
+
+        assert len(pages) > 1
+        assert all(message_length(page) <= TELEGRAM_MESSAGE_LIMIT for page in pages)
+        assert "\n\n".join(strip_footer(page) for page in pages) == text
+        assert pages[0].endswith(f"📄 Trang 1/{len(pages)}")
+        assert all(page.startswith("👤") for page in pages[1:])
+
+    def test_emoji_counted_as_two_units(self):
+        """Test the limit is measured in UTF-16 code units like Telegram."""
+        assert message_length("📊") == 2
+        text = "\n\n".join(["📊" * 300] * 10)  # 3000 code points, 6018 units
+
+        pages = split_report(text)
+
+        assert len(pages) == 2
+        assert all(message_length(page) <= TELEGRAM_MESSAGE_LIMIT for page in pages)
+
+    def test_oversized_section_split_at_lines(self):
+        """Test one huge section falls back to line and character cuts."""
+        lines = [f"{i}. " + "x" * 100 for i in range(100)] + ["y" * 9000]
+        text = "\n".join(lines)
+
+        pages = split_report(text)
+
+        assert all(message_length(page) <= TELEGRAM_MESSAGE_LIMIT for page in pages)
+        assert "".join(strip_footer(page).replace("\n", "") for page in pages) == text.replace("\n", "")
+
+
+class TestReportPageCache:
+    """Test token-keyed page storage."""
+
+    def test_single_page_not_stored(self):
+        """Test short reports need no token."""
+        cache = ReportPageCache()
+
+        token, pages = cache.paginate("Ngắn")
+
+        assert token is None
+        assert pages == ["Ngắn"]
+        assert cache.get_stats()['size'] == 0
+
+    def test_pages_served_by_token(self):
+        """Test the same report is split once and found by its token."""
+        cache = ReportPageCache()
+        text = make_report(200)
+
+        token, pages = cache.paginate(text)
+        again_token, again = cache.paginate(text)
+
+        assert again_token == token
+        assert again is pages
+        assert cache.get(token) is pages
+        assert cache.get("deadbeef") is None
+        assert cache.get_stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+    def test_oldest_reports_dropped(self, monkeypatch):
+        """Test the cache keeps at most MAX_REPORTS reports."""
+        monkeypatch.setattr(ReportPageCache, 'MAX_REPORTS', 2)
+        cache = ReportPageCache()
+
+        tokens = [cache.paginate(make_report(200 + i))[0] for i in range(3)]
+
+        assert cache.get(tokens[0]) is None
+        assert cache.get(tokens[2]) is not None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
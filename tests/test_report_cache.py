@@ -0,0 +1,117 @@
+"""
+Unit tests for the rendered report cache.
+"""
+
+import pytest
+from datetime import date
+from unittest.mock import patch
+from app.config import config
+from app.datasource import generate_synthetic_rows
+from app.report_cache import RenderedReportCache, render_report
+from app.reporting import build_weekly_report
+from app.task_cache import ParsedTasksCache
+
+
+TODAY = date(2024, 12, 25)
+
+
+@pytest.fixture(autouse=True)
+def fixed_today():
+    with patch('app.reporting.get_current_date', return_value=TODAY), \
+            patch('app.report_cache.get_current_date', return_value=TODAY):
+        yield
+
+
+def make_snapshot(seed=1, today=TODAY):
+    return ParsedTasksCache().get(generate_synthetic_rows(200, seed=seed, today=today), today=today)
+
+
+class TestRenderedReportCache:
+    """Test report text reuse and invalidation."""
+
+    def test_repeated_report_rendered_once(self):
+        """Test five presses of the same button build the report once."""
+        snapshot = make_snapshot()
+        cache = RenderedReportCache()
+
+        texts = [cache.get('weekly', snapshot) for _ in range(5)]
+
+        assert texts[0] == build_weekly_report(snapshot.tasks, snapshot.index)
+        assert all(text is texts[0] for text in texts)
+        assert cache.get_stats() == {'hits': 4, 'misses': 1, 'invalidations': 0, 'size': 1}
+
+    def test_report_types_cached_separately(self):
+        """Test each report type has its own entry."""
+        snapshot = make_snapshot()
+        cache = RenderedReportCache()
+
+        assert cache.get('today', snapshot) != cache.get('due_soon', snapshot)
+        assert cache.get_stats()['size'] == 2
+
+    def test_new_data_invalidates(self):
+        """Test a different snapshot drops reports of the old one."""
+        cache = RenderedReportCache()
+        first = cache.get('weekly', make_snapshot(seed=1))
+
+        second = cache.get('weekly', make_snapshot(seed=2))
+
+        assert second != first
+        assert cache.get_stats() == {'hits': 0, 'misses': 2, 'invalidations': 1, 'size': 1}
+
+    def test_new_day_invalidates(self):
+        """Test the same data on another day is rendered again."""
+        snapshot = make_snapshot()
+        cache = RenderedReportCache()
+        cache.get('today', snapshot)
+
+        cache.get('today', snapshot, today=date(2024, 12, 26))
+
+        assert cache.get_stats()['misses'] == 2
+        assert cache.get_stats()['invalidations'] == 1
+
+    def test_display_settings_in_key(self, monkeypatch):
+        """Test changing MAX_DISPLAY_ITEMS re-renders the daily report."""
+        snapshot = make_snapshot()
+        cache = RenderedReportCache()
+        before = cache.get('daily', snapshot)
+
+        monkeypatch.setattr(config, 'MAX_DISPLAY_ITEMS', 2)
+        after = cache.get('daily', snapshot)
+
+        assert after != before
+        assert cache.get_stats()['misses'] == 2
+
+    def test_lru_eviction_and_disabled(self):
+        """Test the size limit evicts the least recently used report."""
+        snapshot = make_snapshot()
+        cache = RenderedReportCache(max_entries=2)
+        cache.get('today', snapshot)
+        cache.get('overdue', snapshot)
+        cache.get('today', snapshot)
+        cache.get('due_soon', snapshot)  # Evicts 'overdue'
+
+        cache.get('today', snapshot)
+        cache.get('overdue', snapshot)
+
+        assert cache.get_stats()['hits'] == 2
+        assert cache.get_stats()['misses'] == 4
+
+        disabled = RenderedReportCache(max_entries=0)
+        disabled.get('today', snapshot)
+        disabled.get('today', snapshot)
+        assert disabled.get_stats()['misses'] == 2
+
+    @pytest.mark.asyncio
+    async def test_render_report_shares_bot_cache(self):
+        """Test handlers share one cache through bot_data."""
+        snapshot = make_snapshot()
+        bot_data = {'history': None}
+
+        await render_report(bot_data, snapshot, 'overdue')
+        await render_report(bot_data, snapshot, 'overdue')
+
+        assert bot_data['report_cache'].get_stats()['hits'] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,10 +2,19 @@
 Unit tests for rules module (deadline parsing and task classification).
 """
 
+import sys
 import pytest
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+import pytz
+import app.rules
 from app.models import Task, TaskStatus
-from app.rules import parse_deadline, classify_task, parse_sheet_row
+from app.datasource import generate_synthetic_rows
+from app.rules import (
+    parse_deadline, classify_task, classify_tasks, parse_sheet_row, parse_all_tasks,
+    _parse_deadline_cached, _auto_parse_workers, LocalDayClock, IncrementalTaskParser,
+    shutdown_parse_pool
+)
 
 
 class TestParseDeadline:
@@ -45,6 +54,35 @@ class TestParseDeadline:
     def test_parse_whitespace(self):
         """Test parsing with whitespace."""
         assert parse_deadline("  25/12/2024  ") == date(2024, 12, 25)
+    
+    def test_repeated_strings_are_memoized(self):
+        """Test the same date string is parsed only once."""
+        _parse_deadline_cached.cache_clear()
+        for _ in range(5):
+            assert parse_deadline("15/06/2024") == date(2024, 6, 15)
+        info = _parse_deadline_cached.cache_info()
+        assert info.misses == 1
+        assert info.hits == 4
+    
+    def test_serial_edge_values(self):
+        """Test numeric strings outside the serial range are rejected."""
+        assert parse_deadline("0") is None
+        assert parse_deadline("-5") is None
+        assert parse_deadline("100001") is None
+        assert parse_deadline("1") == date(1899, 12, 31)
+    
+    def test_unparseable_cells_logged_once(self, caplog):
+        """Test many bad date cells produce a single warning line."""
+        header = ['STT', 'Họ tên', 'Nội dung', 'Mức độ', 'Deadline', 'Kết quả', 'Ngày HT', 'Ghi chú']
+        rows = [header] + [
+            [str(i), 'A', f'Việc {i}', '', 'sắp tới', '', '', ''] for i in range(50)
+        ]
+        with caplog.at_level('WARNING', logger='app.rules'):
+            tasks = parse_all_tasks(rows)
+        assert len(tasks) == 50
+        warnings = [r for r in caplog.records if r.levelname == 'WARNING']
+        assert len(warnings) == 1
+        assert "50 date cells" in warnings[0].getMessage()
 
 
 class TestClassifyTask:
@@ -204,5 +242,127 @@ class TestParseSheetRow:
         assert task3.is_completed is True
 
 
+
+class TestLocalDayClock:
+    """Test the cached local date."""
+    
+    def local_ts(self, *args) -> float:
+        tz = pytz.timezone('Asia/Ho_Chi_Minh')
+        return tz.localize(datetime(*args)).timestamp()
+    
+    def test_rolls_over_at_local_midnight(self, monkeypatch):
+        """Test the date changes exactly at midnight in Config.TZ."""
+        monkeypatch.setattr('app.rules.config.TZ', 'Asia/Ho_Chi_Minh')
+        clock = LocalDayClock()
+        
+        assert clock.today(self.local_ts(2024, 12, 25, 6, 0)) == date(2024, 12, 25)
+        assert clock.today(self.local_ts(2024, 12, 25, 23, 59, 59)) == date(2024, 12, 25)
+        assert clock.today(self.local_ts(2024, 12, 26, 0, 0)) == date(2024, 12, 26)
+    
+    def test_timezone_created_once(self, monkeypatch):
+        """Test lookups between midnights reuse the cached timezone and date."""
+        monkeypatch.setattr('app.rules.config.TZ', 'Asia/Ho_Chi_Minh')
+        clock = LocalDayClock()
+        
+        timestamps = [self.local_ts(2024, 12, 25, hour, 0) for hour in range(10)]
+        
+        with patch('app.rules.pytz.timezone', wraps=pytz.timezone) as timezone:
+            for ts in timestamps:
+                clock.today(ts)
+        
+        assert timezone.call_count == 1
+    
+    def test_timezone_change_is_picked_up(self, monkeypatch):
+        """Test changing Config.TZ drops the cached date."""
+        ts = self.local_ts(2024, 12, 25, 3, 0)  # 2024-12-24 20:00 UTC
+        clock = LocalDayClock()
+        
+        monkeypatch.setattr('app.rules.config.TZ', 'Asia/Ho_Chi_Minh')
+        assert clock.today(ts) == date(2024, 12, 25)
+        monkeypatch.setattr('app.rules.config.TZ', 'UTC')
+        assert clock.today(ts) == date(2024, 12, 24)
+
+
+class TestClassifyTasks:
+    """Test re-classifying parsed tasks for another day."""
+    
+    def test_reclassify_without_reparsing(self):
+        """Test the same tasks get statuses for the new day."""
+        rows = [
+            ["STT", "Họ tên", "Nội dung", "Mức độ", "Deadline"],
+            ["1", "An", "Việc 1", "", "26/12/2024"],
+            ["2", "Bình", "Việc 2", "", "29/12/2024"],
+        ]
+        with patch('app.rules.get_current_date', return_value=date(2024, 12, 25)):
+            tasks = parse_all_tasks(rows)
+        assert [t.status for t in tasks] == [TaskStatus.DUE_TOMORROW, TaskStatus.ON_TRACK]
+        
+        classify_tasks(tasks, date(2024, 12, 27))
+        
+        assert [t.status for t in tasks] == [TaskStatus.OVERDUE, TaskStatus.DUE_2_3_DAYS]
+        assert tasks[0].days_overdue == 1
+
+
+
+class TestParallelParse:
+    """Test the process-pool parse path."""
+    
+    def test_parallel_matches_serial(self):
+        """Test chunked parallel parsing returns the same tasks in order."""
+        rows = generate_synthetic_rows(3000, seed=9)
+        rows.insert(5, ["", "", "", "", ""])  # Skipped row inside a chunk
+        
+        serial = parse_all_tasks(rows, workers=1)
+        parallel = parse_all_tasks(rows, workers=2)
+        
+        assert parallel == serial
+        assert parallel[0].ho_ten is sys.intern(parallel[0].ho_ten)
+    
+    def test_pool_failure_falls_back_to_serial(self):
+        """Test parsing still works when processes cannot be started."""
+        rows = generate_synthetic_rows(50, seed=9)
+        shutdown_parse_pool()
+        
+        with patch('app.rules.ProcessPoolExecutor', side_effect=OSError("no processes")):
+            tasks = parse_all_tasks(rows, workers=4)
+        
+        assert tasks == parse_all_tasks(rows, workers=1)
+    
+    def test_pool_is_reused(self):
+        """Test consecutive parallel parses share one process pool."""
+        rows = generate_synthetic_rows(200, seed=9)
+        
+        parse_all_tasks(rows, workers=2)
+        pool = app.rules._parse_pool
+        parse_all_tasks(rows, workers=2)
+        
+        assert pool is not None
+        assert app.rules._parse_pool is pool
+        shutdown_parse_pool()
+        assert app.rules._parse_pool is None
+    
+    def test_auto_threshold(self, monkeypatch):
+        """Test the pool is used only above the configured row count."""
+        monkeypatch.setattr('app.rules.config.PARSE_PARALLEL_THRESHOLD', 1000)
+        monkeypatch.setattr('app.rules.config.PARSE_WORKERS', 3)
+        assert _auto_parse_workers(999) == 1
+        assert _auto_parse_workers(1000) == 3
+        
+        monkeypatch.setattr('app.rules.config.PARSE_PARALLEL_THRESHOLD', 0)
+        assert _auto_parse_workers(10 ** 6) == 1
+    
+    def test_incremental_parser_uses_same_path(self, monkeypatch):
+        """Test a first incremental parse above the threshold matches parse_all_tasks."""
+        monkeypatch.setattr('app.rules.config.PARSE_PARALLEL_THRESHOLD', 100)
+        monkeypatch.setattr('app.rules.config.PARSE_WORKERS', 2)
+        rows = generate_synthetic_rows(400, seed=10)
+        today = date(2024, 12, 25)
+        
+        with patch('app.rules.get_current_date', return_value=today):
+            expected = parse_all_tasks(rows, workers=1)
+        
+        assert IncrementalTaskParser().parse(rows, today) == expected
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,127 @@
+"""
+Unit tests for scheduled reports and their pre-warm stage.
+"""
+
+import pytest
+from datetime import time, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from app.config import config
+from app.datasource import InMemoryDataSource, generate_synthetic_rows
+from app.history import HistoryStore
+from app.rules import get_current_date
+from app.scheduler import (
+    prewarm_report, prewarm_schedule, send_daily_report, send_prepared_report
+)
+from app.word_generator import WordReportGenerator
+
+
+class FailingDataSource(InMemoryDataSource):
+    """Data source whose fetches fail, like Google being down."""
+
+    async def fetch_data_async(self, force_refresh: bool = False):
+        self.fetch_count += 1
+        raise ConnectionError("Google Sheets unavailable")
+
+
+def make_context(data_source, report_type='daily'):
+    return SimpleNamespace(
+        bot=AsyncMock(),
+        bot_data={'sheets_client': data_source, 'history': None},
+        job=SimpleNamespace(data=report_type)
+    )
+
+
+class TestPrewarmedReports:
+    """Test the send job uses the pre-warmed report or builds it live."""
+
+    @pytest.mark.asyncio
+    async def test_send_uses_prewarmed_report(self):
+        """Test the send job does not fetch again after a pre-warm."""
+        data_source = InMemoryDataSource(generate_synthetic_rows(100))
+        context = make_context(data_source)
+
+        await prewarm_report(context)
+        assert data_source.fetch_count == 1
+
+        await send_daily_report(context)
+
+        assert data_source.fetch_count == 1
+        context.bot.send_message.assert_awaited_once()
+        assert "BÁO CÁO TIẾN ĐỘ" in context.bot.send_message.call_args.kwargs['text']
+        assert context.bot_data['prepared_reports'] == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_prewarm_falls_back_to_live_build(self):
+        """Test a failed pre-warm leaves the send job to build the report."""
+        context = make_context(FailingDataSource([]))
+        await prewarm_report(context)
+        assert 'daily' not in context.bot_data.get('prepared_reports', {})
+
+        context.bot_data['sheets_client'] = InMemoryDataSource(generate_synthetic_rows(50))
+        await send_daily_report(context)
+
+        context.bot.send_message.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_prewarm_of_another_day_is_rebuilt(self):
+        """Test a report prepared for an earlier date is not sent."""
+        data_source = InMemoryDataSource(generate_synthetic_rows(50))
+        context = make_context(data_source)
+        await prewarm_report(context)
+        prepared = context.bot_data['prepared_reports']['daily']
+        prepared.report_date -= timedelta(days=1)
+        prepared.pages = ["cũ"]
+
+        await send_prepared_report(context, 'daily')
+
+        assert data_source.fetch_count == 2
+        assert context.bot.send_message.call_args.kwargs['text'] != "cũ"
+
+    @pytest.mark.asyncio
+    async def test_prewarm_renders_docx(self, tmp_path, monkeypatch):
+        """Test the Word file is prepared ahead and sent with the text."""
+        monkeypatch.setattr(config, 'SCHEDULED_REPORT_DOCX', True)
+        context = make_context(InMemoryDataSource(generate_synthetic_rows(30)), 'weekly')
+        context.bot_data['word_generator'] = WordReportGenerator(output_dir=str(tmp_path))
+
+        await prewarm_report(context)
+        prepared = context.bot_data['prepared_reports']['weekly']
+        assert prepared.docx_path.exists()
+
+        await send_prepared_report(context, 'weekly')
+
+        context.bot.send_document.assert_awaited_once()
+        assert context.bot.send_document.call_args.kwargs['filename'] == prepared.docx_path.name
+
+
+    @pytest.mark.asyncio
+    async def test_daily_job_records_history(self, tmp_path):
+        """Test the day's aggregates are stored once the daily report is sent."""
+        context = make_context(InMemoryDataSource(generate_synthetic_rows(80)))
+        store = context.bot_data['history'] = HistoryStore(str(tmp_path / "history.sqlite3"))
+
+        await prewarm_report(context)
+        assert store.last_day is None
+
+        await send_daily_report(context)
+
+        entry = store.get(get_current_date())
+        assert entry is not None
+        assert entry.open + entry.completed == 80
+
+
+class TestPrewarmSchedule:
+    """Test pre-warm times derived from the send times."""
+
+    def test_minutes_before_same_day(self):
+        """Test a pre-warm on the same day keeps the weekdays."""
+        assert prewarm_schedule(time(6, 0), (4,), 5) == (time(5, 55), (4,))
+
+    def test_crossing_midnight_moves_weekday_back(self):
+        """Test a pre-warm before midnight runs on the previous weekday."""
+        assert prewarm_schedule(time(0, 2), (0, 4), 5) == (time(23, 57), (3, 6))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,162 @@
+"""
+Unit tests for diacritic-insensitive task search.
+"""
+
+import pytest
+import app.search
+from app.datasource import generate_synthetic_rows
+from app.models import Task, TaskStatus
+from app.reporting import build_search_page
+from app.rules import normalize_text, parse_all_tasks, search_tasks
+from app.search import SearchResults, TaskSearchIndex, tokenize
+
+
+def make_task(ho_ten: str, noi_dung: str, status: TaskStatus = TaskStatus.NO_DEADLINE) -> Task:
+    return Task(
+        stt="1", ho_ten=ho_ten, noi_dung=noi_dung, muc_do="",
+        deadline=None, deadline_raw="", ket_qua="", ngay_hoan_thanh=None,
+        ngay_hoan_thanh_raw="", ghi_chu="", status=status
+    )
+
+
+TASKS = [
+    make_task("Nguyễn Văn An", "Hoàn thành báo cáo tháng"),
+    make_task("Trần Thị Bình", "Soạn thảo công văn"),
+    make_task("Đặng Quốc Huy", "Tổng hợp báo cáo quý"),
+    make_task("Lê Hoàng Cường", "Họp giao ban"),
+]
+
+
+@pytest.fixture(params=['numpy', 'plain'])
+def backend(request, monkeypatch):
+    """Run each test with NumPy (if installed) and with plain sets."""
+    if request.param == 'numpy':
+        if app.search.np is None:
+            pytest.skip("numpy not installed")
+    else:
+        monkeypatch.setattr(app.search, 'np', None)
+    return request.param
+
+
+class TestNormalizeText:
+    """Test diacritic stripping."""
+
+    def test_strips_vietnamese_marks(self):
+        """Test tone and vowel marks are removed and case folded."""
+        assert normalize_text("HOÀN THÀNH") == "hoan thanh"
+        assert normalize_text("Nguyễn Ưu Đức") == "nguyen uu duc"
+        assert tokenize("Báo cáo #12, quý IV") == ["bao", "cao", "12", "quy", "iv"]
+
+    def test_linear_search_ignores_diacritics(self):
+        """Test search_tasks matches text typed without diacritics."""
+        assert search_tasks(TASKS, "hoan thanh") == [TASKS[0]]
+        assert search_tasks(TASKS, "bao cao") == [TASKS[0], TASKS[2]]
+
+
+class TestTaskSearchIndex:
+    """Test index queries."""
+
+    def test_diacritic_insensitive(self, backend):
+        """Test queries with or without diacritics match the same tasks."""
+        index = TaskSearchIndex(TASKS)
+        assert index.search("hoan thanh") == [TASKS[0]]
+        assert index.search("Hoàn Thành") == [TASKS[0]]
+        assert index.search("dang") == [TASKS[2]]
+
+    def test_prefix_and_multi_term(self, backend):
+        """Test terms are word prefixes combined with AND, over name and content."""
+        index = TaskSearchIndex(TASKS)
+        assert index.search("bao") == [TASKS[0], TASKS[2]]
+        assert index.search("hoa") == [TASKS[0], TASKS[3]]  # hoàn / Hoàng
+        assert index.search("bao cao quy") == [TASKS[2]]
+        assert index.search("an bao") == [TASKS[0]]  # name + content
+        assert index.search("bao giao") == []
+
+    def test_no_match_and_empty_query(self, backend):
+        """Test unknown terms and blank queries return nothing."""
+        index = TaskSearchIndex(TASKS)
+        assert index.search("xyz") == []
+        assert index.search("   ") == []
+        assert index.search("!!!") == []
+
+    def test_matches_linear_scan(self, backend):
+        """Test single whole-word queries agree with search_tasks."""
+        tasks = parse_all_tasks(generate_synthetic_rows(300, seed=1))
+        index = TaskSearchIndex(tasks)
+        for query in ["Nguyễn", "bien ban", "lan", "123"]:
+            expected = [t for t in tasks if set(tokenize(query)) <= set(tokenize(t.ho_ten + " " + t.noi_dung))]
+            assert index.search(query) == expected
+
+    def test_repeated_query_is_cached(self, backend):
+        """Test the same terms in another order reuse the cached result."""
+        index = TaskSearchIndex(TASKS)
+        first = index.search_positions("bao cao")
+        assert index.search_positions("cao  BÁO") is first
+
+
+
+class TestRankedSearch:
+    """Test relevance ranking and cursors."""
+
+    def test_exact_word_beats_prefix(self):
+        """Test a whole-word match ranks above a prefix-only match."""
+        tasks = [make_task("A", "Báo cáo #123"), make_task("B", "Báo cáo #12")]
+        results = TaskSearchIndex(tasks).rank("12")
+        assert results.tasks == [tasks[1], tasks[0]]
+
+    def test_name_and_overdue_boosts(self):
+        """Test name matches and overdue tasks are ranked first."""
+        tasks = [
+            make_task("Trần Bình", "Gửi công văn cho An"),
+            make_task("Lê An", "Gửi công văn"),
+            make_task("Phạm Cường", "Gửi công văn"),
+            make_task("Vũ Hà", "Gửi công văn", status=TaskStatus.OVERDUE),
+        ]
+        index = TaskSearchIndex(tasks)
+        assert index.rank("an").tasks[0] is tasks[1]
+        assert index.rank("cong van").tasks[0] is tasks[3]
+
+    def test_heap_matches_full_sort(self):
+        """Test top-k picks the same tasks as sorting every score."""
+        tasks = parse_all_tasks(generate_synthetic_rows(500, seed=2))
+        index = TaskSearchIndex(tasks)
+        terms = ("bao", "cao")
+        positions = index.search_positions("bao cao")
+        scores = index._bm25_scores(terms, positions)
+        expected = sorted(positions, key=lambda i: (-scores[i], i))[:index.RANKED_LIMIT]
+
+        results = index.rank("bao cao")
+
+        assert results.total == len(positions)
+        assert results.tasks == [tasks[i] for i in expected]
+
+    def test_results_cached_per_query(self):
+        """Test asking again (any term order) does not re-run the query."""
+        index = TaskSearchIndex(TASKS)
+        assert index.rank("bao cao") is index.rank("Cáo báo")
+
+    def test_cursors(self):
+        """Test page slicing and next/previous cursors."""
+        results = SearchResults(query="x", tasks=list(range(40)), total=100, page_size=15)
+        assert results.page(0) == list(range(15))
+        assert results.next_cursor(0) == 15
+        assert results.next_cursor(30) is None
+        assert results.page(30) == list(range(30, 40))
+        assert results.prev_cursor(0) is None
+        assert results.prev_cursor(15) == 0
+
+    def test_build_search_page(self):
+        """Test rendered pages are numbered continuously."""
+        tasks = parse_all_tasks(generate_synthetic_rows(200, seed=4))
+        results = TaskSearchIndex(tasks).rank("bao cao")
+
+        second = build_search_page(results, 15)
+
+        assert f"Tìm thấy: {results.total} việc" in second
+        assert "Trang 2/" in second
+        assert "\n16. " in second and "\n1. " not in second
+        assert build_search_page(TaskSearchIndex(tasks).rank("xyz")).startswith("🔍 Không tìm thấy")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,799 @@
+"""
+Unit tests for the Google Sheets client (offline, using a fake gspread client).
+"""
+
+import asyncio
+import re
+import time
+from datetime import datetime, timedelta
+import gspread
+import pytest
+import requests
+from app.freshness import FakeFreshnessProbe
+from app.config import config
+from app.models import SOURCE_TAB_HEADER
+from app.rules import parse_all_tasks
+from app.sheets import GoogleSheetsClient, SheetsCache, parse_column_range
+from app.snapshot import SnapshotStore, compute_content_hash
+
+
+SAMPLE_ROWS = [
+    ["STT", "Họ tên", "Nội dung", "Mức độ", "Deadline", "Kết quả", "Ngày hoàn thành", "Ghi chú"],
+    ["1", "Alice", "Task A", "Cao", "25/12/2024", "Đang làm", "", ""],
+]
+
+
+class FakeWorksheet:
+    """Worksheet stand-in whose download blocks like a real HTTP call."""
+
+    def __init__(self, rows, delay=0.0, row_count=None):
+        self.rows = rows
+        self.delay = delay
+        self.row_count = row_count or len(rows)
+        self.calls = 0
+        self.ranges = []
+
+    def _download(self):
+        self.calls += 1
+        time.sleep(self.delay)
+
+    def get_all_values(self):
+        self._download()
+        return [list(row) for row in self.rows]
+
+    def get(self, range_name):
+        """Return values like the Sheets API: trailing blanks trimmed."""
+        self._download()
+        self.ranges.append(range_name)
+        first, start, last, end = re.match(r'([A-Z]+)(\d*):([A-Z]+)(\d*)', range_name).groups()
+        col_from = ord(first) - ord('A')
+        col_to = ord(last) - ord('A') + 1
+        row_from = int(start) - 1 if start else 0
+        row_to = int(end) if end else len(self.rows)
+
+        values = []
+        for row in self.rows[row_from:row_to]:
+            cells = list(row[col_from:col_to])
+            while cells and cells[-1] == '':
+                cells.pop()
+            values.append(cells)
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+
+class FailingWorksheet(FakeWorksheet):
+    """Worksheet whose download fails after a delay."""
+
+    def _download(self):
+        super()._download()
+        raise ConnectionError("Google unreachable")
+
+
+class FakeSpreadsheet:
+    def __init__(self, worksheet=None, tabs=None):
+        self._worksheet = worksheet
+        self.tabs = tabs or {}
+        self.batch_calls = []
+
+        self.worksheet_calls = 0
+
+    def worksheet(self, title):
+        self.worksheet_calls += 1
+        return self._worksheet
+
+    def worksheets(self):
+        return [_Handle(title, ws.row_count) for title, ws in self.tabs.items()]
+
+    def values_batch_get(self, ranges):
+        self.batch_calls.append(ranges)
+        value_ranges = []
+        for full_range in ranges:
+            title, cells = re.match(r"'(.*)'!(.*)", full_range).groups()
+            value_ranges.append({'range': full_range, 'values': self.tabs[title].get(cells)})
+        return {'valueRanges': value_ranges}
+
+
+class _Handle:
+    """Worksheet metadata as returned by Spreadsheet.worksheets()."""
+
+    def __init__(self, title, row_count):
+        self.title = title
+        self.row_count = row_count
+
+
+class FakeClient:
+    def __init__(self, worksheet=None, tabs=None):
+        self._spreadsheet = FakeSpreadsheet(worksheet, tabs)
+        self.open_calls = 0
+
+    def open_by_key(self, key):
+        self.open_calls += 1
+        return self._spreadsheet
+
+
+def make_client(rows=SAMPLE_ROWS, delay=0.0, probe=None):
+    """Build a GoogleSheetsClient backed by fake gspread objects."""
+    worksheet = FakeWorksheet(rows, delay)
+    client = GoogleSheetsClient(
+        client=FakeClient(worksheet),
+        probe=probe or FakeFreshnessProbe()
+    )
+    return client, worksheet
+
+
+class TestFetchDataAsync:
+    """Test the non-blocking fetch path."""
+
+    @pytest.mark.asyncio
+    async def test_returns_rows_and_fills_cache(self):
+        """Test async fetch returns sheet rows and caches them."""
+        client, worksheet = make_client()
+
+        data = await client.fetch_data_async()
+
+        assert data == SAMPLE_ROWS
+        assert client.get_cache_status()['is_valid'] is True
+
+        # Second call is served from cache
+        await client.fetch_data_async()
+        assert worksheet.calls == 1
+        client.close()
+
+    @pytest.mark.asyncio
+    async def test_force_refresh_bypasses_cache(self):
+        """Test force_refresh always downloads again."""
+        client, worksheet = make_client()
+
+        await client.fetch_data_async()
+        await client.fetch_data_async(force_refresh=True)
+
+        assert worksheet.calls == 2
+        client.close()
+
+    @pytest.mark.asyncio
+    async def test_slow_fetch_does_not_block_event_loop(self):
+        """Test other updates keep being served while a cold fetch runs."""
+        client, _ = make_client(delay=0.5)
+        served = []
+
+        async def other_update(i):
+            # A handler that does not need the sheet (e.g. /ping)
+            await asyncio.sleep(0.01)
+            served.append((i, time.monotonic()))
+
+        start = time.monotonic()
+        fetch = asyncio.create_task(client.fetch_data_async())
+        await asyncio.sleep(0)  # Let the fetch start
+        await asyncio.gather(*(other_update(i) for i in range(20)))
+
+        # All other updates were answered long before the fetch finished
+        assert len(served) == 20
+        assert max(t for _, t in served) - start < 0.3
+        assert not fetch.done()
+
+        assert await fetch == SAMPLE_ROWS
+        client.close()
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent cache misses."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_download(self):
+        """Test a burst of cache misses triggers exactly one download."""
+        client, worksheet = make_client(delay=0.2)
+
+        results = await asyncio.gather(*(client.fetch_data_async() for _ in range(10)))
+
+        assert worksheet.calls == 1
+        assert all(result == SAMPLE_ROWS for result in results)
+        status = client.get_cache_status()
+        assert status['fetches'] == 1
+        assert status['coalesced'] == 9
+        client.close()
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_waiters(self):
+        """Test a failed download is reported to every coalesced caller."""
+        worksheet = FailingWorksheet(SAMPLE_ROWS, delay=0.1)
+        client = GoogleSheetsClient(client=FakeClient(worksheet), probe=FakeFreshnessProbe())
+
+        results = await asyncio.gather(
+            *(client.fetch_data_async() for _ in range(3)),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, ConnectionError) for r in results)
+        assert client.get_cache_status()['coalesced'] == 2
+        client.close()
+
+    @pytest.mark.asyncio
+    async def test_force_refresh_does_not_join_running_fetch(self):
+        """Test a forced refresh starts its own download."""
+        client, worksheet = make_client(delay=0.1)
+
+        await asyncio.gather(
+            client.fetch_data_async(),
+            client.fetch_data_async(force_refresh=True)
+        )
+
+        assert worksheet.calls == 2
+        client.close()
+
+
+class FakeJobQueue:
+    """Records run_once() calls instead of scheduling them."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def run_once(self, callback, when, name=None, job_kwargs=None):
+        self.jobs.append((callback, when, name))
+        self.job_kwargs = job_kwargs
+
+
+class BrokenJobQueue:
+    """Fails to schedule anything, like a JobQueue that was shut down."""
+
+    def run_once(self, callback, when, name=None, job_kwargs=None):
+        raise RuntimeError("scheduler is shut down")
+
+
+class TestStaleWhileRevalidate:
+    """Test serving expired data while refreshing in the background."""
+
+    def expire(self, client, age_seconds=400):
+        """Age the cached snapshot past CACHE_DURATION."""
+        client.cache.last_fetch = datetime.now() - timedelta(seconds=age_seconds)
+
+    def test_get_stale_respects_max_staleness(self):
+        """Test stale data is only returned within the hard bound."""
+        cache = SheetsCache(duration_seconds=300, max_staleness_seconds=3600)
+        cache.set(SAMPLE_ROWS)
+
+        cache.last_fetch = datetime.now() - timedelta(seconds=600)
+        assert cache.get() is None
+        assert cache.get_stale() == SAMPLE_ROWS
+
+        cache.last_fetch = datetime.now() - timedelta(seconds=4000)
+        assert cache.get_stale() is None
+
+    @pytest.mark.asyncio
+    async def test_expired_cache_served_immediately(self):
+        """Test an expired snapshot is returned without waiting for Google."""
+        client, worksheet = make_client(delay=0.3)
+        await client.fetch_data_async()
+        self.expire(client)
+
+        start = time.monotonic()
+        data = await client.fetch_data_async()
+
+        assert data == SAMPLE_ROWS
+        assert time.monotonic() - start < 0.1
+        assert client.get_cache_status()['stale_served'] == 1
+
+        # The background refresh downloads once and renews the cache
+        await asyncio.sleep(0.5)
+        assert worksheet.calls == 2
+        assert client.get_cache_status()['is_valid'] is True
+        client.close()
+
+    @pytest.mark.asyncio
+    async def test_refresh_goes_through_job_queue(self):
+        """Test the background refresh is scheduled once on the job queue."""
+        client, worksheet = make_client()
+        job_queue = FakeJobQueue()
+        client.set_job_queue(job_queue)
+        await client.fetch_data_async()
+        self.expire(client)
+
+        await client.fetch_data_async()
+        await client.fetch_data_async()
+
+        assert len(job_queue.jobs) == 1
+        callback, when, _ = job_queue.jobs[0]
+        assert when == 0
+        assert job_queue.job_kwargs == {'misfire_grace_time': None}
+
+        await callback(None)
+        assert worksheet.calls == 2
+        client.close()
+
+    @pytest.mark.asyncio
+    async def test_refresh_that_never_runs_is_rescheduled(self):
+        """Test a dropped refresh job does not block later refreshes forever."""
+        client, worksheet = make_client()
+        job_queue = FakeJobQueue()
+        client.set_job_queue(job_queue)
+        await client.fetch_data_async()
+        self.expire(client)
+
+        await client.fetch_data_async()
+        assert len(job_queue.jobs) == 1
+
+        # The job never runs; once the start timeout has passed it is scheduled again
+        client._refresh_scheduled_at -= client.REFRESH_START_TIMEOUT + 1
+        await client.fetch_data_async()
+        assert len(job_queue.jobs) == 2
+        client.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_scheduling_clears_pending_refresh(self):
+        """Test a refresh that could not be scheduled is retried on the next request."""
+        client, worksheet = make_client()
+        await client.fetch_data_async()
+        self.expire(client)
+        client.set_job_queue(BrokenJobQueue())
+
+        data = await client.fetch_data_async()
+        assert data == SAMPLE_ROWS
+        assert client._refresh_scheduled_at is None
+
+        job_queue = FakeJobQueue()
+        client.set_job_queue(job_queue)
+        await client.fetch_data_async()
+        assert len(job_queue.jobs) == 1
+        client.close()
+
+    @pytest.mark.asyncio
+    async def test_too_old_snapshot_is_not_served(self):
+        """Test data older than CACHE_MAX_STALENESS forces a blocking fetch."""
+        client, worksheet = make_client()
+        await client.fetch_data_async()
+        self.expire(client, age_seconds=client.cache.max_staleness.total_seconds() + 1)
+
+        await client.fetch_data_async()
+
+        assert worksheet.calls == 2
+        assert client.get_cache_status()['stale_served'] == 0
+        client.close()
+
+
+class BrokenProbe(FakeFreshnessProbe):
+    def get_version(self):
+        raise ConnectionError("Drive API unavailable")
+
+
+class TestChangeDetection:
+    """Test skipping downloads when the freshness probe reports no change."""
+
+    def test_unchanged_sheet_skips_download(self):
+        """Test a forced refresh of an unchanged sheet reuses cached rows."""
+        probe = FakeFreshnessProbe(version="2024-12-25T08:00:00Z")
+        client, worksheet = make_client(probe=probe)
+
+        first = client.fetch_data(force_refresh=True)
+        second = client.fetch_data(force_refresh=True)
+
+        assert worksheet.calls == 1
+        assert second is first
+        assert client.get_cache_status()['probe_skips'] == 1
+        client.close()
+
+    def test_unchanged_sheet_extends_ttl(self):
+        """Test the cache becomes valid again after a successful probe."""
+        probe = FakeFreshnessProbe(version="v1")
+        client, worksheet = make_client(probe=probe)
+        client.fetch_data()
+        client.cache.last_fetch = datetime.now() - timedelta(hours=2)
+        assert client.cache.is_valid() is False
+
+        client.fetch_data()
+
+        assert worksheet.calls == 1
+        assert client.cache.is_valid() is True
+        client.close()
+
+    def test_changed_sheet_downloads_again(self):
+        """Test a new version token triggers a full download."""
+        probe = FakeFreshnessProbe(version="v1")
+        client, worksheet = make_client(probe=probe)
+        client.fetch_data()
+
+        probe.version = "v2"
+        client.fetch_data(force_refresh=True)
+
+        assert worksheet.calls == 2
+        assert client.cache.version == "v2"
+        client.close()
+
+    def test_invalidated_cache_always_downloads(self):
+        """Test the manual refresh button is never short-circuited."""
+        probe = FakeFreshnessProbe(version="v1")
+        client, worksheet = make_client(probe=probe)
+        client.fetch_data()
+
+        client.invalidate_cache()
+        client.fetch_data(force_refresh=True)
+
+        assert worksheet.calls == 2
+        client.close()
+
+    def test_unknown_version_or_probe_error_downloads(self):
+        """Test the client falls back to a full download when probing fails."""
+        client, worksheet = make_client(probe=BrokenProbe())
+        client.fetch_data()
+        client.fetch_data(force_refresh=True)
+
+        assert worksheet.calls == 2
+        assert client.get_cache_status()['probe_skips'] == 0
+        client.close()
+
+
+class TestSnapshotPersistence:
+    """Test warm starts and outage fallback with the on-disk snapshot."""
+
+    def test_download_is_persisted_and_reloaded(self, tmp_path):
+        """Test a new client answers from the snapshot without downloading."""
+        store = SnapshotStore(tmp_path / "snapshot.json.gz")
+        worksheet = FakeWorksheet(SAMPLE_ROWS)
+        first = GoogleSheetsClient(
+            client=FakeClient(worksheet), probe=FakeFreshnessProbe(), snapshot_store=store
+        )
+        first.fetch_data()
+        first.close()
+
+        restarted = GoogleSheetsClient(
+            client=FakeClient(worksheet), probe=FakeFreshnessProbe(), snapshot_store=store
+        )
+        assert restarted.load_snapshot() is True
+        assert restarted.fetch_data() == SAMPLE_ROWS
+        assert worksheet.calls == 1
+        assert restarted.get_cache_status()['content_hash'] == first.get_cache_status()['content_hash']
+        restarted.close()
+
+    def test_content_hash_only_for_cached_data(self):
+        """Test the cached hash is handed out only with the rows it belongs to."""
+        client, _ = make_client()
+        data = client.fetch_data()
+
+        assert client.get_content_hash(data) == compute_content_hash(data)
+        assert client.get_content_hash([list(row) for row in data]) is None
+        client.close()
+
+    def test_load_without_store(self):
+        """Test load_snapshot is a no-op when persistence is disabled."""
+        client, _ = make_client()
+        assert client.load_snapshot() is False
+        client.close()
+
+    def test_failed_download_falls_back_to_snapshot(self, tmp_path):
+        """Test a scheduled forced refresh survives Google being unreachable."""
+        store = SnapshotStore(tmp_path / "snapshot.json.gz")
+        GoogleSheetsClient(
+            client=FakeClient(FakeWorksheet(SAMPLE_ROWS)),
+            probe=FakeFreshnessProbe(),
+            snapshot_store=store
+        ).fetch_data()
+
+        client = GoogleSheetsClient(
+            client=FakeClient(FailingWorksheet(SAMPLE_ROWS)),
+            probe=FakeFreshnessProbe(),
+            snapshot_store=store
+        )
+        client.load_snapshot()
+
+        assert client.fetch_data(force_refresh=True) == SAMPLE_ROWS
+        assert client.get_cache_status()['fallbacks'] == 1
+        client.close()
+
+    def test_manual_refresh_during_outage_keeps_fallback(self, tmp_path):
+        """Test repeated refresh presses while Google is down keep serving the snapshot."""
+        store = SnapshotStore(tmp_path / "snapshot.json.gz")
+        GoogleSheetsClient(
+            client=FakeClient(FakeWorksheet(SAMPLE_ROWS)),
+            probe=FakeFreshnessProbe(version="v1"),
+            snapshot_store=store
+        ).fetch_data()
+
+        client = GoogleSheetsClient(
+            client=FakeClient(FailingWorksheet(SAMPLE_ROWS)),
+            probe=FakeFreshnessProbe(version="v1"),
+            snapshot_store=store
+        )
+        client.load_snapshot()
+        content_hash = client.get_cache_status()['content_hash']
+
+        for _ in range(2):
+            client.invalidate_cache()
+            assert client.get_cache_status()['is_valid'] is False
+            assert client.fetch_data(force_refresh=True) == SAMPLE_ROWS
+
+        assert client.get_cache_status()['fallbacks'] == 2
+        assert client.get_cache_status()['content_hash'] == content_hash
+        client.close()
+
+
+WIDE_ROWS = [
+    ["STT", "Họ tên", "Nội dung", "Mức độ", "Deadline", "Kết quả", "Ngày HT", "Ghi chú", "Helper", "Helper 2"],
+    ["1", "Alice", "Task A", "Cao", "25/12/2024", "", "", "", "x", "y"],
+    ["", "", "", "", "", "", "", "", "", ""],
+    ["3", "Bob", "Task B", "", "", "", "", "", "", "z"],
+    ["4", "Carol", "Task C", "", "26/12/2024", "Hoàn thành", "", "Note", "", ""],
+    ["", "", "", "", "", "", "", "", "", "helper only"],
+]
+
+EXPECTED_A_TO_H = [row[:8] for row in WIDE_ROWS[:5]]
+
+
+class TestBoundedRangeReads:
+    """Test range-limited and paged worksheet reads."""
+
+    def test_single_request_reads_task_columns_only(self):
+        """Test the default A:H range drops helper columns and trailing blanks."""
+        worksheet = FakeWorksheet(WIDE_ROWS)
+        client = GoogleSheetsClient(client=FakeClient(worksheet), probe=FakeFreshnessProbe())
+
+        data = client.fetch_data()
+
+        assert data == EXPECTED_A_TO_H
+        assert worksheet.ranges == ["A:H"]
+        client.close()
+
+    @pytest.mark.parametrize("page_size", [1, 2, 4, 100])
+    def test_paged_reads_reassemble_same_rows(self, page_size, monkeypatch):
+        """Test paged reads give the same rows as a single request."""
+        monkeypatch.setattr(config, 'SHEETS_PAGE_SIZE', page_size)
+        worksheet = FakeWorksheet(WIDE_ROWS, row_count=1000)
+        client = GoogleSheetsClient(client=FakeClient(worksheet), probe=FakeFreshnessProbe())
+
+        data = client.fetch_data()
+
+        assert data == EXPECTED_A_TO_H
+        assert worksheet.calls == -(-1000 // page_size)
+        assert worksheet.ranges[0] == f"A1:H{min(page_size, 1000)}"
+        client.close()
+
+    def test_empty_range_reads_whole_sheet(self, monkeypatch):
+        """Test an empty GOOGLE_SHEET_RANGE keeps the get_all_values() behaviour."""
+        monkeypatch.setattr(config, 'GOOGLE_SHEET_RANGE', '')
+        worksheet = FakeWorksheet(WIDE_ROWS)
+        client = GoogleSheetsClient(client=FakeClient(worksheet), probe=FakeFreshnessProbe())
+
+        assert client.fetch_data() == WIDE_ROWS
+        client.close()
+
+    def test_invalid_range_is_rejected(self):
+        """Test malformed column ranges raise early."""
+        with pytest.raises(ValueError):
+            parse_column_range("A1:H")
+        with pytest.raises(ValueError):
+            parse_column_range("H:A")
+        assert parse_column_range("a:h") == ("A", "H", 8)
+
+
+def month_rows(month, people):
+    """Rows of a monthly tab: header + one task per person."""
+    rows = [["STT", "Họ tên", "Nội dung", "Mức độ", "Deadline", "Kết quả", "Ngày HT", "Ghi chú"]]
+    for i, person in enumerate(people, 1):
+        rows.append([str(i), person, f"Việc tháng {month}", "", f"10/{month}/2024", "", "", ""])
+    return rows
+
+
+class TestMultiTab:
+    """Test fetching several tabs merged into one tagged table."""
+
+    def make_multi_client(self, monkeypatch, patterns):
+        monkeypatch.setattr(config, 'GOOGLE_SHEET_TABS', patterns)
+        tabs = {
+            "Tháng 10": FakeWorksheet(month_rows(10, ["Alice", "Bob"])),
+            "Tháng 11": FakeWorksheet(month_rows(11, ["Carol"])),
+            "Tổng hợp": FakeWorksheet([["Tổng"], ["x"]]),
+        }
+        fake = FakeClient(tabs=tabs)
+        return GoogleSheetsClient(client=fake, probe=FakeFreshnessProbe()), fake._spreadsheet
+
+    def test_glob_tabs_fetched_in_one_batch(self, monkeypatch):
+        """Test all matching tabs come back from a single batch request."""
+        client, spreadsheet = self.make_multi_client(monkeypatch, "Tháng *")
+
+        data = client.fetch_data()
+
+        assert len(spreadsheet.batch_calls) == 1
+        assert spreadsheet.batch_calls[0] == ["'Tháng 10'!A:H", "'Tháng 11'!A:H"]
+        assert data[0][-1] == SOURCE_TAB_HEADER
+        assert len(data) == 1 + 2 + 1
+        client.close()
+
+    def test_merged_tasks_are_tagged_with_tab(self, monkeypatch):
+        """Test parsed tasks remember which tab they came from."""
+        client, _ = self.make_multi_client(monkeypatch, "Tháng 10, Tháng 11")
+
+        tasks = parse_all_tasks(client.fetch_data())
+
+        assert [(t.ho_ten, t.source_tab) for t in tasks] == [
+            ("Alice", "Tháng 10"), ("Bob", "Tháng 10"), ("Carol", "Tháng 11")
+        ]
+        client.close()
+
+    def test_paged_multi_tab_reads(self, monkeypatch):
+        """Test paging fetches page N of every tab in one request."""
+        monkeypatch.setattr(config, 'SHEETS_PAGE_SIZE', 2)
+        client, spreadsheet = self.make_multi_client(monkeypatch, "Tháng *")
+
+        data = client.fetch_data()
+
+        # Tháng 10 has 3 rows, Tháng 11 has 2 -> pages 1-2 for both, 3 only for Tháng 10
+        assert [len(call) for call in spreadsheet.batch_calls] == [2, 1]
+        assert [row[1] for row in data[1:]] == ["Alice", "Bob", "Carol"]
+        client.close()
+
+    def test_tabs_are_cached_separately(self, monkeypatch):
+        """Test fetch_tabs only downloads tabs not already cached."""
+        client, spreadsheet = self.make_multi_client(monkeypatch, "Tháng 10")
+        client.fetch_data()
+
+        tabs = client.fetch_tabs(["Tháng *"])
+
+        assert list(tabs) == ["Tháng 10", "Tháng 11"]
+        assert spreadsheet.batch_calls[-1] == ["'Tháng 11'!A:H"]
+        client.close()
+
+    def test_refresh_downloads_only_new_tabs(self, monkeypatch):
+        """Test a refresh reuses valid tab caches and downloads a newly added tab."""
+        client, spreadsheet = self.make_multi_client(monkeypatch, "Tháng *")
+        client.fetch_data()
+        spreadsheet.tabs["Tháng 12"] = FakeWorksheet(month_rows(12, ["Dung"]))
+        client._reset_handles()
+        client.cache.last_fetch = datetime.now() - timedelta(seconds=400)
+        client.tab_caches["Tháng 10"].last_fetch = datetime.now()
+        client.tab_caches["Tháng 11"].last_fetch = datetime.now()
+
+        data = client.fetch_data()
+
+        assert spreadsheet.batch_calls[-1] == ["'Tháng 12'!A:H"]
+        assert [row[1] for row in data[1:]] == ["Alice", "Bob", "Carol", "Dung"]
+        client.close()
+
+    def test_changed_version_downloads_all_tabs(self, monkeypatch):
+        """Test cached tabs of an older spreadsheet version are not reused."""
+        client, spreadsheet = self.make_multi_client(monkeypatch, "Tháng *")
+        client.probe = FakeFreshnessProbe(version="v1")
+        client.fetch_data()
+
+        client.probe.version = "v2"
+        client.cache.last_fetch = datetime.now() - timedelta(seconds=400)
+        client.fetch_data()
+
+        assert spreadsheet.batch_calls[-1] == ["'Tháng 10'!A:H", "'Tháng 11'!A:H"]
+        client.close()
+
+    def test_unknown_tab_raises(self, monkeypatch):
+        """Test an exact tab name that doesn't exist is reported."""
+        client, _ = self.make_multi_client(monkeypatch, "Tháng 12")
+
+        with pytest.raises(gspread.exceptions.WorksheetNotFound):
+            client.fetch_data()
+        client.close()
+
+
+def api_error(status, retry_after=None):
+    """Build a gspread APIError for the given HTTP status."""
+    response = requests.Response()
+    response.status_code = status
+    response._content = b'{"error": {"code": %d, "message": "error"}}' % status
+    if retry_after is not None:
+        response.headers['Retry-After'] = str(retry_after)
+    return gspread.exceptions.APIError(response)
+
+
+class FlakyWorksheet(FakeWorksheet):
+    """Worksheet that fails with the given errors before succeeding."""
+
+    def __init__(self, rows, errors):
+        super().__init__(rows)
+        self.errors = list(errors)
+
+    def _download(self):
+        super()._download()
+        if self.errors:
+            raise self.errors.pop(0)
+
+
+class TestHandlesAndRetry:
+    """Test handle reuse and quota-aware retries."""
+
+    @pytest.fixture(autouse=True)
+    def no_backoff_sleep(self, monkeypatch):
+        monkeypatch.setattr(config, 'SHEETS_RETRY_BASE_DELAY', 0)
+
+    def make(self, worksheet):
+        fake = FakeClient(worksheet)
+        return GoogleSheetsClient(client=fake, probe=FakeFreshnessProbe()), fake
+
+    def test_handles_are_reused_between_fetches(self):
+        """Test open_by_key/worksheet run once for repeated downloads."""
+        client, fake = self.make(FakeWorksheet(SAMPLE_ROWS))
+
+        for _ in range(3):
+            client.fetch_data(force_refresh=True)
+
+        assert fake.open_calls == 1
+        assert fake._spreadsheet.worksheet_calls == 1
+        # open + worksheet + 3 x (probe + values)
+        assert client.get_cache_status()['requests'] == 8
+        client.close()
+
+    def test_quota_errors_are_retried(self):
+        """Test 429 and 503 responses are retried transparently."""
+        worksheet = FlakyWorksheet(SAMPLE_ROWS, [api_error(429), api_error(503)])
+        client, _ = self.make(worksheet)
+
+        assert client.fetch_data() == SAMPLE_ROWS
+        assert worksheet.calls == 3
+        assert client.get_cache_status()['retries'] == 2
+        client.close()
+
+    def test_client_errors_are_not_retried(self):
+        """Test a 403 is raised immediately and handles are dropped."""
+        worksheet = FlakyWorksheet(SAMPLE_ROWS, [api_error(403)])
+        client, fake = self.make(worksheet)
+
+        with pytest.raises(gspread.exceptions.APIError):
+            client.fetch_data()
+        assert worksheet.calls == 1
+
+        client.fetch_data()
+        assert fake.open_calls == 2
+        client.close()
+
+    def test_retries_are_bounded(self, monkeypatch):
+        """Test the error surfaces after SHEETS_MAX_RETRIES attempts."""
+        monkeypatch.setattr(config, 'SHEETS_MAX_RETRIES', 2)
+        worksheet = FlakyWorksheet(SAMPLE_ROWS, [api_error(429)] * 5)
+        client, _ = self.make(worksheet)
+
+        with pytest.raises(gspread.exceptions.APIError):
+            client.fetch_data()
+        assert worksheet.calls == 3
+        client.close()
+
+    def test_retry_after_header_is_honoured(self, monkeypatch):
+        """Test the server's Retry-After delay is respected."""
+        sleeps = []
+        monkeypatch.setattr('app.sheets.time.sleep', sleeps.append)
+        worksheet = FlakyWorksheet(SAMPLE_ROWS, [api_error(429, retry_after=7)])
+        client, _ = self.make(worksheet)
+
+        client.fetch_data()
+
+        assert [delay for delay in sleeps if delay] == [7.0]
+        client.close()
+
+    def test_retry_after_is_capped(self, monkeypatch):
+        """Test a huge Retry-After waits at most SHEETS_RETRY_MAX_DELAY."""
+        monkeypatch.setattr(config, 'SHEETS_RETRY_MAX_DELAY', 5)
+        sleeps = []
+        monkeypatch.setattr('app.sheets.time.sleep', sleeps.append)
+        worksheet = FlakyWorksheet(SAMPLE_ROWS, [api_error(429, retry_after=3600)])
+        client, _ = self.make(worksheet)
+
+        client.fetch_data()
+
+        assert [delay for delay in sleeps if delay] == [5.0]
+        client.close()
+
+    def test_probe_is_not_retried(self, monkeypatch):
+        """Test a failing freshness probe is tried once, then the sheet is downloaded."""
+        sleeps = []
+        monkeypatch.setattr('app.sheets.time.sleep', sleeps.append)
+
+        class QuotaProbe(FakeFreshnessProbe):
+            def get_version(self):
+                self.calls += 1
+                raise api_error(429, retry_after=30)
+
+        probe = QuotaProbe()
+        worksheet = FakeWorksheet(SAMPLE_ROWS)
+        client = GoogleSheetsClient(client=FakeClient(worksheet), probe=probe)
+
+        assert client.fetch_data() == SAMPLE_ROWS
+        assert probe.calls == 1
+        assert [delay for delay in sleeps if delay] == []
+        assert worksheet.calls == 1
+        client.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
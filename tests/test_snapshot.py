@@ -0,0 +1,74 @@
+"""
+Unit tests for the on-disk sheet snapshot store.
+"""
+
+import gzip
+import json
+import pytest
+from datetime import datetime
+from app.snapshot import Snapshot, SnapshotStore, compute_content_hash
+
+
+ROWS = [
+    ["STT", "Họ tên", "Nội dung"],
+    ["1", "Nguyễn Văn A", "Soạn công văn"],
+]
+
+
+def make_snapshot(rows=ROWS):
+    """Helper to create a snapshot for the given rows."""
+    return Snapshot(
+        rows=rows,
+        fetched_at=datetime(2024, 12, 25, 5, 55),
+        content_hash=compute_content_hash(rows),
+        version="2024-12-24T10:00:00.000Z"
+    )
+
+
+class TestSnapshotStore:
+    """Test saving and loading snapshots."""
+
+    def test_round_trip(self, tmp_path):
+        """Test a saved snapshot loads back unchanged."""
+        store = SnapshotStore(tmp_path / "cache" / "snapshot.json.gz")
+        snapshot = make_snapshot()
+
+        store.save(snapshot)
+
+        assert store.load() == snapshot
+
+    def test_missing_file(self, tmp_path):
+        """Test loading without a saved snapshot returns None."""
+        assert SnapshotStore(tmp_path / "none.json.gz").load() is None
+
+    def test_no_temp_files_left(self, tmp_path):
+        """Test the atomic write leaves only the final file."""
+        store = SnapshotStore(tmp_path / "snapshot.json.gz")
+        store.save(make_snapshot())
+        store.save(make_snapshot(ROWS + [["2", "Trần Thị B", "Họp"]]))
+
+        assert [p.name for p in tmp_path.iterdir()] == ["snapshot.json.gz"]
+        assert len(store.load().rows) == 3
+
+    def test_corrupted_file_is_ignored(self, tmp_path):
+        """Test garbage on disk is treated as no snapshot."""
+        path = tmp_path / "snapshot.json.gz"
+        path.write_bytes(b"not gzip at all")
+
+        assert SnapshotStore(path).load() is None
+
+    def test_hash_mismatch_is_ignored(self, tmp_path):
+        """Test a snapshot whose rows don't match the stored hash is rejected."""
+        path = tmp_path / "snapshot.json.gz"
+        store = SnapshotStore(path)
+        store.save(make_snapshot())
+
+        payload = json.loads(gzip.decompress(path.read_bytes()))
+        payload['rows'][1][1] = "Tampered"
+        path.write_bytes(gzip.compress(json.dumps(payload).encode('utf-8')))
+
+        assert store.load() is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,179 @@
+"""
+Unit tests for the parsed task cache.
+"""
+
+import asyncio
+import threading
+import pytest
+from datetime import date
+from unittest.mock import patch
+from app.datasource import InMemoryDataSource, generate_synthetic_rows
+from app.models import TaskStatus
+from app.rules import parse_all_tasks
+from app.task_cache import ParsedTasksCache, load_task_snapshot
+
+
+TODAY = date(2024, 12, 25)
+
+
+class TestParsedTasksCache:
+    """Test parsing once per data change and day."""
+
+    def test_same_rows_parsed_once(self):
+        """Test repeated lookups of the same rows reuse the parsed tasks."""
+        rows = generate_synthetic_rows(200, today=TODAY)
+        cache = ParsedTasksCache()
+
+        first = cache.get(rows, today=TODAY)
+        second = cache.get(rows, today=TODAY)
+
+        assert second is first
+        assert cache.get_stats() == {
+            'hits': 1, 'misses': 1, 'reclassified': 0, 'rows_parsed': 200, 'rows_reused': 0
+        }
+
+    def test_identical_content_in_new_list_is_a_hit(self):
+        """Test a re-download with the same content is not re-parsed."""
+        rows = generate_synthetic_rows(50, today=TODAY)
+        cache = ParsedTasksCache()
+
+        first = cache.get(rows, today=TODAY)
+        second = cache.get([list(row) for row in rows], today=TODAY)
+
+        assert second is first
+
+    def test_changed_content_is_reparsed(self):
+        """Test edited data produces new tasks."""
+        rows = generate_synthetic_rows(50, today=TODAY)
+        cache = ParsedTasksCache()
+        first = cache.get(rows, today=TODAY)
+
+        edited = [list(row) for row in rows]
+        edited[1][2] = "Nội dung mới"
+        second = cache.get(edited, today=TODAY)
+
+        assert second is not first
+        assert second.tasks[0].noi_dung == "Nội dung mới"
+
+    def test_only_changed_rows_are_reparsed(self):
+        """Test a refresh re-parses edited and new rows and drops removed ones."""
+        rows = generate_synthetic_rows(100, today=TODAY)
+        cache = ParsedTasksCache()
+        first = cache.get(rows, today=TODAY)
+
+        edited = [list(row) for row in rows]
+        edited[5][5] = "Hoàn thành"
+        del edited[10]
+        edited.append(["101", "Lê Văn Mới", "Việc mới", "", "30/12/2024", "", "", ""])
+
+        with patch('app.rules.get_current_date', return_value=TODAY):
+            second = cache.get(edited, today=TODAY)
+            expected = parse_all_tasks(edited)
+
+        assert second.tasks == expected
+        assert second.tasks[4].is_completed
+        assert second.tasks[0] is first.tasks[0]
+        assert cache.get_stats()['rows_parsed'] == 100 + 2
+        assert cache.get_stats()['rows_reused'] == 98
+
+    def test_duplicate_rows_stay_separate_tasks(self):
+        """Test identical rows keep one Task each across refreshes."""
+        header = ["STT", "Họ tên", "Nội dung", "Mức độ", "Deadline"]
+        row = ["1", "An", "Việc", "", "26/12/2024"]
+        cache = ParsedTasksCache()
+        cache.get([header, row, list(row)], today=TODAY)
+
+        second = cache.get([header, row, list(row), ["2", "Bình", "Khác", "", ""]], today=TODAY)
+
+        assert len(second.tasks) == 3
+        assert second.tasks[0] is not second.tasks[1]
+
+    def test_new_day_is_reclassified_without_parsing(self):
+        """Test statuses are recomputed when the date changes."""
+        rows = [
+            ["STT", "Họ tên", "Nội dung", "Mức độ", "Deadline"],
+            ["1", "An", "Việc", "", "26/12/2024"],
+        ]
+        cache = ParsedTasksCache()
+
+        before = cache.get(rows, today=TODAY)
+        assert before.tasks[0].status == TaskStatus.DUE_TOMORROW
+        before_groups = before.status_groups
+
+        after = cache.get([list(row) for row in rows], today=date(2024, 12, 27))
+
+        assert after is not before
+        assert after.tasks[0].status == TaskStatus.OVERDUE
+        assert after.tasks[0].days_overdue == 1
+        assert after.status_groups[TaskStatus.OVERDUE] == after.tasks
+        assert before_groups[TaskStatus.OVERDUE] == []
+        assert cache.get_stats()['rows_parsed'] == 1
+        assert cache.get_stats()['reclassified'] == 1
+
+    def test_groupings_are_cached(self):
+        """Test groupings are built once per snapshot."""
+        snapshot = ParsedTasksCache().get(generate_synthetic_rows(100, today=TODAY), today=TODAY)
+
+        assert snapshot.status_groups is snapshot.status_groups
+        assert snapshot.person_groups is snapshot.person_groups
+        assert sum(len(g) for g in snapshot.status_groups.values()) == len(snapshot.tasks)
+
+    def test_rows_are_not_modified_by_parsing(self):
+        """Test parsing short rows leaves the cached raw rows untouched."""
+        rows = [["STT", "Họ tên"], ["1", "An", "Việc", "", ""]]
+
+        ParsedTasksCache().get(rows, today=TODAY)
+
+        assert rows[1] == ["1", "An", "Việc", "", ""]
+
+
+class TestLoadTaskSnapshot:
+    """Test the bot_data helper used by handlers and jobs."""
+
+    @pytest.mark.asyncio
+    async def test_handlers_share_parsed_tasks(self):
+        """Test several button presses parse the data only once."""
+        bot_data = {'sheets_client': InMemoryDataSource(generate_synthetic_rows(100))}
+
+        first = await load_task_snapshot(bot_data)
+        second = await load_task_snapshot(bot_data)
+
+        assert second is first
+        assert bot_data['task_cache'].get_stats()['misses'] == 1
+
+    @pytest.mark.asyncio
+    async def test_parse_runs_off_the_event_loop(self):
+        """Test concurrent loads parse in a worker thread, once."""
+        bot_data = {'sheets_client': InMemoryDataSource(generate_synthetic_rows(100))}
+        parse_threads = []
+        task_cache = bot_data['task_cache'] = ParsedTasksCache()
+        parse = task_cache._parser.parse
+
+        def recording_parse(rows, today):
+            parse_threads.append(threading.current_thread())
+            return parse(rows, today)
+
+        with patch.object(task_cache._parser, 'parse', recording_parse):
+            first, second = await asyncio.gather(load_task_snapshot(bot_data), load_task_snapshot(bot_data))
+
+        assert second is first
+        assert len(parse_threads) == 1
+        assert parse_threads[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_hash_from_data_source_is_reused(self):
+        """Test rows are not hashed again when the data source already did."""
+        rows = generate_synthetic_rows(100)
+        data_source = InMemoryDataSource(rows)
+        data_source.get_content_hash = lambda data: "known-hash" if data is rows else None
+        bot_data = {'sheets_client': data_source}
+
+        with patch('app.task_cache.compute_content_hash') as compute:
+            snapshot = await load_task_snapshot(bot_data)
+
+        compute.assert_not_called()
+        assert snapshot.content_hash == "known-hash"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
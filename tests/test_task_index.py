@@ -0,0 +1,95 @@
+"""
+Unit tests for the per-snapshot task index.
+"""
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from datetime import date, timedelta
+from app.datasource import generate_synthetic_rows
+from app.models import TaskStatus
+from app.reporting import build_overdue_by_person_report
+from app.rules import classify_tasks, parse_all_tasks, group_tasks_by_status, group_tasks_by_person
+from app.search import TaskSearchIndex
+from app.task_index import TaskIndex
+
+
+TODAY = date(2024, 12, 25)
+
+
+@pytest.fixture
+def tasks():
+    return classify_tasks(parse_all_tasks(generate_synthetic_rows(400, seed=7, today=TODAY)), TODAY)
+
+
+class TestTaskIndex:
+    """Test index lookups against plain list processing."""
+
+    def test_groupings_match_rules_helpers(self, tasks):
+        """Test groupings equal the group_tasks_* results."""
+        index = TaskIndex(tasks)
+        incomplete = [t for t in tasks if not t.is_completed]
+
+        assert index.open_tasks == incomplete
+        assert index.status_groups == group_tasks_by_status(tasks)
+        assert index.open_status_groups == group_tasks_by_status(incomplete)
+        assert index.person_groups == group_tasks_by_person(tasks)
+
+    def test_groupings_built_once(self, tasks):
+        """Test repeated queries share the same lists."""
+        index = TaskIndex(tasks)
+
+        assert index.open_status_groups is index.open_status_groups
+        assert index.with_status(TaskStatus.OVERDUE) is index.with_status(TaskStatus.OVERDUE)
+        assert index.overdue_by_person() is index.overdue_by_person()
+        assert index.summary(TODAY) is index.summary(TODAY)
+
+    def test_with_status_and_person(self, tasks):
+        """Test status and person queries."""
+        index = TaskIndex(tasks)
+        soon = index.with_status(TaskStatus.DUE_TODAY, TaskStatus.DUE_TOMORROW)
+
+        assert soon == index.open_status_groups[TaskStatus.DUE_TODAY] + index.open_status_groups[TaskStatus.DUE_TOMORROW]
+        name = tasks[0].ho_ten
+        assert index.for_person(name) == [t for t in tasks if t.ho_ten == name]
+        assert index.for_person("Không có người này") == []
+
+    def test_due_between(self, tasks):
+        """Test bisect range lookup returns open tasks by deadline."""
+        index = TaskIndex(tasks)
+        start, end = TODAY + timedelta(days=1), TODAY + timedelta(days=10)
+
+        result = index.due_between(start, end)
+
+        expected = [t for t in tasks if not t.is_completed and t.deadline and start <= t.deadline <= end]
+        assert sorted(result, key=id) == sorted(expected, key=id)
+        assert [t.deadline for t in result] == sorted(t.deadline for t in expected)
+        assert index.due_between(end, start) == []
+
+    def test_overdue_by_person(self, tasks):
+        """Test overdue grouping keeps sheet order and only open tasks."""
+        index = TaskIndex(tasks)
+        overdue = [t for t in tasks if not t.is_completed and t.status == TaskStatus.OVERDUE]
+
+        assert index.overdue_by_person() == group_tasks_by_person(overdue)
+        assert build_overdue_by_person_report(tasks, index) == build_overdue_by_person_report(tasks)
+
+    def test_concurrent_searches_build_index_once(self, tasks):
+        """Test searches from several worker threads share one search index."""
+        index = TaskIndex(tasks)
+        built = []
+
+        def counting_index(index_tasks):
+            built.append(1)
+            return TaskSearchIndex(index_tasks)
+
+        with patch('app.task_index.TaskSearchIndex', counting_index):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(index.ranked_search, ["bao cao"] * 8))
+
+        assert len(built) == 1
+        assert all(r.tasks == results[0].tasks for r in results)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])